@@ -16,8 +16,12 @@ from homeassistant.components import persistent_notification
 import homeassistant.config as conf_util
 import homeassistant.core as core
 from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
-from homeassistant.setup import async_setup_component
+from homeassistant.setup import (
+    async_install_requirements, async_setup_component,
+    async_setup_critical_path)
 import homeassistant.loader as loader
+from homeassistant.helpers import config_per_platform
+from homeassistant.util import OrderedSet
 from homeassistant.util.logging import AsyncHandler
 from homeassistant.util.yaml import clear_secret_cache
 from homeassistant.exceptions import HomeAssistantError
@@ -112,6 +116,15 @@ def async_from_config_dict(config: Dict[str, Any],
     components = set(key.split(' ')[0] for key in config.keys()
                      if key != core.DOMAIN)
 
+    # Install the requirements of all components and configured platforms
+    # in one go. Setup installs whatever is still missing per component and
+    # reports failures there, so a failure here is not logged as an error.
+    if not skip_pip:
+        requirements = yield from hass.async_add_job(
+            _collect_requirements, config, components)
+        yield from async_install_requirements(
+            hass, requirements, log_failure=False)
+
     # setup components
     # pylint: disable=not-an-iterable
     res = yield from core_components.async_setup(hass, config)
@@ -125,12 +138,12 @@ def async_from_config_dict(config: Dict[str, Any],
     _LOGGER.info('Home Assistant core initialized')
 
     # stage 1
-    for component in components:
-        if component not in FIRST_INIT_COMPONENT:
-            continue
-        hass.async_add_job(async_setup_component(hass, component, config))
+    tasks = [async_setup_component(hass, component, config)
+             for component in components
+             if component in FIRST_INIT_COMPONENT]
 
-    yield from hass.async_block_till_done()
+    if tasks:
+        yield from asyncio.wait(tasks, loop=hass.loop)
 
     # stage 2
     for component in components:
@@ -143,10 +156,44 @@ def async_from_config_dict(config: Dict[str, Any],
     stop = time()
     _LOGGER.info('Home Assistant initialized in %.2fs', stop-start)
 
+    critical_path = async_setup_critical_path(hass)
+    if critical_path:
+        _LOGGER.info('Setup critical path: %s', ' -> '.join(
+            '{} {:.2f}s'.format(domain, duration)
+            for domain, duration in critical_path))
+
     async_register_signal_handling(hass)
     return hass
 
 
+def _collect_requirements(config: Dict, components) -> list:
+    """Return the requirements to set up components and their platforms.
+
+    This imports the components and platforms, so it is run in the executor.
+    """
+    domains = OrderedSet()
+    for component in components:
+        domains.update(loader.load_order_component(component))
+
+    platforms = [
+        loader.get_platform(domain, platform) for domain in list(domains)
+        for platform, _ in config_per_platform(config, domain)
+        if isinstance(platform, str)]
+
+    for platform in platforms:
+        for dependency in getattr(platform, 'DEPENDENCIES', []):
+            domains.update(loader.load_order_component(dependency))
+
+    modules = [loader.get_component(domain) for domain in domains]
+    modules.extend(platforms)
+
+    requirements = OrderedSet()
+    for module in modules:
+        requirements.update(getattr(module, 'REQUIREMENTS', []))
+
+    return list(requirements)
+
+
 def from_config_file(config_path: str,
                      hass: Optional[core.HomeAssistant]=None,
                      verbose: bool=False,
@@ -436,17 +436,15 @@ def _async_process_if(hass, config, p_config):
     """Process if checks."""
     if_configs = p_config.get(CONF_CONDITION)
 
-    checks = []
-    for if_config in if_configs:
-        try:
-            checks.append(condition.async_from_config(if_config, False))
-        except HomeAssistantError as ex:
-            _LOGGER.warning('Invalid condition: %s', ex)
-            return None
+    try:
+        check = condition.async_from_configs(if_configs, False)
+    except HomeAssistantError as ex:
+        _LOGGER.warning('Invalid condition: %s', ex)
+        return None
 
     def if_action(variables=None):
         """AND all conditions."""
-        return all(check(hass, variables) for check in checks)
+        return check(hass, variables)
 
     return if_action
 
@@ -86,6 +86,11 @@ class CommandBinarySensor(BinarySensorDevice):
         """Return the class of the binary sensor."""
         return self._device_class
 
+    @property
+    def cache_static_attributes(self):
+        """Return True because name and device class are from the config."""
+        return True
+
     def update(self):
         """Get the latest data and updates the state."""
         self.data.update()
@@ -103,6 +103,11 @@ class MqttBinarySensor(BinarySensorDevice):
         """Return the name of the binary sensor."""
         return self._name
 
+    @property
+    def cache_static_attributes(self):
+        """Return True because name and device class are from the config."""
+        return True
+
     @property
     def is_on(self):
         """Return true if the binary sensor is on."""
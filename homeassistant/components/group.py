@@ -10,12 +10,12 @@ import os
 
 import voluptuous as vol
 
-from homeassistant import config as conf_util, core as ha
+from homeassistant import config as conf_util
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_ICON, CONF_NAME, STATE_CLOSED, STATE_HOME,
     STATE_NOT_HOME, STATE_OFF, STATE_ON, STATE_OPEN, STATE_LOCKED,
     STATE_UNLOCKED, STATE_OK, STATE_PROBLEM, STATE_UNKNOWN,
-    ATTR_ASSUMED_STATE, SERVICE_RELOAD)
+    ATTR_ASSUMED_STATE, SERVICE_RELOAD, EVENT_STATE_CHANGED)
 from homeassistant.core import callback
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
 from homeassistant.helpers.entity_component import EntityComponent
@@ -26,6 +26,10 @@ from homeassistant.util.async import run_coroutine_threadsafe
 DOMAIN = 'group'
 
 ENTITY_ID_FORMAT = DOMAIN + '.{}'
+GROUP_PREFIX = ENTITY_ID_FORMAT.format('')
+
+# Maps group entity id to its members with nested groups expanded
+DATA_EXPANDED_MEMBERS = 'group_expanded_members'
 
 CONF_ENTITIES = 'entities'
 CONF_VIEW = 'view'
@@ -184,35 +188,76 @@ def expand_entity_ids(hass, entity_ids):
     Async friendly.
     """
     found_ids = []
+    found = set()
+    # Replaced instead of cleared when invalidated, so an expansion running
+    # in a thread can not store members in the new cache.
+    members_cache = hass.data.get(DATA_EXPANDED_MEMBERS)
+
     for entity_id in entity_ids:
         if not isinstance(entity_id, str):
             continue
 
         entity_id = entity_id.lower()
 
-        try:
-            # If entity_id points at a group, expand it
-            domain, _ = ha.split_entity_id(entity_id)
+        # If entity_id points at a group, expand it
+        if entity_id.startswith(GROUP_PREFIX):
+            members, _ = _expand_group(
+                hass, entity_id, members_cache, set())
+        else:
+            members = (entity_id,)
 
-            if domain == DOMAIN:
-                child_entities = get_entity_ids(hass, entity_id)
-                if entity_id in child_entities:
-                    child_entities = list(child_entities)
-                    child_entities.remove(entity_id)
-                found_ids.extend(
-                    ent_id for ent_id
-                    in expand_entity_ids(hass, child_entities)
-                    if ent_id not in found_ids)
+        for member_id in members:
+            if member_id not in found:
+                found.add(member_id)
+                found_ids.append(member_id)
 
-            else:
-                if entity_id not in found_ids:
-                    found_ids.append(entity_id)
+    return found_ids
 
-        except AttributeError:
-            # Raised by split_entity_id if entity_id is not a string
-            pass
 
-    return found_ids
+def _expand_group(hass, group_id, members_cache, expanding):
+    """Return the members of a group with nested groups expanded.
+
+    Also returns if the expansion is complete, which it is not when a
+    nested group was skipped because it is already being expanded. Only
+    complete expansions are cached.
+    """
+    if members_cache is not None and group_id in members_cache:
+        return members_cache[group_id], True
+
+    members = []
+    found = set()
+    complete = True
+    expanding.add(group_id)
+
+    for entity_id in get_entity_ids(hass, group_id):
+        if not isinstance(entity_id, str):
+            continue
+
+        entity_id = entity_id.lower()
+
+        if not entity_id.startswith(GROUP_PREFIX):
+            child_ids = (entity_id,)
+        elif entity_id in expanding:
+            # A group containing itself is complete, other loops are not
+            complete = complete and entity_id == group_id
+            continue
+        else:
+            child_ids, child_complete = _expand_group(
+                hass, entity_id, members_cache, expanding)
+            complete = complete and child_complete
+
+        for child_id in child_ids:
+            if child_id not in found:
+                found.add(child_id)
+                members.append(child_id)
+
+    expanding.discard(group_id)
+    members = tuple(members)
+
+    if complete and members_cache is not None:
+        members_cache[group_id] = members
+
+    return members, complete
 
 
 def get_entity_ids(hass, entity_id, domain_filter=None):
@@ -241,6 +286,24 @@ def async_setup(hass, config):
     component = EntityComponent(_LOGGER, DOMAIN, hass)
     service_groups = {}
 
+    hass.data[DATA_EXPANDED_MEMBERS] = {}
+
+    @callback
+    def clear_expanded_members(event):
+        """Clear the expanded members when the members of a group change."""
+        if not event.data.get('entity_id', '').startswith(GROUP_PREFIX):
+            return
+
+        old_state = event.data.get('old_state')
+        new_state = event.data.get('new_state')
+
+        if old_state is None or new_state is None or \
+           old_state.attributes.get(ATTR_ENTITY_ID) != \
+           new_state.attributes.get(ATTR_ENTITY_ID):
+            hass.data[DATA_EXPANDED_MEMBERS] = {}
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, clear_expanded_members)
+
     yield from _async_process_config(hass, config, component)
 
     descriptions = yield from hass.async_add_job(
@@ -408,6 +471,10 @@ class Group(Entity):
         self._order = order
         self._assumed_state = False
         self._async_unsub_state_changed = None
+        # Maps member entity id to whether it is on and has assumed state
+        self._members = {}
+        self._on_count = 0
+        self._assumed_count = 0
 
     @staticmethod
     def create_group(hass, name, entity_ids=None, user_defined=True,
@@ -577,7 +644,7 @@ class Group(Entity):
         if self._async_unsub_state_changed is None:
             return
 
-        self._async_update_group_state(new_state)
+        self._async_update_group_state(entity_id, new_state)
         yield from self.async_update_ha_state()
 
     @property
@@ -594,62 +661,59 @@ class Group(Entity):
         return states
 
     @callback
-    def _async_update_group_state(self, tr_state=None):
+    def _async_update_group_state(self, entity_id=None, tr_state=None):
         """Update group state.
 
-        Optionally you can provide the only state changed since last update
-        allowing this method to take shortcuts.
+        Optionally you can provide the only member that changed since last
+        update and its new state, so only the counts of that member are
+        updated instead of counting all members.
 
         This method must be run in the event loop.
         """
-        # To store current states of group entities. Might not be needed.
-        states = None
-        gr_state = self._state
-        gr_on = self.group_on
-        gr_off = self.group_off
-
         # We have not determined type of group yet
-        if gr_on is None:
-            if tr_state is None:
+        if self.group_on is None:
+            if entity_id is None:
                 states = self._tracking_states
-
-                for state in states:
-                    gr_on, gr_off = \
-                        _get_group_on_off(state.state)
-                    if gr_on is not None:
-                        break
             else:
-                gr_on, gr_off = _get_group_on_off(tr_state.state)
+                states = (tr_state,) if tr_state is not None else ()
 
-            if gr_on is not None:
-                self.group_on, self.group_off = gr_on, gr_off
+            for state in states:
+                gr_on, gr_off = _get_group_on_off(state.state)
+                if gr_on is not None:
+                    self.group_on, self.group_off = gr_on, gr_off
+                    # Members have to be counted for the new on state
+                    entity_id = None
+                    break
 
         # We cannot determine state of the group
-        if gr_on is None:
+        if self.group_on is None:
             return
 
-        if tr_state is None or ((gr_state == gr_on and
-                                 tr_state.state == gr_off) or
-                                tr_state.state not in (gr_on, gr_off)):
-            if states is None:
-                states = self._tracking_states
+        if entity_id is None:
+            self._members = {}
+            self._on_count = 0
+            self._assumed_count = 0
 
-            if any(state.state == gr_on for state in states):
-                self._state = gr_on
-            else:
-                self._state = gr_off
+            for member_id in self.tracking:
+                self._async_update_member(
+                    member_id, self.hass.states.get(member_id))
+        else:
+            self._async_update_member(entity_id, tr_state)
 
-        elif tr_state.state in (gr_on, gr_off):
-            self._state = tr_state.state
+        self._state = self.group_on if self._on_count else self.group_off
+        self._assumed_state = self._assumed_count > 0
 
-        if tr_state is None or self._assumed_state and \
-           not tr_state.attributes.get(ATTR_ASSUMED_STATE):
-            if states is None:
-                states = self._tracking_states
-
-            self._assumed_state = any(
-                state.attributes.get(ATTR_ASSUMED_STATE) for state
-                in states)
+    @callback
+    def _async_update_member(self, entity_id, state):
+        """Update the member counts for the new state of a member.
 
-        elif tr_state.attributes.get(ATTR_ASSUMED_STATE):
-            self._assumed_state = True
+        This method must be run in the event loop.
+        """
+        was_on, was_assumed = self._members.get(entity_id, (False, False))
+        is_on = state is not None and state.state == self.group_on
+        is_assumed = state is not None and \
+            bool(state.attributes.get(ATTR_ASSUMED_STATE))
+
+        self._members[entity_id] = (is_on, is_assumed)
+        self._on_count += is_on - was_on
+        self._assumed_count += is_assumed - was_assumed
@@ -5,16 +5,22 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/history/
 """
 import asyncio
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from datetime import timedelta
 from itertools import groupby
+import json
 import logging
+import math
 import time
 
+from aiohttp import web
 import voluptuous as vol
 
 from homeassistant.const import (
-    HTTP_BAD_REQUEST, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE)
+    HTTP_BAD_REQUEST, CONF_DOMAINS, CONF_ENTITIES, CONF_EXCLUDE, CONF_INCLUDE,
+    CONTENT_TYPE_JSON)
+import homeassistant.helpers.config_validation as cv
+import homeassistant.remote as rem
 import homeassistant.util.dt as dt_util
 from homeassistant.components import recorder, script
 from homeassistant.components.frontend import register_built_in_panel
@@ -34,6 +40,9 @@ CONFIG_SCHEMA = vol.Schema({
 SIGNIFICANT_DOMAINS = ('thermostat', 'climate')
 IGNORE_DOMAINS = ('zone', 'scene',)
 
+# Number of rows fetched at once when aggregating states
+AGGREGATE_YIELD_PER = 1000
+
 
 def last_recorder_run(hass):
     """Retrieve the last closed recorder run from the database."""
@@ -106,8 +115,12 @@ def state_changes_during_period(hass, start_time, end_time=None,
 
 def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
                filters=None):
-    """Return the states at a specific point in time."""
-    from homeassistant.components.recorder.models import States
+    """Return the states at a specific point in time.
+
+    Entities are enumerated from the latest_states table, so the lookup is
+    bounded by the number of entities instead of the number of states.
+    """
+    from homeassistant.components.recorder.models import States, LatestStates
 
     if run is None:
         run = recorder.run_information(hass, utc_point_in_time)
@@ -116,25 +129,37 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
         if run is None:
             return []
 
-    from sqlalchemy import and_, func
+    from sqlalchemy import and_, case
 
     with session_scope(hass=hass) as session:
-        most_recent_state_ids = session.query(
-            func.max(States.state_id).label('max_state_id')
-        ).filter(
+        # Entities that changed after utc_point_in_time need an index lookup
+        # for their most recent state before it.
+        recent_state_id = session.query(States.state_id).filter(
+            (States.entity_id == LatestStates.entity_id) &
             (States.created >= run.start) &
-            (States.created < utc_point_in_time) &
-            (~States.domain.in_(IGNORE_DOMAINS)))
+            (States.created < utc_point_in_time)
+        ).order_by(
+            States.created.desc(), States.state_id.desc()
+        ).limit(1).correlate(LatestStates).as_scalar()
 
-        if filters:
-            most_recent_state_ids = filters.apply(most_recent_state_ids,
-                                                  entity_ids)
+        most_recent_state_ids = session.query(case(
+            [(and_(LatestStates.created >= run.start,
+                   LatestStates.created < utc_point_in_time),
+              LatestStates.state_id)],
+            else_=recent_state_id).label('max_state_id'))
 
-        most_recent_state_ids = most_recent_state_ids.group_by(
-            States.entity_id).subquery()
+        if entity_ids is not None:
+            most_recent_state_ids = most_recent_state_ids.filter(
+                LatestStates.entity_id.in_(entity_ids))
+
+        most_recent_state_ids = most_recent_state_ids.subquery()
 
         query = session.query(States).join(most_recent_state_ids, and_(
-            States.state_id == most_recent_state_ids.c.max_state_id))
+            States.state_id == most_recent_state_ids.c.max_state_id)).filter(
+                ~States.domain.in_(IGNORE_DOMAINS))
+
+        if filters:
+            query = filters.apply(query, entity_ids)
 
         return [state for state in execute(query)
                 if not state.attributes.get(ATTR_HIDDEN, False)]
@@ -166,6 +191,99 @@ def states_to_json(hass, states, start_time, entity_id, filters=None):
     return result
 
 
+def get_aggregated_states(hass, start_time, end_time, bucket_size,
+                          entity_id=None, filters=None):
+    """Return aggregated state changes during UTC period per bucket.
+
+    Rows are read in a single streaming pass and attributes are never
+    loaded. Returns an ordered dict with per entity a list of buckets.
+    """
+    from homeassistant.components.recorder.models import States
+
+    entity_ids = (entity_id.lower(), ) if entity_id is not None else None
+
+    with session_scope(hass=hass) as session:
+        query = session.query(
+            States.entity_id, States.state, States.last_updated).filter(
+                (States.last_changed == States.last_updated) &
+                (States.last_updated > start_time) &
+                (States.last_updated < end_time))
+
+        if filters:
+            query = filters.apply(query, entity_ids)
+        elif entity_ids is not None:
+            query = query.filter(States.entity_id.in_(entity_ids))
+
+        query = query.order_by(States.entity_id, States.last_updated) \
+                     .yield_per(AGGREGATE_YIELD_PER)
+
+        return aggregate_states(query, start_time, bucket_size)
+
+
+def aggregate_states(rows, start_time, bucket_size):
+    """Aggregate (entity_id, state, last_updated) rows into buckets.
+
+    Rows need to be ordered by entity_id and last_updated. Each bucket holds
+    the min, max and mean of the numeric states and the last state.
+    """
+    from homeassistant.components.recorder.models import _process_timestamp
+
+    bucket_seconds = bucket_size.total_seconds()
+    result = OrderedDict()
+    entity_buckets = None
+    current_entity_id = None
+    # Accumulator of the current bucket: [index, min, max, sum, count, last]
+    acc = None
+
+    for entity_id, state, last_updated in rows:
+        index = int((_process_timestamp(last_updated) -
+                     start_time).total_seconds() // bucket_seconds)
+
+        if entity_id != current_entity_id or acc[0] != index:
+            if acc is not None:
+                entity_buckets.append(
+                    _bucket_as_dict(acc, start_time, bucket_size))
+
+            if entity_id != current_entity_id:
+                current_entity_id = entity_id
+                entity_buckets = result[entity_id] = []
+
+            acc = [index, None, None, 0.0, 0, None]
+
+        try:
+            value = float(state)
+        except ValueError:
+            value = None
+
+        # nan and inf are not valid JSON and would poison the statistics
+        if value is None or not math.isfinite(value):
+            acc[5] = state
+            continue
+
+        acc[1] = value if acc[1] is None else min(acc[1], value)
+        acc[2] = value if acc[2] is None else max(acc[2], value)
+        acc[3] += value
+        acc[4] += 1
+        acc[5] = value
+
+    if acc is not None:
+        entity_buckets.append(_bucket_as_dict(acc, start_time, bucket_size))
+
+    return result
+
+
+def _bucket_as_dict(acc, start_time, bucket_size):
+    """Convert a bucket accumulator into a JSON friendly dict."""
+    index, minimum, maximum, total, count, last = acc
+    return {
+        'start': start_time + index * bucket_size,
+        'min': minimum,
+        'max': maximum,
+        'mean': total / count if count else None,
+        'last': last,
+    }
+
+
 def get_state(hass, utc_point_in_time, entity_id, run=None):
     """Return a state at a specific point in time."""
     states = list(get_states(hass, utc_point_in_time, (entity_id,), run))
@@ -233,6 +351,24 @@ class HistoryPeriodView(HomeAssistantView):
             end_time = start_time + one_day
         entity_id = request.query.get('filter_entity_id')
 
+        bucket = request.query.get('bucket')
+        if bucket:
+            try:
+                bucket_size = cv.time_period(bucket)
+            except vol.Invalid:
+                bucket_size = None
+            if not bucket_size or bucket_size <= timedelta(0):
+                return self.json_message('Invalid bucket', HTTP_BAD_REQUEST)
+
+            result = yield from request.app['hass'].async_add_job(
+                get_aggregated_states, request.app['hass'], start_time,
+                end_time, bucket_size, entity_id, self.filters)
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                elapsed = time.perf_counter() - timer_start
+                _LOGGER.debug('Aggregated %d entities in %fs',
+                              len(result), elapsed)
+            return (yield from self._stream_aggregated(request, result))
+
         result = yield from request.app['hass'].async_add_job(
             get_significant_states, request.app['hass'], start_time, end_time,
             entity_id, self.filters)
@@ -243,6 +379,28 @@ class HistoryPeriodView(HomeAssistantView):
                 'Extracted %d states in %fs', sum(map(len, result)), elapsed)
         return self.json(result)
 
+    @asyncio.coroutine
+    def _stream_aggregated(self, request, result):
+        """Write aggregated states one entity at a time."""
+        # pylint: disable=no-self-use
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_JSON
+        yield from response.prepare(request)
+
+        response.write(b'[')
+        for idx, (entity_id, buckets) in enumerate(result.items()):
+            if idx:
+                response.write(b',')
+            response.write(json.dumps({
+                'entity_id': entity_id,
+                'buckets': buckets,
+            }, sort_keys=True, cls=rem.JSONEncoder).encode('UTF-8'))
+            yield from response.drain()
+        response.write(b']')
+
+        yield from response.write_eof()
+        return response
+
 
 class Filters(object):
     """Container for the configured include and exclude filters."""
@@ -5,7 +5,6 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/http/
 """
 import asyncio
-import json
 import logging
 import ssl
 from ipaddress import ip_network
@@ -359,8 +358,7 @@ class HomeAssistantView(object):
     # pylint: disable=no-self-use
     def json(self, result, status_code=200):
         """Return a JSON response."""
-        msg = json.dumps(
-            result, sort_keys=True, cls=rem.JSONEncoder).encode('UTF-8')
+        msg = rem.json_encode(result, sort_keys=True).encode('UTF-8')
         return web.Response(
             body=msg, content_type=CONTENT_TYPE_JSON, status=status_code)
 
@@ -5,14 +5,18 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/logbook/
 """
 import asyncio
+import json
 import logging
 from datetime import timedelta
 from itertools import groupby
 
+from aiohttp import web
 import voluptuous as vol
 
 from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
+import homeassistant.remote as rem
+from homeassistant.util.async import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
 from homeassistant.components import sun
 from homeassistant.components.frontend import register_built_in_panel
@@ -20,7 +24,7 @@ from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
     STATE_NOT_HOME, STATE_OFF, STATE_ON, ATTR_HIDDEN, HTTP_BAD_REQUEST,
-    EVENT_LOGBOOK_ENTRY)
+    EVENT_LOGBOOK_ENTRY, CONTENT_TYPE_JSON)
 from homeassistant.core import State, split_entity_id, DOMAIN as HA_DOMAIN
 
 DOMAIN = 'logbook'
@@ -52,6 +56,17 @@ GROUP_BY_MINUTES = 15
 
 CONTINUOUS_DOMAINS = ['proximity', 'sensor']
 
+ALL_EVENT_TYPES = [
+    EVENT_STATE_CHANGED, EVENT_LOGBOOK_ENTRY,
+    EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP
+]
+
+# Number of rows fetched from the database at once
+LOGBOOK_YIELD_PER = 1000
+
+# Number of entries written to the response at once
+LOGBOOK_CHUNK_SIZE = 100
+
 ATTR_NAME = 'name'
 ATTR_MESSAGE = 'message'
 ATTR_DOMAIN = 'domain'
@@ -134,10 +149,51 @@ class LogbookView(HomeAssistantView):
         end_day = start_day + timedelta(days=1)
         hass = request.app['hass']
 
-        events = yield from hass.async_add_job(
-            _get_events, hass, start_day, end_day)
-        events = _exclude_events(events, self.config)
-        return self.json(humanify(events))
+        response = web.StreamResponse()
+        response.content_type = CONTENT_TYPE_JSON
+        yield from response.prepare(request)
+
+        yield from hass.async_add_job(
+            _write_entries, hass, response, self.config, start_day, end_day)
+
+        yield from response.write_eof()
+        return response
+
+
+def _write_entries(hass, response, config, start_day, end_day):
+    """Write the logbook entries of a period as a JSON list.
+
+    Runs in the executor. Events are streamed from the database and the
+    entries are handed to the event loop in chunks.
+    """
+    @asyncio.coroutine
+    def write(data):
+        """Write data to the response."""
+        response.write(data)
+        yield from response.drain()
+
+    prefix = '['
+    chunk = []
+    events = _exclude_events(
+        _get_events(hass, start_day, end_day, config), config)
+
+    for entry in humanify(events):
+        chunk.append(json.dumps(entry, sort_keys=True, cls=rem.JSONEncoder))
+
+        if len(chunk) == LOGBOOK_CHUNK_SIZE:
+            run_coroutine_threadsafe(
+                write((prefix + ','.join(chunk)).encode('UTF-8')),
+                hass.loop).result()
+            prefix = ','
+            chunk = []
+
+    if chunk:
+        data = prefix + ','.join(chunk) + ']'
+    elif prefix == '[':
+        data = '[]'
+    else:
+        data = ']'
+    run_coroutine_threadsafe(write(data.encode('UTF-8')), hass.loop).result()
 
 
 class Entry(object):
@@ -274,22 +330,41 @@ def humanify(events):
                     entity_id)
 
 
-def _get_events(hass, start_day, end_day):
-    """Get events for a period of time."""
-    from homeassistant.components.recorder.models import Events
-    from homeassistant.components.recorder.util import (
-        execute, session_scope)
+def _get_events(hass, start_day, end_day, config=None):
+    """Get events for a period of time.
+
+    Only event types that show up in the logbook are fetched and the
+    configured entity and domain filters are applied to state changes in
+    SQL. Events are streamed, so the session is open until the generator
+    is exhausted.
+    """
+    from homeassistant.components.recorder.models import Events, States
+    from homeassistant.components.recorder.util import session_scope
 
     with session_scope(hass=hass) as session:
-        query = session.query(Events).order_by(
-            Events.time_fired).filter(
-                (Events.time_fired > start_day) &
-                (Events.time_fired < end_day))
-        return execute(query)
+        query = session.query(Events).filter(
+            Events.event_type.in_(ALL_EVENT_TYPES) &
+            (Events.time_fired > start_day) &
+            (Events.time_fired < end_day))
 
+        entity_filter = _generate_filter_sql(config or {})
+        if entity_filter is not None:
+            # Events without a state are filtered by _exclude_events
+            query = query.outerjoin(
+                States, Events.event_id == States.event_id).filter(
+                    States.state_id.is_(None) | entity_filter)
 
-def _exclude_events(events, config):
-    """Get lists of excluded entities and platforms."""
+        query = query.order_by(Events.time_fired) \
+                     .yield_per(LOGBOOK_YIELD_PER)
+
+        for row in query:
+            event = row.to_native()
+            if event is not None:
+                yield event
+
+
+def _get_filter_lists(config):
+    """Return excluded entities and domains, included entities and domains."""
     excluded_entities = []
     excluded_domains = []
     included_entities = []
@@ -302,8 +377,57 @@ def _exclude_events(events, config):
     if include:
         included_entities = include[CONF_ENTITIES]
         included_domains = include[CONF_DOMAINS]
+    return (excluded_entities, excluded_domains,
+            included_entities, included_domains)
+
+
+def _generate_filter_sql(config):
+    """Return the include/exclude filter on the states table or None.
+
+    Follows the same rules as _exclude_events.
+    """
+    from homeassistant.components.recorder.models import States
+
+    excluded_entities, excluded_domains, included_entities, \
+        included_domains = _get_filter_lists(config)
+
+    entity_filter = None
+    # filter if only excluded is configured for this domain
+    if excluded_domains and not included_domains:
+        entity_filter = ~States.domain.in_(excluded_domains)
+        if included_entities:
+            entity_filter |= States.entity_id.in_(included_entities)
+    # filter if only included is configured for this domain
+    elif not excluded_domains and included_domains:
+        entity_filter = States.domain.in_(included_domains)
+        if included_entities:
+            entity_filter |= States.entity_id.in_(included_entities)
+    # filter if included and excluded is configured for this domain
+    elif excluded_domains and included_domains:
+        entity_filter = States.domain.in_(included_domains)
+        if included_entities:
+            entity_filter |= States.entity_id.in_(included_entities)
+        entity_filter &= ~States.domain.in_(excluded_domains)
+    # filter if only included is configured for this entity
+    elif included_entities:
+        entity_filter = States.entity_id.in_(included_entities)
+
+    # check if logbook entry is excluded for this entity
+    if excluded_entities:
+        excluded_filter = ~States.entity_id.in_(excluded_entities)
+        if entity_filter is None:
+            entity_filter = excluded_filter
+        else:
+            entity_filter &= excluded_filter
+
+    return entity_filter
+
+
+def _exclude_events(events, config):
+    """Filter out events that should not show up in the logbook."""
+    excluded_entities, excluded_domains, included_entities, \
+        included_domains = _get_filter_lists(config)
 
-    filtered_events = []
     for event in events:
         domain, entity_id = None, None
 
@@ -356,8 +480,7 @@ def _exclude_events(events, config):
             # check if logbook entry is excluded for this entity
             if entity_id in excluded_entities:
                 continue
-        filtered_events.append(event)
-    return filtered_events
+        yield event
 
 
 # pylint: disable=too-many-return-statements
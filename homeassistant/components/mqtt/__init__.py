@@ -8,9 +8,9 @@ import asyncio
 import logging
 import os
 import socket
+import threading
 import time
 import ssl
-import re
 import requests.certs
 
 import voluptuous as vol
@@ -21,7 +21,7 @@ from homeassistant.config import load_yaml_config_file
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import template, config_validation as cv
 from homeassistant.helpers.dispatcher import (
-    async_dispatcher_connect, dispatcher_send)
+    async_dispatcher_connect, async_dispatcher_send)
 from homeassistant.util.async import (
     run_coroutine_threadsafe, run_callback_threadsafe)
 from homeassistant.const import (
@@ -36,6 +36,7 @@ _LOGGER = logging.getLogger(__name__)
 DOMAIN = 'mqtt'
 
 DATA_MQTT = 'mqtt'
+DATA_MQTT_SUBSCRIPTIONS = 'mqtt_subscriptions'
 
 SERVICE_PUBLISH = 'publish'
 SIGNAL_MQTT_MESSAGE_RECEIVED = 'mqtt_message_received'
@@ -204,12 +205,27 @@ def publish_template(hass, topic, payload_template, qos=None, retain=None):
 def async_subscribe(hass, topic, msg_callback, qos=DEFAULT_QOS,
                     encoding='utf-8'):
     """Subscribe to an MQTT topic."""
+    subscriptions = hass.data.get(DATA_MQTT_SUBSCRIPTIONS)
+
+    if subscriptions is None:
+        subscriptions = hass.data[DATA_MQTT_SUBSCRIPTIONS] = TopicMatcher()
+
+        @callback
+        def async_mqtt_message_received(dp_topic, dp_payload, dp_qos):
+            """Dispatch a message to the matching subscribers."""
+            for subscriber in subscriptions.match(dp_topic):
+                try:
+                    subscriber(dp_topic, dp_payload, dp_qos)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error handling message on %s",
+                                      dp_topic)
+
+        async_dispatcher_connect(
+            hass, SIGNAL_MQTT_MESSAGE_RECEIVED, async_mqtt_message_received)
+
     @callback
     def async_mqtt_topic_subscriber(dp_topic, dp_payload, dp_qos):
-        """Match subscribed MQTT topic."""
-        if not _match_topic(topic, dp_topic):
-            return
-
+        """Handle a message on the subscribed MQTT topic."""
         if encoding is not None:
             try:
                 payload = dp_payload.decode(encoding)
@@ -225,10 +241,24 @@ def async_subscribe(hass, topic, msg_callback, qos=DEFAULT_QOS,
 
         hass.async_run_job(msg_callback, dp_topic, payload, dp_qos)
 
-    async_remove = async_dispatcher_connect(
-        hass, SIGNAL_MQTT_MESSAGE_RECEIVED, async_mqtt_topic_subscriber)
+    if not isinstance(topic, str):
+        raise HomeAssistantError("topic need to be a string!")
+
+    # Add the subscriber before subscribing with the broker, retained
+    # messages can arrive before the broker subscribe returns.
+    subscriptions.add(topic, async_mqtt_topic_subscriber)
+
+    try:
+        yield from hass.data[DATA_MQTT].async_subscribe(topic, qos)
+    except Exception:
+        subscriptions.remove(topic, async_mqtt_topic_subscriber)
+        raise
+
+    @callback
+    def async_remove():
+        """Remove the subscriber."""
+        subscriptions.remove(topic, async_mqtt_topic_subscriber)
 
-    yield from hass.data[DATA_MQTT].async_subscribe(topic, qos)
     return async_remove
 
 
@@ -436,6 +466,12 @@ class MQTT(object):
         self.birth_message = birth_message
         self._mqttc = None
         self._paho_lock = asyncio.Lock(loop=hass.loop)
+        # Messages received by the paho thread waiting to be dispatched
+        self._messages = []
+        self._messages_lock = threading.Lock()
+        self._drain_scheduled = False
+        self.buffered_messages = 0
+        self.drain_cycles = 0
 
         if protocol == PROTOCOL_31:
             proto = mqtt.MQTTv31
@@ -580,11 +616,35 @@ class MQTT(object):
         self.topics[topic] = granted_qos[0]
 
     def _mqtt_on_message(self, _mqttc, _userdata, msg):
-        """Message received callback."""
-        dispatcher_send(
-            self.hass, SIGNAL_MQTT_MESSAGE_RECEIVED, msg.topic, msg.payload,
-            msg.qos
-        )
+        """Message received callback.
+
+        Messages are buffered and dispatched in batches, so a flood of
+        messages does not wake up the event loop for every message.
+        """
+        with self._messages_lock:
+            self._messages.append((msg.topic, msg.payload, msg.qos))
+            self.buffered_messages += 1
+
+            if self._drain_scheduled:
+                return
+
+            self._drain_scheduled = True
+
+        self.hass.loop.call_soon_threadsafe(self._async_drain_messages)
+
+    @callback
+    def _async_drain_messages(self):
+        """Dispatch the buffered messages in the order they arrived."""
+        with self._messages_lock:
+            messages = self._messages
+            self._messages = []
+            self._drain_scheduled = False
+
+        self.drain_cycles += 1
+
+        for topic, payload, qos in messages:
+            async_dispatcher_send(
+                self.hass, SIGNAL_MQTT_MESSAGE_RECEIVED, topic, payload, qos)
 
     def _mqtt_on_unsubscribe(self, _mqttc, _userdata, mid, granted_qos):
         """Unsubscribe successful callback."""
@@ -637,22 +697,83 @@ def _raise_on_error(result):
             'Error talking to MQTT: {}'.format(mqtt.error_string(result)))
 
 
-def _match_topic(subscription, topic):
-    """Test if topic matches subscription."""
-    reg_ex_parts = []
-    suffix = ""
-    if subscription.endswith('#'):
-        subscription = subscription[:-2]
-        suffix = "(.*)"
-    sub_parts = subscription.split('/')
-    for sub_part in sub_parts:
-        if sub_part == "+":
-            reg_ex_parts.append(r"([^\/]+)")
-        else:
-            reg_ex_parts.append(re.escape(sub_part))
+class TopicMatcher(object):
+    """Index of subscriptions to find the ones matching a topic.
+
+    The subscription topics are stored in a trie by topic level, so a topic
+    is matched by walking its levels and the wildcards instead of testing
+    every subscription.
+    """
+
+    def __init__(self):
+        """Initialize the topic matcher."""
+        self._root = _TopicNode()
+        self._sequence = 0
+
+    def add(self, subscription, value):
+        """Add value for the subscription topic."""
+        node = self._root
+
+        for level in subscription.split('/'):
+            node = node.children.setdefault(level, _TopicNode())
+
+        self._sequence += 1
+        node.values.append((self._sequence, value))
+
+    def remove(self, subscription, value):
+        """Remove value of the subscription topic."""
+        path = [self._root]
+
+        for level in subscription.split('/'):
+            node = path[-1].children.get(level)
+            if node is None:
+                return
+            path.append(node)
+
+        path[-1].values = [item for item in path[-1].values
+                           if item[1] is not value]
+
+        # Prune the levels that have no subscriptions left
+        levels = subscription.split('/')
+        for index in range(len(levels), 0, -1):
+            if path[index].values or path[index].children:
+                break
+            del path[index - 1].children[levels[index - 1]]
+
+    def match(self, topic):
+        """Return the values of the subscriptions matching topic."""
+        levels = topic.split('/')
+        matches = []
+        nodes = [(self._root, 0)]
+
+        while nodes:
+            node, index = nodes.pop()
+
+            # A multi level wildcard matches the parent level as well
+            multi_level = node.children.get('#')
+            if multi_level is not None:
+                matches.extend(multi_level.values)
+
+            if index == len(levels):
+                matches.extend(node.values)
+                continue
+
+            for level in (levels[index], '+'):
+                child = node.children.get(level)
+                if child is not None:
+                    nodes.append((child, index + 1))
+
+        # Call the subscribers in the order they subscribed
+        matches.sort(key=lambda item: item[0])
+        return [value for _, value in matches]
+
 
-    reg_ex = "^" + (r'\/'.join(reg_ex_parts)) + suffix + "$"
+class _TopicNode(object):
+    """A topic level in the topic matcher."""
 
-    reg = re.compile(reg_ex)
+    __slots__ = ('children', 'values')
 
-    return reg.match(topic) is not None
+    def __init__(self):
+        """Initialize the topic level."""
+        self.children = {}
+        self.values = []
@@ -8,6 +8,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/recorder/
 """
 import asyncio
+from collections import Counter, OrderedDict
 import concurrent.futures
 import logging
 import queue
@@ -23,7 +24,8 @@ from homeassistant.core import (
 from homeassistant.const import (
     ATTR_ENTITY_ID, CONF_ENTITIES, CONF_EXCLUDE, CONF_DOMAINS,
     CONF_INCLUDE, EVENT_HOMEASSISTANT_STOP, EVENT_HOMEASSISTANT_START,
-    EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
+    EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, EVENT_CALL_SERVICE,
+    EVENT_SERVICE_EXECUTED, MATCH_ALL)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import ConfigType
@@ -45,9 +47,23 @@ DEFAULT_DB_FILE = 'home-assistant_v2.db'
 CONF_DB_URL = 'db_url'
 CONF_PURGE_DAYS = 'purge_days'
 CONF_EVENT_TYPES = 'event_types'
+CONF_COMMIT_INTERVAL = 'commit_interval'
+CONF_MAX_BATCH_SIZE = 'max_batch_size'
+CONF_RECORD_SERVICE_CALLS = 'record_service_calls'
 
 CONNECT_RETRY_WAIT = 3
 
+FILTER_EVENT_TYPES = 'event_types'
+FILTER_EXCLUDE_ENTITIES = 'exclude_entities'
+FILTER_EXCLUDE_DOMAINS = 'exclude_domains'
+FILTER_INCLUDE_DOMAINS = 'include_domains'
+FILTER_INCLUDE_ENTITIES = 'include_entities'
+
+ATTRIBUTES_CACHE_SIZE = 2048
+
+DEFAULT_COMMIT_INTERVAL = 0
+DEFAULT_MAX_BATCH_SIZE = 1000
+
 FILTER_SCHEMA = vol.Schema({
     vol.Optional(CONF_EXCLUDE, default={}): vol.Schema({
         vol.Optional(CONF_ENTITIES, default=[]): cv.entity_ids,
@@ -68,6 +84,11 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_PURGE_DAYS):
             vol.All(vol.Coerce(int), vol.Range(min=1)),
         vol.Optional(CONF_DB_URL): cv.string,
+        vol.Optional(CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL):
+            vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional(CONF_MAX_BATCH_SIZE, default=DEFAULT_MAX_BATCH_SIZE):
+            vol.All(vol.Coerce(int), vol.Range(min=1)),
+        vol.Optional(CONF_RECORD_SERVICE_CALLS, default=True): cv.boolean,
     })
 }, extra=vol.ALLOW_EXTRA)
 
@@ -107,6 +128,9 @@ def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the recorder."""
     conf = config.get(DOMAIN, {})
     purge_days = conf.get(CONF_PURGE_DAYS)
+    commit_interval = conf.get(CONF_COMMIT_INTERVAL, DEFAULT_COMMIT_INTERVAL)
+    max_batch_size = conf.get(CONF_MAX_BATCH_SIZE, DEFAULT_MAX_BATCH_SIZE)
+    record_service_calls = conf.get(CONF_RECORD_SERVICE_CALLS, True)
 
     db_url = conf.get(CONF_DB_URL, None)
     if not db_url:
@@ -117,7 +141,9 @@ def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     exclude = conf.get(CONF_EXCLUDE, {})
     instance = hass.data[DATA_INSTANCE] = Recorder(
         hass, purge_days=purge_days, uri=db_url, include=include,
-        exclude=exclude)
+        exclude=exclude, commit_interval=commit_interval,
+        max_batch_size=max_batch_size,
+        record_service_calls=record_service_calls)
     instance.async_initialize()
     instance.start()
 
@@ -128,12 +154,17 @@ class Recorder(threading.Thread):
     """A threaded recorder class."""
 
     def __init__(self, hass: HomeAssistant, purge_days: int, uri: str,
-                 include: Dict, exclude: Dict) -> None:
+                 include: Dict, exclude: Dict,
+                 commit_interval: float=DEFAULT_COMMIT_INTERVAL,
+                 max_batch_size: int=DEFAULT_MAX_BATCH_SIZE,
+                 record_service_calls: bool=True) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name='Recorder')
 
         self.hass = hass
         self.purge_days = purge_days
+        self.commit_interval = commit_interval
+        self.max_batch_size = max_batch_size
         self.queue = queue.Queue()  # type: Any
         self.recording_start = dt_util.utcnow()
         self.db_url = uri
@@ -141,11 +172,20 @@ class Recorder(threading.Thread):
         self.engine = None  # type: Any
         self.run_info = None  # type: Any
 
-        self.include_e = include.get(CONF_ENTITIES, [])
-        self.include_d = include.get(CONF_DOMAINS, [])
-        self.exclude = exclude.get(CONF_ENTITIES, []) + \
-            exclude.get(CONF_DOMAINS, [])
-        self.exclude_t = exclude.get(CONF_EVENT_TYPES, [])
+        self.include_e = frozenset(include.get(CONF_ENTITIES, []))
+        self.include_d = frozenset(include.get(CONF_DOMAINS, []))
+        self.exclude_e = frozenset(exclude.get(CONF_ENTITIES, []))
+        self.exclude_d = frozenset(exclude.get(CONF_DOMAINS, []))
+        exclude_t = exclude.get(CONF_EVENT_TYPES, []) + [EVENT_TIME_CHANGED]
+        if not record_service_calls:
+            exclude_t += [EVENT_CALL_SERVICE, EVENT_SERVICE_EXECUTED]
+        self.exclude_t = frozenset(exclude_t)
+        self.dropped_events = Counter()
+        self._purge = None  # type: Optional[purge.PurgeTask]
+        # Serialized attributes to attributes_id, least recently used first
+        self.attributes_cache = OrderedDict()  # type: OrderedDict
+        # Entities with a row in latest_states, loaded on first write
+        self._latest_entity_ids = None  # type: Optional[set]
 
         self.get_session = None
 
@@ -156,9 +196,7 @@ class Recorder(threading.Thread):
 
     def run(self):
         """Start processing events to save."""
-        from .models import States, Events
         from homeassistant.components import persistent_notification
-        from sqlalchemy import exc
 
         tries = 1
         connected = False
@@ -191,7 +229,9 @@ class Recorder(threading.Thread):
             return
 
         purge_task = object()
+        purge_continue_task = object()
         shutdown_task = object()
+        no_task = object()
         hass_started = concurrent.futures.Future()
 
         @callback
@@ -236,76 +276,212 @@ class Recorder(threading.Thread):
         if result is shutdown_task:
             return
 
+        # Shutdown or purge request that ended the previous batch
+        pending_task = no_task
+
         while True:
-            event = self.queue.get()
+            if pending_task is no_task:
+                event = self.queue.get()
+            else:
+                event, pending_task = pending_task, no_task
 
             if event is None:
                 self._close_run()
                 self._close_connection()
                 self.queue.task_done()
                 return
-            elif event is purge_task:
-                purge.purge_old_data(self, self.purge_days)
-                continue
-            elif event.event_type == EVENT_TIME_CHANGED:
-                self.queue.task_done()
-                continue
-            elif event.event_type in self.exclude_t:
+            elif event is purge_task or event is purge_continue_task:
+                if event is purge_task and self._purge is None:
+                    self._purge = purge.PurgeTask(self, self.purge_days)
+
+                # Purge one batch at a time and queue the rest behind the
+                # events that came in meanwhile, so writes are not blocked.
+                if self._purge is not None:
+                    if self._purge.run_batch():
+                        self._purge = None
+                    else:
+                        self.queue.put(purge_continue_task)
+
                 self.queue.task_done()
                 continue
 
-            entity_id = event.data.get(ATTR_ENTITY_ID)
-            if entity_id is not None:
-                domain = split_entity_id(entity_id)[0]
-
-                # Exclude entities OR
-                # Exclude domains, but include specific entities
-                if (entity_id in self.exclude) or \
-                        (domain in self.exclude and
-                         entity_id not in self.include_e):
-                    self.queue.task_done()
-                    continue
-
-                # Included domains only (excluded entities above) OR
-                # Include entities only, but only if no excludes
-                if (self.include_d and domain not in self.include_d) or \
-                        (self.include_e and entity_id not in self.include_e
-                         and not self.exclude):
-                    self.queue.task_done()
-                    continue
-
-            tries = 1
-            updated = False
-            while not updated and tries <= 10:
-                if tries != 1:
-                    time.sleep(CONNECT_RETRY_WAIT)
+            # Drain everything that is queued up behind this event until the
+            # batch is full or the commit interval is over. Shutdown and
+            # purge requests end the batch and are handled afterwards.
+            batch = [event]
+            deadline = time.monotonic() + self.commit_interval
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
                 try:
-                    with session_scope(session=self.get_session()) as session:
+                    if timeout > 0:
+                        item = self.queue.get(timeout=timeout)
+                    else:
+                        item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+
+                if item is None or item is purge_task or \
+                        item is purge_continue_task:
+                    pending_task = item
+                    break
+
+                batch.append(item)
+
+            self._save_events(batch)
+
+            for _ in batch:
+                self.queue.task_done()
+
+    def _save_events(self, events):
+        """Write a batch of events in a single transaction.
+
+        The whole batch is retried when the database connection fails.
+        """
+        from .models import States, Events
+        from sqlalchemy import exc
+
+        if not events:
+            return
+
+        tries = 1
+        updated = False
+        while not updated and tries <= 10:
+            if tries != 1:
+                time.sleep(CONNECT_RETRY_WAIT)
+            try:
+                with session_scope(session=self.get_session()) as session:
+                    latest = {}
+                    for event in events:
                         dbevent = Events.from_event(event)
                         session.add(dbevent)
 
                         if event.event_type == EVENT_STATE_CHANGED:
+                            # Flush to get the event_id, still uncommitted
+                            session.flush()
                             dbstate = States.from_event(event)
                             dbstate.event_id = dbevent.event_id
+                            dbstate.attributes_id = self._get_attributes_id(
+                                session, dbstate.attributes)
+                            dbstate.attributes = None
                             session.add(dbstate)
-                    updated = True
+                            latest[dbstate.entity_id] = dbstate
+
+                    if latest:
+                        session.flush()
+                        self._update_latest_states(session, latest.values())
+                updated = True
+
+            except exc.OperationalError as err:
+                # Rows added in this batch were rolled back
+                self.attributes_cache.clear()
+                self._latest_entity_ids = None
+                _LOGGER.error("Error in database connectivity: %s. "
+                              "(retrying in %s seconds)", err,
+                              CONNECT_RETRY_WAIT)
+                tries += 1
+
+        if not updated:
+            _LOGGER.error("Error in database update. Could not save %d "
+                          "events after %d tries. Giving up",
+                          len(events), tries)
+
+    def _update_latest_states(self, session, dbstates):
+        """Point the latest state of each entity to the written states."""
+        from .models import LatestStates
+
+        if self._latest_entity_ids is None:
+            self._latest_entity_ids = set(
+                row[0] for row in session.query(LatestStates.entity_id))
+
+        for dbstate in dbstates:
+            # Purge can remove rows, so fall back to an insert
+            if dbstate.entity_id not in self._latest_entity_ids or \
+                    not session.query(LatestStates).filter_by(
+                        entity_id=dbstate.entity_id).update({
+                            'state_id': dbstate.state_id,
+                            'created': dbstate.created,
+                        }, synchronize_session=False):
+                session.add(LatestStates(
+                    entity_id=dbstate.entity_id,
+                    state_id=dbstate.state_id,
+                    created=dbstate.created))
+                self._latest_entity_ids.add(dbstate.entity_id)
+
+    def _get_attributes_id(self, session, shared_attrs):
+        """Return the id of the stored attributes, adding them if needed."""
+        from .models import StateAttributes
+
+        attributes_id = self.attributes_cache.get(shared_attrs)
+
+        if attributes_id is not None:
+            self.attributes_cache.move_to_end(shared_attrs)
+            return attributes_id
+
+        attr_hash = StateAttributes.hash_shared_attrs(shared_attrs)
+        row = session.query(StateAttributes.attributes_id).filter(
+            (StateAttributes.hash == attr_hash) &
+            (StateAttributes.shared_attrs == shared_attrs)).first()
+
+        if row is not None:
+            attributes_id = row[0]
+        else:
+            dbattr = StateAttributes(hash=attr_hash, shared_attrs=shared_attrs)
+            session.add(dbattr)
+            session.flush()
+            attributes_id = dbattr.attributes_id
 
-                except exc.OperationalError as err:
-                    _LOGGER.error("Error in database connectivity: %s. "
-                                  "(retrying in %s seconds)", err,
-                                  CONNECT_RETRY_WAIT)
-                    tries += 1
+        self.attributes_cache[shared_attrs] = attributes_id
 
-            if not updated:
-                _LOGGER.error("Error in database update. Could not save "
-                              "after %d tries. Giving up", tries)
+        if len(self.attributes_cache) > ATTRIBUTES_CACHE_SIZE:
+            self.attributes_cache.popitem(last=False)
 
-            self.queue.task_done()
+        return attributes_id
 
     @callback
     def event_listener(self, event):
-        """Listen for new events and put them in the process queue."""
-        self.queue.put(event)
+        """Listen for new events and put them in the process queue.
+
+        Events that are filtered out never reach the queue. The number of
+        events dropped by each filter is counted in dropped_events.
+        """
+        reason = self._async_filter_reason(event)
+
+        if reason is None:
+            self.queue.put(event)
+        else:
+            self.dropped_events[reason] += 1
+
+    @callback
+    def _async_filter_reason(self, event):
+        """Return the filter that excludes the event or None to record it."""
+        if event.event_type in self.exclude_t:
+            return FILTER_EVENT_TYPES
+
+        entity_id = event.data.get(ATTR_ENTITY_ID)
+        if entity_id is None:
+            return None
+
+        # Exclude entities
+        if entity_id in self.exclude_e:
+            return FILTER_EXCLUDE_ENTITIES
+
+        domain = split_entity_id(entity_id)[0]
+
+        # Exclude domains, but include specific entities
+        if domain in self.exclude_d and entity_id not in self.include_e:
+            return FILTER_EXCLUDE_DOMAINS
+
+        # Included domains only (excluded entities above)
+        if self.include_d and domain not in self.include_d:
+            return FILTER_INCLUDE_DOMAINS
+
+        # Include entities only, but only if no excludes
+        if self.include_e and entity_id not in self.include_e and \
+                not self.exclude_e and not self.exclude_d:
+            return FILTER_INCLUDE_ENTITIES
+
+        return None
 
     def block_till_done(self):
         """Block till all events processed."""
@@ -325,11 +501,17 @@ class Recorder(threading.Thread):
         # pylint: disable=unused-variable
         @event.listens_for(Engine, "connect")
         def set_sqlite_pragma(dbapi_connection, connection_record):
-            """Set sqlite's WAL mode."""
+            """Set sqlite's WAL mode and incremental vacuum for new dbs.
+
+            Existing databases only switch to incremental vacuum after a
+            full VACUUM. Purge runs one as long as the database is not in
+            incremental mode, so that happens on the first purge.
+            """
             if self.db_url.startswith("sqlite://"):
                 old_isolation = dbapi_connection.isolation_level
                 dbapi_connection.isolation_level = None
                 cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
                 cursor.execute("PRAGMA journal_mode=WAL")
                 cursor.close()
                 dbapi_connection.isolation_level = old_isolation
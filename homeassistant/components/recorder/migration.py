@@ -54,6 +54,39 @@ def _create_index(engine, table_name, index_name):
     _LOGGER.debug("Finished creating %s", index_name)
 
 
+def _add_columns(engine, table_name, columns_def):
+    """Add columns to a table."""
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    _LOGGER.info("Adding columns %s to table %s. Note: this can take several "
+                 "minutes on large databases and slow computers. Please "
+                 "be patient!", ', '.join(columns_def), table_name)
+
+    for column_def in columns_def:
+        try:
+            engine.execute(text("ALTER TABLE {table} ADD COLUMN {column}"
+                                .format(table=table_name, column=column_def)))
+        except OperationalError:
+            _LOGGER.warning("Column %s already exists on %s, continuing",
+                            column_def.split(' ')[0], table_name)
+
+
+def _fill_latest_states(engine):
+    """Fill the latest_states table from the recorded states."""
+    from sqlalchemy import text
+
+    _LOGGER.info("Building latest state per entity. Note: this can take "
+                 "several minutes on large databases and slow computers. "
+                 "Please be patient!")
+    engine.execute(text(
+        "INSERT INTO latest_states (entity_id, state_id, created) "
+        "SELECT states.entity_id, states.state_id, states.created "
+        "FROM states JOIN (SELECT max(state_id) AS max_state_id "
+        "FROM states GROUP BY entity_id) AS latest "
+        "ON states.state_id = latest.max_state_id"))
+
+
 def _apply_update(engine, new_version):
     """Perform operations to bring schema up to date."""
     if new_version == 1:
@@ -66,6 +99,15 @@ def _apply_update(engine, new_version):
         _create_index(engine, "states", "ix_states_entity_id_created")
     elif new_version == 3:
         _create_index(engine, "states", "ix_states_created_domain")
+    elif new_version == 4:
+        # The state_attributes table is created by create_all
+        _add_columns(engine, "states", ["attributes_id INTEGER"])
+        _create_index(engine, "states", "ix_states_attributes_id")
+    elif new_version == 5:
+        # The latest_states table is created by create_all
+        _fill_latest_states(engine)
+    elif new_version == 6:
+        _create_index(engine, "states", "ix_states_event_id")
     else:
         raise ValueError("No schema migration defined for version {}"
                          .format(new_version))
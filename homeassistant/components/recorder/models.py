@@ -2,11 +2,13 @@
 import json
 from datetime import datetime
 import logging
+import zlib
 
 from sqlalchemy import (
-    Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Text,
-    distinct)
+    BigInteger, Boolean, Column, DateTime, ForeignKey, Index, Integer, String,
+    Text, distinct)
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import relationship
 
 import homeassistant.util.dt as dt_util
 from homeassistant.core import Event, EventOrigin, State, split_entity_id
@@ -16,7 +18,7 @@ from homeassistant.remote import JSONEncoder
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 3
+SCHEMA_VERSION = 6
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -55,6 +57,31 @@ class Events(Base):  # type: ignore
             return None
 
 
+class StateAttributes(Base):   # type: ignore
+    """State attribute blobs, shared by all states with equal attributes."""
+
+    __tablename__ = 'state_attributes'
+    attributes_id = Column(Integer, primary_key=True)
+    hash = Column(BigInteger, index=True)
+    shared_attrs = Column(Text)
+
+    @staticmethod
+    def hash_shared_attrs(shared_attrs):
+        """Return the content hash of serialized attributes."""
+        return zlib.crc32(shared_attrs.encode('utf-8'))
+
+    def to_native(self):
+        """Return the attributes dict.
+
+        The decoded dict is cached, so each blob is only decoded once per
+        session. It is shared by all states and should not be mutated.
+        """
+        attributes = getattr(self, '_native', None)
+        if attributes is None:
+            attributes = self._native = json.loads(self.shared_attrs)
+        return attributes
+
+
 class States(Base):   # type: ignore
     """State change history."""
 
@@ -64,7 +91,10 @@ class States(Base):   # type: ignore
     entity_id = Column(String(255))
     state = Column(String(255))
     attributes = Column(Text)
-    event_id = Column(Integer, ForeignKey('events.event_id'))
+    attributes_id = Column(Integer,
+                           ForeignKey('state_attributes.attributes_id'),
+                           index=True)
+    event_id = Column(Integer, ForeignKey('events.event_id'), index=True)
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
     last_updated = Column(DateTime(timezone=True), default=datetime.utcnow,
                           index=True)
@@ -79,9 +109,17 @@ class States(Base):   # type: ignore
                       Index('ix_states_created_domain',
                             'created', 'domain'),)
 
+    # Many states share one blob. The blobs of the states of a query are
+    # loaded in one extra query, which returns each distinct blob once.
+    state_attributes = relationship(StateAttributes, lazy='subquery')
+
     @staticmethod
     def from_event(event):
-        """Create object from a state_changed event."""
+        """Create object from a state_changed event.
+
+        The serialized attributes are stored in the attributes column. The
+        recorder moves them to the shared state_attributes table.
+        """
         entity_id = event.data['entity_id']
         state = event.data.get('new_state')
 
@@ -107,9 +145,14 @@ class States(Base):   # type: ignore
     def to_native(self):
         """Convert to an HA state object."""
         try:
+            if self.attributes is None and self.attributes_id is not None:
+                attributes = self.state_attributes.to_native()
+            else:
+                attributes = json.loads(self.attributes)
+
             return State(
                 self.entity_id, self.state,
-                json.loads(self.attributes),
+                attributes,
                 _process_timestamp(self.last_changed),
                 _process_timestamp(self.last_updated)
             )
@@ -119,6 +162,15 @@ class States(Base):   # type: ignore
             return None
 
 
+class LatestStates(Base):   # type: ignore
+    """Most recently recorded state per entity, maintained by the recorder."""
+
+    __tablename__ = 'latest_states'
+    entity_id = Column(String(255), primary_key=True)
+    state_id = Column(Integer, ForeignKey('states.state_id'))
+    created = Column(DateTime(timezone=True))
+
+
 class RecorderRuns(Base):   # type: ignore
     """Representation of recorder run."""
 
@@ -1,6 +1,7 @@
 """Purge old data helper."""
 from datetime import timedelta
 import logging
+import time
 
 import homeassistant.util.dt as dt_util
 
@@ -8,24 +9,131 @@ from .util import session_scope
 
 _LOGGER = logging.getLogger(__name__)
 
+# Maximum number of states and events deleted per transaction
+PURGE_BATCH_SIZE = 1000
 
-def purge_old_data(instance, purge_days):
-    """Purge events and states older than purge_days ago."""
-    from .models import States, Events
-    purge_before = dt_util.utcnow() - timedelta(days=purge_days)
+# Value of PRAGMA auto_vacuum when incremental vacuum is enabled
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
 
-    with session_scope(session=instance.get_session()) as session:
-        deleted_rows = session.query(States) \
-                              .filter((States.created < purge_before)) \
-                              .delete(synchronize_session=False)
-        _LOGGER.debug("Deleted %s states", deleted_rows)
 
-        deleted_rows = session.query(Events) \
-                              .filter((Events.created < purge_before)) \
-                              .delete(synchronize_session=False)
-        _LOGGER.debug("Deleted %s events", deleted_rows)
+class PurgeTask(object):
+    """Purge of old data that is deleted in bounded batches."""
 
-    # Execute sqlite vacuum command to free up space on disk
-    if instance.engine.driver == 'sqlite':
+    def __init__(self, instance, purge_days, batch_size=PURGE_BATCH_SIZE):
+        """Initialize the purge task."""
+        self.instance = instance
+        self.purge_before = dt_util.utcnow() - timedelta(days=purge_days)
+        self.batch_size = batch_size
+        self.states_deleted = 0
+        self.events_deleted = 0
+        self.attributes_deleted = 0
+        self.duration = 0.0
+        self.done = False
+
+    def run_batch(self):
+        """Delete one batch of old states and events.
+
+        Returns True when all old data has been purged.
+        """
+        from .models import States, Events, StateAttributes, LatestStates
+        start = time.monotonic()
+
+        with session_scope(session=self.instance.get_session()) as session:
+            # Entities that did not change since purge_before
+            session.query(LatestStates) \
+                   .filter(LatestStates.created < self.purge_before) \
+                   .delete(synchronize_session=False)
+            states = _delete_batch(
+                session, States, States.state_id, States.created,
+                self.purge_before, self.batch_size)
+            events = _delete_batch(
+                session, Events, Events.event_id, Events.created,
+                self.purge_before, self.batch_size)
+
+        _LOGGER.debug("Deleted %s states and %s events", states, events)
+        self.states_deleted += states
+        self.events_deleted += events
+
+        if states < self.batch_size and events < self.batch_size:
+            with session_scope(
+                    session=self.instance.get_session()) as session:
+                self.attributes_deleted = session.query(StateAttributes) \
+                    .filter(~StateAttributes.attributes_id.in_(
+                        session.query(States.attributes_id).filter(
+                            States.attributes_id.isnot(None)))) \
+                    .delete(synchronize_session=False)
+            # Cached ids may point to deleted attributes
+            self.instance.attributes_cache.clear()
+
+            _vacuum(self.instance)
+            self.done = True
+
+        self.duration += time.monotonic() - start
+
+        if self.done:
+            _LOGGER.info("Purged %s states, %s events and %s attributes in "
+                         "%.2f seconds", self.states_deleted,
+                         self.events_deleted, self.attributes_deleted,
+                         self.duration)
+
+        return self.done
+
+
+def purge_old_data(instance, purge_days, batch_size=PURGE_BATCH_SIZE):
+    """Purge events and states older than purge_days ago.
+
+    Returns the finished PurgeTask with the purge statistics.
+    """
+    task = PurgeTask(instance, purge_days, batch_size)
+
+    while not task.run_batch():
+        pass
+
+    return task
+
+
+def _delete_batch(session, model, id_column, created_column, purge_before,
+                  batch_size):
+    """Delete the batch_size oldest rows created before purge_before.
+
+    The rows are deleted by id range to keep the delete statement small.
+    """
+    ids = [row[0] for row in session.query(id_column)
+           .filter(created_column < purge_before)
+           .order_by(id_column)
+           .limit(batch_size)]
+
+    if not ids:
+        return 0
+
+    return session.query(model) \
+                  .filter((id_column <= ids[-1]) &
+                          (created_column < purge_before)) \
+                  .delete(synchronize_session=False)
+
+
+def _vacuum(instance):
+    """Free up disk space after deleting rows.
+
+    Uses an incremental vacuum when SQLite supports it for the database,
+    because a full VACUUM locks the database while it rewrites it.
+    """
+    if instance.engine.dialect.name != 'sqlite':
+        return
+
+    auto_vacuum = instance.engine.execute("PRAGMA auto_vacuum").scalar()
+
+    if auto_vacuum == SQLITE_AUTO_VACUUM_INCREMENTAL:
+        _LOGGER.debug("Incremental vacuuming SQLite to free space")
+        # The pragma frees one page each time it is stepped, so executing
+        # it as a statement would barely free anything. A script runs it
+        # to completion.
+        raw_connection = instance.engine.raw_connection()
+        try:
+            raw_connection.connection.executescript(
+                "PRAGMA incremental_vacuum;")
+        finally:
+            raw_connection.close()
+    else:
         _LOGGER.info("Vacuuming SQLite to free space")
         instance.engine.execute("VACUUM")
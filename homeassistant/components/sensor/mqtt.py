@@ -127,6 +127,11 @@ class MqttSensor(Entity):
         """Return the unit this state is expressed in."""
         return self._unit_of_measurement
 
+    @property
+    def cache_static_attributes(self):
+        """Return True because name and unit are from the config."""
+        return True
+
     @property
     def force_update(self):
         """Force update."""
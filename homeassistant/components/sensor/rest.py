@@ -96,6 +96,11 @@ class RestSensor(Entity):
         """Return the unit the value is expressed in."""
         return self._unit_of_measurement
 
+    @property
+    def cache_static_attributes(self):
+        """Return True because name and unit are from the config."""
+        return True
+
     @property
     def state(self):
         """Return the state of the device."""
@@ -110,6 +110,11 @@ class SystemMonitorSensor(Entity):
         """Return the unit of measurement of this entity, if any."""
         return self._unit_of_measurement
 
+    @property
+    def cache_static_attributes(self):
+        """Return True because name, icon and unit follow the sensor type."""
+        return True
+
     def update(self):
         """Get the latest system information."""
         import psutil
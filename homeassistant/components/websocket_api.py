@@ -6,8 +6,6 @@ https://home-assistant.io/developers/websocket_api/
 """
 import asyncio
 from contextlib import suppress
-from functools import partial
-import json
 import logging
 
 from aiohttp import web
@@ -15,11 +13,11 @@ import voluptuous as vol
 from voluptuous.humanize import humanize_error
 
 from homeassistant.const import (
-    MATCH_ALL, EVENT_TIME_CHANGED, EVENT_HOMEASSISTANT_STOP,
-    __version__)
+    ATTR_ENTITY_ID, MATCH_ALL, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED,
+    EVENT_HOMEASSISTANT_STOP, __version__)
 from homeassistant.components import frontend
-from homeassistant.core import callback
-from homeassistant.remote import JSONEncoder
+from homeassistant.core import callback, split_entity_id
+from homeassistant.remote import json_encode
 from homeassistant.helpers import config_validation as cv
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.http.auth import validate_password
@@ -55,7 +53,7 @@ TYPE_UNSUBSCRIBE_EVENTS = 'unsubscribe_events'
 
 _LOGGER = logging.getLogger(__name__)
 
-JSON_DUMP = partial(json.dumps, cls=JSONEncoder)
+JSON_DUMP = json_encode
 
 AUTH_MESSAGE_SCHEMA = vol.Schema({
     vol.Required('type'): TYPE_AUTH,
@@ -66,6 +64,9 @@ SUBSCRIBE_EVENTS_MESSAGE_SCHEMA = vol.Schema({
     vol.Required('id'): cv.positive_int,
     vol.Required('type'): TYPE_SUBSCRIBE_EVENTS,
     vol.Optional('event_type', default=MATCH_ALL): str,
+    vol.Optional('entity_id'): cv.entity_ids,
+    vol.Optional('domain'): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional('diff', default=False): cv.boolean,
 })
 
 UNSUBSCRIBE_EVENTS_MESSAGE_SCHEMA = vol.Schema({
@@ -145,11 +146,53 @@ def auth_invalid_message(message):
 
 
 def event_message(iden, event):
-    """Return an event message."""
+    """Return an event message encoded as JSON.
+
+    Reuses the JSON encoding of the event that is shared by all connections.
+    """
+    return '{{"id": {}, "type": "{}", "event": {}}}'.format(
+        JSON_DUMP(iden), TYPE_EVENT, event.as_json())
+
+
+def state_diff_message(iden, event):
+    """Return an event message with the changes of a state changed event."""
+    old_state = event.data.get('old_state')
+    new_state = event.data.get('new_state')
+
+    if old_state is None or new_state is None:
+        diff = {'new_state': new_state}
+    else:
+        diff = {'last_updated': new_state.last_updated}
+
+        if new_state.state != old_state.state:
+            diff['state'] = new_state.state
+
+        if new_state.last_changed != old_state.last_changed:
+            diff['last_changed'] = new_state.last_changed
+
+        old_attr = old_state.attributes
+        changed = {key: value for key, value
+                   in new_state.attributes.items()
+                   if key not in old_attr or old_attr[key] != value}
+        if changed:
+            diff['attributes'] = changed
+
+        removed = [key for key in old_attr if key not in new_state.attributes]
+        if removed:
+            diff['removed_attributes'] = removed
+
     return {
         'id': iden,
         'type': TYPE_EVENT,
-        'event': event.as_dict(),
+        'event': {
+            'event_type': event.event_type,
+            'data': {
+                'entity_id': event.data.get(ATTR_ENTITY_ID),
+                'diff': diff,
+            },
+            'origin': str(event.origin),
+            'time_fired': event.time_fired,
+        },
     }
 
 
@@ -235,7 +278,12 @@ class ActiveConnection:
                 if message is None:
                     break
                 self.debug("Sending", message)
-                yield from self.wsock.send_json(message, dumps=JSON_DUMP)
+
+                # Messages that are already encoded are sent as is
+                if isinstance(message, str):
+                    yield from self.wsock.send_str(message)
+                else:
+                    yield from self.wsock.send_json(message, dumps=JSON_DUMP)
 
     @callback
     def send_message_outside(self, message):
@@ -400,14 +448,41 @@ class ActiveConnection:
         Async friendly.
         """
         msg = SUBSCRIBE_EVENTS_MESSAGE_SCHEMA(msg)
+        entity_ids = msg.get('entity_id')
+        domains = msg.get('domain')
+        send_diff = msg['diff']
 
-        @asyncio.coroutine
+        if entity_ids is not None:
+            entity_ids = set(entity_ids)
+
+        if domains is not None:
+            domains = set(domain.lower() for domain in domains)
+
+        @callback
         def forward_events(event):
             """Forward events to websocket."""
             if event.event_type == EVENT_TIME_CHANGED:
                 return
 
-            self.send_message_outside(event_message(msg['id'], event))
+            # Filter before the event gets encoded
+            if entity_ids is not None or domains is not None:
+                entity_id = event.data.get(ATTR_ENTITY_ID)
+
+                if not isinstance(entity_id, str):
+                    return
+
+                if not ((entity_ids is not None and
+                         entity_id in entity_ids) or
+                        (domains is not None and
+                         split_entity_id(entity_id)[0] in domains)):
+                    return
+
+            if send_diff and event.event_type == EVENT_STATE_CHANGED:
+                message = state_diff_message(msg['id'], event)
+            else:
+                message = event_message(msg['id'], event)
+
+            self.send_message_outside(message)
 
         self.event_listeners[msg['id']] = self.hass.bus.async_listen(
             msg['event_type'], forward_events)
@@ -217,6 +217,9 @@ ATTR_DOMAIN = 'domain'
 ATTR_SERVICE = 'service'
 ATTR_SERVICE_DATA = 'service_data'
 
+# Set in a SERVICE_CALL event of a call that has already been executed
+ATTR_SERVICE_HANDLED = 'service_handled'
+
 # Data for a SERVICE_EXECUTED event
 ATTR_SERVICE_CALL_ID = 'service_call_id'
 
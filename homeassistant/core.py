@@ -8,6 +8,7 @@ of entities and react to changes.
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 import enum
+import json
 import logging
 import os
 import pathlib
@@ -25,7 +26,8 @@ from voluptuous.humanize import humanize_error
 
 from homeassistant.const import (
     ATTR_DOMAIN, ATTR_FRIENDLY_NAME, ATTR_NOW, ATTR_SERVICE,
-    ATTR_SERVICE_CALL_ID, ATTR_SERVICE_DATA, EVENT_CALL_SERVICE,
+    ATTR_SERVICE_CALL_ID, ATTR_SERVICE_DATA, ATTR_SERVICE_HANDLED,
+    EVENT_CALL_SERVICE,
     EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP,
     EVENT_SERVICE_EXECUTED, EVENT_SERVICE_REGISTERED, EVENT_STATE_CHANGED,
     EVENT_TIME_CHANGED, MATCH_ALL, EVENT_HOMEASSISTANT_CLOSE,
@@ -76,6 +78,27 @@ def is_callback(func: Callable[..., Any]) -> bool:
     return '_hass_callback' in func.__dict__
 
 
+class JobType(enum.Enum):
+    """Represent how a callable is run by async_add_job."""
+
+    callback = 'CALLBACK'
+    coroutinefunction = 'COROUTINEFUNCTION'
+    executor = 'EXECUTOR'
+
+    def __str__(self) -> str:
+        """Return the job type."""
+        return self.value
+
+
+def get_job_type(target: Callable[..., Any]) -> JobType:
+    """Determine how a callable is run by async_add_job."""
+    if is_callback(target):
+        return JobType.callback
+    elif asyncio.iscoroutinefunction(target):
+        return JobType.coroutinefunction
+    return JobType.executor
+
+
 @callback
 def async_loop_exception_handler(loop, context):
     """Handle all exception inside the core loop."""
@@ -306,7 +329,7 @@ class EventOrigin(enum.Enum):
 class Event(object):
     """Representation of an event within the bus."""
 
-    __slots__ = ['event_type', 'data', 'origin', 'time_fired']
+    __slots__ = ['event_type', 'data', 'origin', 'time_fired', '_json']
 
     def __init__(self, event_type, data=None, origin=EventOrigin.local,
                  time_fired=None):
@@ -315,6 +338,7 @@ class Event(object):
         self.data = data or {}
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
+        self._json = None
 
     def as_dict(self):
         """Create a dict representation of this Event.
@@ -328,6 +352,20 @@ class Event(object):
             'time_fired': self.time_fired,
         }
 
+    def as_json(self):
+        """Return the JSON representation of this Event.
+
+        The event is serialized once and the result is shared by everyone
+        forwarding the event.
+
+        Async friendly.
+        """
+        if self._json is None:
+            from homeassistant.remote import json_encode
+            self._json = json_encode(self.as_dict())
+
+        return self._json
+
     def __repr__(self):
         """Return the representation."""
         # pylint: disable=maybe-no-member
@@ -353,7 +391,11 @@ class EventBus(object):
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
+        # Maps event type to a list of (listener, job type)
         self._listeners = {}
+        # Maps event type to a tuple of (listener, job type) to call when
+        # the event is fired, including the MATCH_ALL listeners.
+        self._dispatch = {}
         self._hass = hass
 
     @callback
@@ -372,6 +414,21 @@ class EventBus(object):
             self._hass.loop, self.async_listeners
         ).result()
 
+    @callback
+    def async_listener_count(self, event_type: str) -> int:
+        """Return the number of listeners an event of event_type goes to.
+
+        This includes the listeners of all events.
+
+        This method must be run in the event loop.
+        """
+        dispatch = self._dispatch.get(event_type)
+
+        if dispatch is None:
+            dispatch = self._async_build_dispatch(event_type)
+
+        return len(dispatch)
+
     def fire(self, event_type: str, event_data=None, origin=EventOrigin.local):
         """Fire an event."""
         self._hass.loop.call_soon_threadsafe(
@@ -384,22 +441,54 @@ class EventBus(object):
 
         This method must be run in the event loop.
         """
-        listeners = self._listeners.get(event_type, [])
+        dispatch = self._dispatch.get(event_type)
 
-        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
-        if event_type != EVENT_HOMEASSISTANT_CLOSE:
-            listeners = self._listeners.get(MATCH_ALL, []) + listeners
+        if dispatch is None:
+            dispatch = self._async_build_dispatch(event_type)
+
+        # Don't create an event nobody will see
+        if not dispatch and (event_type == EVENT_TIME_CHANGED or
+                             not _LOGGER.isEnabledFor(logging.INFO)):
+            return
 
         event = Event(event_type, event_data, origin)
 
         if event_type != EVENT_TIME_CHANGED:
             _LOGGER.info("Bus:Handling %s", event)
 
-        if not listeners:
-            return
+        for func, job_type in dispatch:
+            if job_type is JobType.callback:
+                self._hass.loop.call_soon(func, event)
+            elif job_type is JobType.coroutinefunction:
+                self._hass.async_add_job(func(event))
+            else:
+                self._hass.async_add_job(func, event)
+
+    @callback
+    def _async_build_dispatch(self, event_type):
+        """Build and cache the listeners to call for an event type.
+
+        This method must be run in the event loop.
+        """
+        listeners = self._listeners.get(event_type, [])
+
+        # EVENT_HOMEASSISTANT_CLOSE should go only to his listeners
+        if event_type != EVENT_HOMEASSISTANT_CLOSE:
+            listeners = self._listeners.get(MATCH_ALL, []) + listeners
+
+        dispatch = self._dispatch[event_type] = tuple(listeners)
+        return dispatch
+
+    @callback
+    def _async_invalidate_dispatch(self, event_type):
+        """Drop cached dispatch tuples after listeners changed.
 
-        for func in listeners:
-            self._hass.async_add_job(func, event)
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+        else:
+            self._dispatch.pop(event_type, None)
 
     def listen(self, event_type, listener):
         """Listen for all events or events of a specific type.
@@ -426,10 +515,14 @@ class EventBus(object):
 
         This method must be run in the event loop.
         """
+        entry = (listener, get_job_type(listener))
+
         if event_type in self._listeners:
-            self._listeners[event_type].append(listener)
+            self._listeners[event_type].append(entry)
         else:
-            self._listeners[event_type] = [listener]
+            self._listeners[event_type] = [entry]
+
+        self._async_invalidate_dispatch(event_type)
 
         def remove_listener():
             """Remove the listener."""
@@ -490,14 +583,19 @@ class EventBus(object):
         This method must be run in the event loop.
         """
         try:
-            self._listeners[event_type].remove(listener)
+            listeners = self._listeners[event_type]
+            listeners.pop(next(
+                idx for idx, (func, _) in enumerate(listeners)
+                if func is listener))
 
             # delete event_type list if empty
-            if not self._listeners[event_type]:
+            if not listeners:
                 self._listeners.pop(event_type)
-        except (KeyError, ValueError):
+
+            self._async_invalidate_dispatch(event_type)
+        except (KeyError, StopIteration):
             # KeyError is key event_type listener did not exist
-            # ValueError if listener did not exist within event_type
+            # StopIteration if listener did not exist within event_type
             _LOGGER.warning("Unable to remove unknown listener %s", listener)
 
 
@@ -512,7 +610,7 @@ class State(object):
     """
 
     __slots__ = ['entity_id', 'state', 'attributes',
-                 'last_changed', 'last_updated']
+                 'last_changed', 'last_updated', '_json']
 
     def __init__(self, entity_id, state, attributes=None, last_changed=None,
                  last_updated=None):
@@ -527,6 +625,7 @@ class State(object):
         self.attributes = MappingProxyType(attributes or {})
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
+        self._json = None
 
     @property
     def domain(self):
@@ -559,6 +658,22 @@ class State(object):
                 'last_changed': self.last_changed,
                 'last_updated': self.last_updated}
 
+    def as_json(self):
+        """Return the JSON representation of the State.
+
+        States don't change once created, so the state is serialized once
+        and the result is shared by everyone returning the state. The keys
+        are sorted like in the responses of the HTTP API.
+
+        Async friendly.
+        """
+        if self._json is None:
+            from homeassistant.remote import JSONEncoder
+            self._json = json.dumps(self.as_dict(), sort_keys=True,
+                                    cls=JSONEncoder)
+
+        return self._json
+
     @classmethod
     def from_dict(cls, json_dict):
         """Initialize a state from a dict.
@@ -795,6 +910,9 @@ class ServiceRegistry(object):
         self._services = {}
         self._hass = hass
         self._async_unsub_call_event = None
+        # Maps call_id of blocking calls to the future of the call
+        self._pending_calls = {}
+        self._async_unsub_executed_event = None
 
         def _gen_unique_id():
             cur_id = 1
@@ -937,9 +1055,9 @@ class ServiceRegistry(object):
         If blocking = True, will return boolean if service executed
         succesfully within SERVICE_CALL_LIMIT.
 
-        This method will fire an event to call the service.
-        This event will be picked up by this ServiceRegistry and any
-        other ServiceRegistry that is listening on the EventBus.
+        Services registered with this ServiceRegistry are executed directly
+        and fired as a handled event afterwards for observers. Other calls
+        are fired as an event for other ServiceRegistry instances.
 
         Because the service is sent as an event you are not allowed to use
         the keys ATTR_DOMAIN and ATTR_SERVICE in your service_data.
@@ -947,38 +1065,157 @@ class ServiceRegistry(object):
         This method is a coroutine.
         """
         call_id = self._generate_unique_id()
+        domain = domain.lower()
+        service = service.lower()
 
         event_data = {
-            ATTR_DOMAIN: domain.lower(),
-            ATTR_SERVICE: service.lower(),
+            ATTR_DOMAIN: domain,
+            ATTR_SERVICE: service,
             ATTR_SERVICE_DATA: service_data,
             ATTR_SERVICE_CALL_ID: call_id,
         }
 
+        if service in self._services.get(domain, {}):
+            success = yield from self._async_call_direct(
+                event_data, blocking)
+
+            if blocking:
+                return success
+            return
+
         if blocking:
             fut = asyncio.Future(loop=self._hass.loop)
+            self._pending_calls[call_id] = fut
 
-            @callback
-            def service_executed(event):
-                """Handle an executed service."""
-                if event.data[ATTR_SERVICE_CALL_ID] == call_id:
-                    fut.set_result(True)
-
-            unsub = self._hass.bus.async_listen(
-                EVENT_SERVICE_EXECUTED, service_executed)
+            if self._async_unsub_executed_event is None:
+                self._async_unsub_executed_event = self._hass.bus.async_listen(
+                    EVENT_SERVICE_EXECUTED, self._async_service_executed)
 
         self._hass.bus.async_fire(EVENT_CALL_SERVICE, event_data)
 
         if blocking:
-            done, _ = yield from asyncio.wait(
-                [fut], loop=self._hass.loop, timeout=SERVICE_CALL_LIMIT)
-            success = bool(done)
-            unsub()
-            return success
+            try:
+                done, _ = yield from asyncio.wait(
+                    [fut], loop=self._hass.loop, timeout=SERVICE_CALL_LIMIT)
+            finally:
+                self._pending_calls.pop(call_id, None)
+            return bool(done)
+
+    @callback
+    def _async_fire_handled_call(self, event_data):
+        """Fire the call_service event of a call executed directly.
+
+        The event is only fired if more than our own listener would get it.
+
+        This method must be run in the event loop.
+        """
+        if self._hass.bus.async_listener_count(EVENT_CALL_SERVICE) > 1:
+            event_data = dict(event_data)
+            event_data[ATTR_SERVICE_HANDLED] = True
+            self._hass.bus.async_fire(EVENT_CALL_SERVICE, event_data)
+
+    @asyncio.coroutine
+    def _async_call_direct(self, event_data, blocking):
+        """Execute a service call without going through the EventBus.
+
+        Returns True if the service executed succesfully within
+        SERVICE_CALL_LIMIT, which is only waited for when blocking.
+
+        This method is a coroutine.
+        """
+        domain = event_data[ATTR_DOMAIN]
+        service = event_data[ATTR_SERVICE]
+        call_id = event_data[ATTR_SERVICE_CALL_ID]
+        service_handler = self._services[domain][service]
+        service_data = event_data[ATTR_SERVICE_DATA] or {}
+        executed_data = {ATTR_SERVICE_CALL_ID: call_id}
+
+        try:
+            if service_handler.schema:
+                service_data = service_handler.schema(service_data)
+        except vol.Invalid as ex:
+            _LOGGER.error("Invalid service data for %s.%s: %s",
+                          domain, service, humanize_error(service_data, ex))
+            self._async_fire_handled_call(event_data)
+            self._hass.bus.async_fire(EVENT_SERVICE_EXECUTED, executed_data)
+            return True
+
+        service_call = ServiceCall(domain, service, service_data, call_id)
+
+        if service_handler.is_callback:
+            try:
+                service_handler.func(service_call)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error executing service %s", service_call)
+                return False
+            finally:
+                self._async_fire_handled_call(event_data)
+
+            self._hass.bus.async_fire(EVENT_SERVICE_EXECUTED, executed_data)
+            return True
+
+        if service_handler.is_coroutinefunction:
+            @asyncio.coroutine
+            def execute_service():
+                """Execute a service and fire a SERVICE_EXECUTED event."""
+                try:
+                    yield from service_handler.func(service_call)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error executing service %s", service_call)
+                    return False
+                finally:
+                    self._async_fire_handled_call(event_data)
+
+                self._hass.bus.async_fire(
+                    EVENT_SERVICE_EXECUTED, executed_data)
+                return True
+
+            job = self._hass.async_add_job(execute_service())
+        else:
+            def execute_service():
+                """Execute a service and fire a SERVICE_EXECUTED event."""
+                try:
+                    service_handler.func(service_call)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error executing service %s", service_call)
+                    return False
+                finally:
+                    self._hass.loop.call_soon_threadsafe(
+                        self._async_fire_handled_call, event_data)
+
+                self._hass.bus.fire(EVENT_SERVICE_EXECUTED, executed_data)
+                return True
+
+            job = self._hass.async_add_job(execute_service)
+
+        if not blocking:
+            return None
+
+        done, _ = yield from asyncio.wait(
+            [job], loop=self._hass.loop, timeout=SERVICE_CALL_LIMIT)
+
+        return bool(done) and job.result()
+
+    @callback
+    def _async_service_executed(self, event):
+        """Resolve the blocking call of an executed service.
+
+        This method must be run in the event loop.
+        """
+        fut = self._pending_calls.pop(
+            event.data.get(ATTR_SERVICE_CALL_ID), None)
+
+        if fut is not None and not fut.done():
+            fut.set_result(True)
 
     @asyncio.coroutine
     def _event_to_service_call(self, event):
         """Handle the SERVICE_CALLED events from the EventBus."""
+        if event.data.get(ATTR_SERVICE_HANDLED):
+            return
+
         service_data = event.data.get(ATTR_SERVICE_DATA) or {}
         domain = event.data.get(ATTR_DOMAIN).lower()
         service = event.data.get(ATTR_SERVICE).lower()
@@ -50,6 +50,9 @@ def _threaded_factory(async_factory):
 def async_from_config(config: ConfigType, config_validation: bool=True):
     """Turn a condition configuration into a method.
 
+    The method is called with hass, the variables and optionally a dict
+    with the templates rendered so far during the current evaluation.
+
     Should be run on the event loop.
     """
     for fmt in (ASYNC_FROM_CONFIG_FORMAT, FROM_CONFIG_FORMAT):
@@ -70,6 +73,52 @@ def async_from_config(config: ConfigType, config_validation: bool=True):
 from_config = _threaded_factory(async_from_config)
 
 
+def async_from_configs(configs, config_validation: bool=True):
+    """Turn a list of condition configurations into one method.
+
+    The conditions are compiled once and all have to match. Templates shared
+    by the conditions are rendered once per evaluation.
+
+    Should be run on the event loop.
+    """
+    checks = [async_from_config(config, config_validation)
+              for config in configs]
+
+    def if_all_conditions(hass: HomeAssistant, variables=None,
+                          renders=None) -> bool:
+        """Test all conditions."""
+        if renders is None:
+            renders = {}
+
+        return all(check(hass, variables, renders) for check in checks)
+
+    return if_all_conditions
+
+
+def _async_render(value_template, variables, entity=None, renders=None):
+    """Render a condition template.
+
+    Renders holds the templates rendered so far by the conditions of one
+    evaluation, which all see the same variables.
+    """
+    key = (value_template.template,
+           None if entity is None else entity.entity_id)
+
+    if renders is not None and key in renders:
+        return renders[key]
+
+    if entity is not None:
+        variables = dict(variables or {})
+        variables['state'] = entity
+
+    value = value_template.async_render(variables)
+
+    if renders is not None:
+        renders[key] = value
+
+    return value
+
+
 def async_and_from_config(config: ConfigType, config_validation: bool=True):
     """Create multi condition matcher using 'AND'."""
     if config_validation:
@@ -77,7 +126,7 @@ def async_and_from_config(config: ConfigType, config_validation: bool=True):
     checks = None
 
     def if_and_condition(hass: HomeAssistant,
-                         variables=None) -> bool:
+                         variables=None, renders=None) -> bool:
         """Test and condition."""
         nonlocal checks
 
@@ -85,16 +134,15 @@ def async_and_from_config(config: ConfigType, config_validation: bool=True):
             checks = [async_from_config(entry, False) for entry
                       in config['conditions']]
 
+        if renders is None:
+            renders = {}
+
         try:
-            for check in checks:
-                if not check(hass, variables):
-                    return False
+            return all(check(hass, variables, renders) for check in checks)
         except Exception as ex:  # pylint: disable=broad-except
             _LOGGER.warning("Error during and-condition: %s", ex)
             return False
 
-        return True
-
     return if_and_condition
 
 
@@ -108,7 +156,7 @@ def async_or_from_config(config: ConfigType, config_validation: bool=True):
     checks = None
 
     def if_or_condition(hass: HomeAssistant,
-                        variables=None) -> bool:
+                        variables=None, renders=None) -> bool:
         """Test and condition."""
         nonlocal checks
 
@@ -116,14 +164,14 @@ def async_or_from_config(config: ConfigType, config_validation: bool=True):
             checks = [async_from_config(entry, False) for entry
                       in config['conditions']]
 
+        if renders is None:
+            renders = {}
+
         try:
-            for check in checks:
-                if check(hass, variables):
-                    return True
+            return any(check(hass, variables, renders) for check in checks)
         except Exception as ex:  # pylint: disable=broad-except
             _LOGGER.warning("Error during or-condition: %s", ex)
-
-        return False
+            return False
 
     return if_or_condition
 
@@ -141,7 +189,7 @@ def numeric_state(hass: HomeAssistant, entity, below=None, above=None,
 
 
 def async_numeric_state(hass: HomeAssistant, entity, below=None, above=None,
-                        value_template=None, variables=None):
+                        value_template=None, variables=None, renders=None):
     """Test a numeric state condition."""
     if isinstance(entity, str):
         entity = hass.states.get(entity)
@@ -152,10 +200,8 @@ def async_numeric_state(hass: HomeAssistant, entity, below=None, above=None,
     if value_template is None:
         value = entity.state
     else:
-        variables = dict(variables or {})
-        variables['state'] = entity
         try:
-            value = value_template.async_render(variables)
+            value = _async_render(value_template, variables, entity, renders)
         except TemplateError as ex:
             _LOGGER.error("Template error: %s", ex)
             return False
@@ -184,13 +230,13 @@ def async_numeric_state_from_config(config, config_validation=True):
     above = config.get(CONF_ABOVE)
     value_template = config.get(CONF_VALUE_TEMPLATE)
 
-    def if_numeric_state(hass, variables=None):
+    def if_numeric_state(hass, variables=None, renders=None):
         """Test numeric state condition."""
         if value_template is not None:
             value_template.hass = hass
 
         return async_numeric_state(
-            hass, entity_id, below, above, value_template, variables)
+            hass, entity_id, below, above, value_template, variables, renders)
 
     return if_numeric_state
 
@@ -225,7 +271,7 @@ def state_from_config(config, config_validation=True):
     req_state = config.get(CONF_STATE)
     for_period = config.get('for')
 
-    def if_state(hass, variables=None):
+    def if_state(hass, variables=None, renders=None):
         """Test if condition."""
         return state(hass, entity_id, req_state, for_period)
 
@@ -276,7 +322,7 @@ def sun_from_config(config, config_validation=True):
     before_offset = config.get('before_offset')
     after_offset = config.get('after_offset')
 
-    def time_if(hass, variables=None):
+    def time_if(hass, variables=None, renders=None):
         """Validate time based if-condition."""
         return sun(hass, before, after, before_offset, after_offset)
 
@@ -290,10 +336,10 @@ def template(hass, value_template, variables=None):
     ).result()
 
 
-def async_template(hass, value_template, variables=None):
+def async_template(hass, value_template, variables=None, renders=None):
     """Test if template condition matches."""
     try:
-        value = value_template.async_render(variables)
+        value = _async_render(value_template, variables, renders=renders)
     except TemplateError as ex:
         _LOGGER.error("Error during template condition: %s", ex)
         return False
@@ -307,11 +353,11 @@ def async_template_from_config(config, config_validation=True):
         config = cv.TEMPLATE_CONDITION_SCHEMA(config)
     value_template = config.get(CONF_VALUE_TEMPLATE)
 
-    def template_if(hass, variables=None):
+    def template_if(hass, variables=None, renders=None):
         """Validate template based if-condition."""
         value_template.hass = hass
 
-        return async_template(hass, value_template, variables)
+        return async_template(hass, value_template, variables, renders)
 
     return template_if
 
@@ -360,7 +406,7 @@ def time_from_config(config, config_validation=True):
     after = config.get(CONF_AFTER)
     weekday = config.get(CONF_WEEKDAY)
 
-    def time_if(hass, variables=None):
+    def time_if(hass, variables=None, renders=None):
         """Validate time based if-condition."""
         return time(before, after, weekday)
 
@@ -401,7 +447,7 @@ def zone_from_config(config, config_validation=True):
     entity_id = config.get(CONF_ENTITY_ID)
     zone_entity_id = config.get(CONF_ZONE)
 
-    def if_in_zone(hass, variables=None):
+    def if_in_zone(hass, variables=None, renders=None):
         """Test if condition."""
         return zone(hass, zone_entity_id, entity_id)
 
@@ -11,7 +11,7 @@ from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT, DEVICE_DEFAULT_NAME, STATE_OFF, STATE_ON,
     STATE_UNAVAILABLE, STATE_UNKNOWN, TEMP_CELSIUS, TEMP_FAHRENHEIT,
     ATTR_ENTITY_PICTURE, ATTR_SUPPORTED_FEATURES, ATTR_DEVICE_CLASS)
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.exceptions import NoEntitySpecifiedError
 from homeassistant.util import ensure_unique_string, slugify
@@ -74,6 +74,12 @@ class Entity(object):
     # protect for multible updates
     _update_warn = None
 
+    # Attributes that are cached when cache_static_attributes is True
+    _static_attributes = None
+
+    # State and dynamic attributes written last when caching static attributes
+    _last_written = None
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -148,6 +154,18 @@ class Entity(object):
         """Return True if unable to access real state of the entity."""
         return None
 
+    @property
+    def cache_static_attributes(self) -> bool:
+        """Return True if the static attributes of the entity are cached.
+
+        The name, icon, unit of measurement, device class, entity picture,
+        hidden, assumed state and supported features are then only looked
+        up again after async_invalidate_static_attributes is called. An
+        update that does not change the state or the other attributes is
+        skipped.
+        """
+        return False
+
     @property
     def force_update(self) -> bool:
         """Return True if state updates should be forced.
@@ -248,17 +266,32 @@ class Entity(object):
             if device_attr is not None:
                 attr.update(device_attr)
 
-        self._attr_setter('unit_of_measurement', str, ATTR_UNIT_OF_MEASUREMENT,
-                          attr)
+        customize = self.hass.data.get(DATA_CUSTOMIZE)
 
-        self._attr_setter('name', str, ATTR_FRIENDLY_NAME, attr)
-        self._attr_setter('icon', str, ATTR_ICON, attr)
-        self._attr_setter('entity_picture', str, ATTR_ENTITY_PICTURE, attr)
-        self._attr_setter('hidden', bool, ATTR_HIDDEN, attr)
-        self._attr_setter('assumed_state', bool, ATTR_ASSUMED_STATE, attr)
-        self._attr_setter('supported_features', int, ATTR_SUPPORTED_FEATURES,
-                          attr)
-        self._attr_setter('device_class', str, ATTR_DEVICE_CLASS, attr)
+        # Skip building the attributes if nothing changed since the state
+        # this entity wrote last, and that state is still the current one.
+        if self.cache_static_attributes and not self.force_update:
+            cached = self._static_attributes
+            last_written = self._last_written
+
+            if (cached is not None and cached[0] is customize and
+                    last_written is not None and
+                    last_written[0] == state and last_written[1] == attr and
+                    self.hass.states.get(self.entity_id) is
+                    last_written[2]):
+                return
+
+            # Keep the state and attributes of the entity apart from the
+            # conversions and attributes we add
+            entity_state = state
+            dynamic_attr = dict(attr)
+            attr = dict(attr)
+
+        static_attr, customize_attr = self._async_static_attributes(customize)
+
+        for key, value in static_attr.items():
+            if key not in attr:
+                attr[key] = value
 
         end = timer()
 
@@ -270,8 +303,7 @@ class Entity(object):
                             end - start)
 
         # Overwrite properties that have been set in the config file.
-        if DATA_CUSTOMIZE in self.hass.data:
-            attr.update(self.hass.data[DATA_CUSTOMIZE].get(self.entity_id))
+        attr.update(customize_attr)
 
         # Remove hidden property if false so it won't show up.
         if not attr.get(ATTR_HIDDEN, True):
@@ -294,6 +326,58 @@ class Entity(object):
         self.hass.states.async_set(
             self.entity_id, state, attr, self.force_update)
 
+        if self.cache_static_attributes and not self.force_update:
+            self._last_written = (
+                entity_state, dynamic_attr,
+                self.hass.states.get(self.entity_id))
+
+    @callback
+    def _async_static_attributes(self, customize):
+        """Return the static attributes and the customized attributes.
+
+        They are cached per customize config when the entity caches its
+        static attributes, so reloading the customize config refreshes them.
+
+        This method must be run in the event loop.
+        """
+        cached = self._static_attributes
+
+        if cached is not None and cached[0] is customize:
+            return cached[1], cached[2]
+
+        static_attr = {}
+        self._attr_setter('unit_of_measurement', str, ATTR_UNIT_OF_MEASUREMENT,
+                          static_attr)
+        self._attr_setter('name', str, ATTR_FRIENDLY_NAME, static_attr)
+        self._attr_setter('icon', str, ATTR_ICON, static_attr)
+        self._attr_setter('device_class', str, ATTR_DEVICE_CLASS, static_attr)
+        self._attr_setter('entity_picture', str, ATTR_ENTITY_PICTURE,
+                          static_attr)
+        self._attr_setter('hidden', bool, ATTR_HIDDEN, static_attr)
+        self._attr_setter('assumed_state', bool, ATTR_ASSUMED_STATE,
+                          static_attr)
+        self._attr_setter('supported_features', int, ATTR_SUPPORTED_FEATURES,
+                          static_attr)
+
+        if customize is None:
+            customize_attr = {}
+        else:
+            customize_attr = customize.get(self.entity_id)
+
+        if self.cache_static_attributes:
+            self._static_attributes = (customize, static_attr, customize_attr)
+
+        return static_attr, customize_attr
+
+    @callback
+    def async_invalidate_static_attributes(self):
+        """Look up the static attributes again on the next state update.
+
+        This method must be run in the event loop.
+        """
+        self._static_attributes = None
+        self._last_written = None
+
     def schedule_update_ha_state(self, force_refresh=False):
         """Schedule a update ha state change task.
 
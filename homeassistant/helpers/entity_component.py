@@ -1,6 +1,7 @@
 """Helpers for components that manage entities."""
 import asyncio
 from datetime import timedelta
+import hashlib
 
 from homeassistant import config as conf_util
 from homeassistant.setup import async_prepare_setup_platform
@@ -24,6 +25,26 @@ DEFAULT_SCAN_INTERVAL = timedelta(seconds=15)
 SLOW_SETUP_WARNING = 10
 SLOW_SETUP_MAX_WAIT = 60
 PLATFORM_NOT_READY_RETRIES = 10
+# Number of sync entities of a platform that are updated at the same time
+DEFAULT_PARALLEL_UPDATES = 1
+
+DATA_POLLING_SCHEDULE = 'entity_polling_schedule'
+
+
+@callback
+def async_polling_schedule(hass):
+    """Return the polling schedule of the entity platforms.
+
+    Returns a list of (platform, scan_interval, offset) tuples ordered by the
+    offset at which the platforms poll within their scan interval.
+
+    This method must be run in the event loop.
+    """
+    platforms = hass.data.get(DATA_POLLING_SCHEDULE, ())
+    return sorted(
+        ((platform.polling_key, platform.scan_interval, platform.poll_offset)
+         for platform in platforms),
+        key=lambda item: (item[2], item[0]))
 
 
 class EntityComponent(object):
@@ -132,12 +153,15 @@ class EntityComponent(object):
                          getattr(platform, 'SCAN_INTERVAL', None) or
                          self.scan_interval)
         entity_namespace = platform_config.get(CONF_ENTITY_NAMESPACE)
+        parallel_updates = getattr(
+            platform, 'PARALLEL_UPDATES', DEFAULT_PARALLEL_UPDATES)
 
         key = (platform_type, scan_interval, entity_namespace)
 
         if key not in self._platforms:
             self._platforms[key] = EntityPlatform(
-                self, platform_type, scan_interval, entity_namespace)
+                self, platform_type, scan_interval, entity_namespace,
+                parallel_updates)
         entity_platform = self._platforms[key]
 
         self.logger.info("Setting up %s.%s", self.domain, platform_type)
@@ -316,16 +340,26 @@ class EntityComponent(object):
 class EntityPlatform(object):
     """Keep track of entities for a single platform and stay in loop."""
 
-    def __init__(self, component, platform, scan_interval, entity_namespace):
+    def __init__(self, component, platform, scan_interval, entity_namespace,
+                 parallel_updates=DEFAULT_PARALLEL_UPDATES):
         """Initialize the entity platform."""
         self.component = component
         self.platform = platform
         self.scan_interval = scan_interval
         self.entity_namespace = entity_namespace
+        self.parallel_updates = parallel_updates
         self.platform_entities = []
         self._tasks = []
         self._async_unsub_polling = None
         self._process_updates = asyncio.Lock(loop=component.hass.loop)
+        self._update_semaphore = asyncio.Semaphore(
+            parallel_updates, loop=component.hass.loop)
+
+        # Polling metrics
+        self.update_cycles = 0
+        self.skipped_cycles = 0
+        self.last_cycle_duration = None
+        self.max_cycle_duration = None
 
     @asyncio.coroutine
     def async_block_entities_done(self):
@@ -393,9 +427,37 @@ class EntityPlatform(object):
                    in self.platform_entities):
             return
 
+        hass = self.component.hass
         self._async_unsub_polling = async_track_time_interval(
-            self.component.hass, self._update_entity_states, self.scan_interval
+            hass, self._update_entity_states, self.scan_interval,
+            offset=self.poll_offset
         )
+        hass.data.setdefault(DATA_POLLING_SCHEDULE, set()).add(self)
+
+    @property
+    def polling_key(self):
+        """Return the key that identifies the platform for polling."""
+        key = '{}.{}'.format(self.component.domain, self.platform)
+
+        if self.entity_namespace is not None:
+            key = '{}.{}'.format(key, self.entity_namespace)
+
+        return key
+
+    @property
+    def poll_offset(self):
+        """Return the offset of the polls within the scan interval.
+
+        The offset is derived from the polling key, so platforms sharing a
+        scan interval poll at different but stable moments.
+        """
+        interval = int(self.scan_interval.total_seconds() * 1000000)
+
+        if interval <= 0:
+            return timedelta(0)
+
+        digest = hashlib.md5(self.polling_key.encode('utf-8')).hexdigest()
+        return timedelta(microseconds=int(digest, 16) % interval)
 
     @asyncio.coroutine
     def async_reset(self):
@@ -413,17 +475,21 @@ class EntityPlatform(object):
         if self._async_unsub_polling is not None:
             self._async_unsub_polling()
             self._async_unsub_polling = None
+            self.component.hass.data[DATA_POLLING_SCHEDULE].discard(self)
 
     @asyncio.coroutine
     def _update_entity_states(self, now):
         """Update the states of all the polling entities.
 
         To protect from flooding the executor, we will update async entities
-        in parallel and other entities sequential.
+        in parallel and at most parallel_updates other entities at a time.
 
         This method must be run in the event loop.
         """
+        hass = self.component.hass
+
         if self._process_updates.locked():
+            self.skipped_cycles += 1
             self.component.logger.warning(
                 "Updating %s %s took longer than the scheduled update "
                 "interval %s", self.platform, self.component.domain,
@@ -431,27 +497,39 @@ class EntityPlatform(object):
             return
 
         with (yield from self._process_updates):
+            start = hass.loop.time()
             tasks = []
-            to_update = []
 
             for entity in self.platform_entities:
                 if not entity.should_poll:
                     continue
 
-                update_coro = entity.async_update_ha_state(True)
                 if hasattr(entity, 'async_update'):
-                    tasks.append(
-                        self.component.hass.async_add_job(update_coro))
+                    update_coro = entity.async_update_ha_state(True)
                 else:
-                    to_update.append(update_coro)
-
-            for update_coro in to_update:
-                try:
-                    yield from update_coro
-                except Exception:  # pylint: disable=broad-except
-                    self.component.logger.exception(
-                        "Error while update entity from %s in %s",
-                        self.platform, self.component.domain)
+                    update_coro = self._async_update_sync_entity(entity)
+                tasks.append(hass.async_add_job(update_coro))
 
             if tasks:
-                yield from asyncio.wait(tasks, loop=self.component.hass.loop)
+                yield from asyncio.wait(tasks, loop=hass.loop)
+
+            duration = hass.loop.time() - start
+            self.update_cycles += 1
+            self.last_cycle_duration = duration
+            if self.max_cycle_duration is None or \
+               duration > self.max_cycle_duration:
+                self.max_cycle_duration = duration
+
+    @asyncio.coroutine
+    def _async_update_sync_entity(self, entity):
+        """Update a sync entity once an update slot is free.
+
+        This method must be run in the event loop.
+        """
+        with (yield from self._update_semaphore):
+            try:
+                yield from entity.async_update_ha_state(True)
+            except Exception:  # pylint: disable=broad-except
+                self.component.logger.exception(
+                    "Error while update entity from %s in %s",
+                    self.platform, self.component.domain)
@@ -1,13 +1,36 @@
 """Helpers for listening to events."""
+from bisect import bisect_left
+import calendar
+from datetime import timedelta
 import functools as ft
+import heapq
+import itertools
+import logging
 
 from homeassistant.helpers.sun import get_astral_event_next
 from ..core import HomeAssistant, callback
 from ..const import (
-    ATTR_NOW, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED, MATCH_ALL)
+    ATTR_NOW, EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
+    EVENT_TIME_CHANGED, MATCH_ALL)
 from ..util import dt as dt_util
 from ..util.async import run_callback_threadsafe
 
+_LOGGER = logging.getLogger(__name__)
+
+# Maps entity id to the tuple of state change listeners tracking it
+DATA_STATE_CHANGE_TRACKERS = 'track_state_change_trackers'
+DATA_STATE_CHANGE_LISTENER = 'track_state_change_listener'
+DATA_POINT_IN_TIME_TRACKER = 'track_point_in_time_tracker'
+DATA_TIME_PATTERN_TRACKER = 'track_time_pattern_tracker'
+
+# Longest time in seconds to wait before comparing the points in time with
+# the wall clock again, so a jump of the system clock is noticed in time.
+MAX_TIMER_DELAY = 30
+
+# Years searched for the next time matching a time pattern before the
+# pattern is considered to never match again.
+MAX_PATTERN_YEARS = 400
+
 # PyLint does not like the use of threaded_listener_factory
 # pylint: disable=invalid-name
 
@@ -60,10 +83,6 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
     @callback
     def state_change_listener(event):
         """Handle specific state changes."""
-        if entity_ids != MATCH_ALL and \
-           event.data.get('entity_id') not in entity_ids:
-            return
-
         if event.data.get('old_state') is not None:
             old_state = event.data['old_state'].state
         else:
@@ -79,12 +98,71 @@ def async_track_state_change(hass, entity_ids, action, from_state=None,
                                event.data.get('old_state'),
                                event.data.get('new_state'))
 
-    return hass.bus.async_listen(EVENT_STATE_CHANGED, state_change_listener)
+    if entity_ids == MATCH_ALL:
+        return hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_listener)
+
+    return _async_track_state_change_entities(
+        hass, entity_ids, state_change_listener)
 
 
 track_state_change = threaded_listener_factory(async_track_state_change)
 
 
+@callback
+def _async_track_state_change_entities(hass, entity_ids, listener):
+    """Call listener with the state changed events of entity_ids.
+
+    A single listener on the bus dispatches state changed events by entity
+    id, so a state change only reaches the trackers of that entity.
+
+    Must be run within the event loop.
+    """
+    trackers = hass.data.get(DATA_STATE_CHANGE_TRACKERS)
+
+    if trackers is None:
+        trackers = hass.data[DATA_STATE_CHANGE_TRACKERS] = {}
+
+    entity_ids = set(entity_ids)
+
+    if entity_ids and DATA_STATE_CHANGE_LISTENER not in hass.data:
+        @callback
+        def state_change_dispatcher(event):
+            """Dispatch a state change to the trackers of the entity."""
+            for tracker in trackers.get(event.data.get('entity_id'), ()):
+                try:
+                    tracker(event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error handling state change of %s",
+                                      event.data.get('entity_id'))
+
+        hass.data[DATA_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, state_change_dispatcher)
+
+    # Tuples are replaced instead of mutated so a tracker can be removed
+    # while the trackers of its entity are being called.
+    for entity_id in entity_ids:
+        trackers[entity_id] = trackers.get(entity_id, ()) + (listener,)
+
+    @callback
+    def remove_listener():
+        """Remove the listener from the trackers of its entities."""
+        for entity_id in entity_ids:
+            entity_trackers = tuple(
+                tracker for tracker in trackers.get(entity_id, ())
+                if tracker is not listener)
+
+            if entity_trackers:
+                trackers[entity_id] = entity_trackers
+            else:
+                trackers.pop(entity_id, None)
+
+        if not trackers and DATA_STATE_CHANGE_LISTENER in hass.data:
+            hass.data.pop(DATA_STATE_CHANGE_LISTENER)()
+
+    return remove_listener
+
+
 @callback
 def async_track_template(hass, template, action, variables=None):
     """Add a listener that track state changes with template condition."""
@@ -133,45 +211,148 @@ track_point_in_time = threaded_listener_factory(async_track_point_in_time)
 @callback
 def async_track_point_in_utc_time(hass, action, point_in_time):
     """Add a listener that fires once after a specific point in UTC time."""
+    tracker = hass.data.get(DATA_POINT_IN_TIME_TRACKER)
+
+    if tracker is None:
+        tracker = hass.data[DATA_POINT_IN_TIME_TRACKER] = \
+            PointInTimeTracker(hass)
+
     # Ensure point_in_time is UTC
-    point_in_time = dt_util.as_utc(point_in_time)
+    return tracker.async_add(dt_util.as_utc(point_in_time), action)
+
+
+track_point_in_utc_time = threaded_listener_factory(
+    async_track_point_in_utc_time)
+
+
+class PointInTimeTracker(object):
+    """Run actions once a point in UTC time has passed.
+
+    The points in time are kept in a heap and a single timer on the event
+    loop is set for the earliest one. The timer never waits longer than
+    MAX_TIMER_DELAY, so points are rechecked against the wall clock when
+    the system clock jumps.
+    """
+
+    def __init__(self, hass):
+        """Initialize the point in time tracker."""
+        self.hass = hass
+        # Heap of [point in time, sequence, action], action is None once
+        # the entry has been removed.
+        self._heap = []
+        self._removed = 0
+        self._sequence = itertools.count()
+        self._timer = None
+        self._running = True
+        # Disabled in tests, where time is only moved by time changed events
+        self.use_timer = True
+
+        @callback
+        def stop_tracker(event):
+            """Stop the timer when Home Assistant stops."""
+            self._running = False
+            self._async_cancel_timer()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, stop_tracker)
 
     @callback
-    def point_in_time_listener(event):
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
+    def async_add(self, point_in_time, action):
+        """Run action with the time once point_in_time has passed.
 
-        if now < point_in_time or hasattr(point_in_time_listener, 'run'):
-            return
+        Returns a function that can be called to remove the action.
+        """
+        entry = [point_in_time, next(self._sequence), action]
+        heapq.heappush(self._heap, entry)
 
-        # Set variable so that we will never run twice.
-        # Because the event bus might have to wait till a thread comes
-        # available to execute this listener it might occur that the
-        # listener gets lined up twice to be executed. This will make
-        # sure the second time it does nothing.
-        point_in_time_listener.run = True
-        async_unsub()
+        if self._heap[0] is entry:
+            self._async_schedule()
 
-        hass.async_run_job(action, now)
+        @callback
+        def remove_listener():
+            """Remove the action if it did not run yet."""
+            if entry[2] is None:
+                return
 
-    async_unsub = hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                        point_in_time_listener)
+            entry[2] = None
+            self._removed += 1
 
-    return async_unsub
+            # Removed entries are skipped when they are due, but compact
+            # the heap if they start to outnumber the pending ones.
+            if self._removed > len(self._heap) // 2:
+                self._heap = [item for item in self._heap
+                              if item[2] is not None]
+                heapq.heapify(self._heap)
+                self._removed = 0
 
+        return remove_listener
 
-track_point_in_utc_time = threaded_listener_factory(
-    async_track_point_in_utc_time)
+    @callback
+    def async_run_due(self, now):
+        """Run the actions of all points in time up to now."""
+        due = []
+
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+
+            if entry[2] is None:
+                self._removed -= 1
+            else:
+                due.append(entry[2])
+                entry[2] = None
+
+        for action in due:
+            self.hass.async_run_job(action, now)
+
+        self._async_schedule()
+
+    @callback
+    def _async_schedule(self):
+        """Set the timer for the earliest point in time."""
+        self._async_cancel_timer()
+
+        if not self._heap or not self.use_timer or not self._running:
+            return
+
+        delay = (self._heap[0][0] - dt_util.utcnow()).total_seconds()
+        self._timer = self.hass.loop.call_later(
+            min(max(delay, 0), MAX_TIMER_DELAY), self._async_timer_fired)
+
+    @callback
+    def _async_cancel_timer(self):
+        """Cancel the timer if it is set."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    @callback
+    def _async_timer_fired(self):
+        """Run the due actions when the timer fires."""
+        self._timer = None
+        self.async_run_due(dt_util.utcnow())
 
 
 @callback
-def async_track_time_interval(hass, action, interval):
-    """Add a listener that fires repetitively at every timedelta interval."""
+def async_track_time_interval(hass, action, interval, offset=None):
+    """Add a listener that fires repetitively at every timedelta interval.
+
+    With an offset the listener fires at the times where the time since the
+    epoch minus the offset is a multiple of the interval, so listeners with
+    the same interval and a different offset don't fire at the same time.
+    """
     remove = None
 
     def next_interval():
         """Return the next interval."""
-        return dt_util.utcnow() + interval
+        now = dt_util.utcnow()
+
+        if offset is None:
+            return now + interval
+
+        seconds = interval.total_seconds()
+        timestamp = now.timestamp()
+        return dt_util.utc_from_timestamp(
+            timestamp + seconds -
+            (timestamp - offset.total_seconds()) % seconds)
 
     @callback
     def interval_listener(now):
@@ -250,6 +431,233 @@ def async_track_sunset(hass, action, offset=None):
 track_sunset = threaded_listener_factory(async_track_sunset)
 
 
+class TimePattern(object):
+    """Time pattern compiled to the values of each field that match it.
+
+    Fields match like _matcher matches them, but the matching values are
+    computed once so the next time matching the pattern can be calculated.
+    """
+
+    def __init__(self, year=None, month=None, day=None, hour=None,
+                 minute=None, second=None):
+        """Initialize the time pattern."""
+        self._year = _process_time_match(year)
+        self._fields = tuple(
+            _compile_time_field(_process_time_match(pattern), values)
+            for pattern, values in (
+                (month, range(1, 13)), (day, range(1, 32)),
+                (hour, range(24)), (minute, range(60)), (second, range(60))))
+
+    def matches(self, now):
+        """Return True if the time matches the pattern."""
+        if not _matcher(now.year, self._year):
+            return False
+
+        for value, values in zip(
+                (now.month, now.day, now.hour, now.minute, now.second),
+                self._fields):
+            if value not in values:
+                return False
+
+        return True
+
+    def next_after(self, now):
+        """Return the first time after the second of now matching the pattern.
+
+        Returns None if the pattern will not match again.
+        """
+        if not all(self._fields):
+            return None
+
+        start = now.replace(microsecond=0) + timedelta(seconds=1)
+        months, days, hours, minutes, seconds = self._fields
+
+        for year in range(start.year, start.year + MAX_PATTERN_YEARS):
+            if not _matcher(year, self._year):
+                continue
+            from_start = year == start.year
+
+            for month in _values_from(months, start.month, from_start):
+                from_start_month = from_start and month == start.month
+                days_in_month = calendar.monthrange(year, month)[1]
+
+                for day in _values_from(days, start.day, from_start_month):
+                    if day > days_in_month:
+                        break
+                    from_start_day = from_start_month and day == start.day
+
+                    for hour in _values_from(
+                            hours, start.hour, from_start_day):
+                        from_start_hour = from_start_day and \
+                            hour == start.hour
+
+                        for minute in _values_from(
+                                minutes, start.minute, from_start_hour):
+                            from_start_minute = from_start_hour and \
+                                minute == start.minute
+
+                            for second in _values_from(
+                                    seconds, start.second, from_start_minute):
+                                return start.replace(
+                                    year=year, month=month, day=day,
+                                    hour=hour, minute=minute, second=second)
+
+        return None
+
+
+class TimePatternTracker(object):
+    """Run actions at the times matching their time pattern.
+
+    The time changed events drive the tracker. A pattern is only checked
+    again once the next time matching it has been reached, instead of on
+    every time changed event.
+    """
+
+    def __init__(self, hass):
+        """Initialize the time pattern tracker."""
+        self.hass = hass
+        self._utc = _TimePatternSchedule()
+        self._local = _TimePatternSchedule()
+        self._sequence = itertools.count()
+        self._async_unsub_time_changed = None
+
+    @callback
+    def async_add(self, pattern, action, local=False):
+        """Run action with the time whenever the time matches pattern.
+
+        Returns a function that can be called to remove the action.
+        """
+        schedule = self._local if local else self._utc
+        entry = _TimePatternEntry(pattern, action, next(self._sequence))
+        schedule.add(entry)
+
+        if self._async_unsub_time_changed is None:
+            self._async_unsub_time_changed = self.hass.bus.async_listen(
+                EVENT_TIME_CHANGED, self._async_time_changed)
+
+        @callback
+        def remove_listener():
+            """Remove the action."""
+            if not entry.active:
+                return
+
+            schedule.remove(entry)
+
+            if not self._utc.entries and not self._local.entries:
+                self._async_unsub_time_changed()
+                self._async_unsub_time_changed = None
+
+        return remove_listener
+
+    @callback
+    def _async_time_changed(self, event):
+        """Run the actions of the patterns matching the time."""
+        now = event.data[ATTR_NOW]
+        due = []
+
+        if self._utc.entries:
+            due.extend((entry, now) for entry
+                       in self._utc.due(now.replace(tzinfo=None)))
+
+        if self._local.entries:
+            local_now = dt_util.as_local(now)
+            due.extend((entry, local_now) for entry
+                       in self._local.due(local_now.replace(tzinfo=None)))
+
+        # Run the actions in the order they were added
+        due.sort(key=lambda item: item[0].sequence)
+
+        for entry, entry_now in due:
+            self.hass.async_run_job(entry.action, entry_now)
+
+
+class _TimePatternEntry(object):
+    """An action of the time pattern tracker."""
+
+    __slots__ = ('pattern', 'action', 'sequence', 'active')
+
+    def __init__(self, pattern, action, sequence):
+        """Initialize the entry."""
+        self.pattern = pattern
+        self.action = action
+        self.sequence = sequence
+        self.active = True
+
+
+class _TimePatternSchedule(object):
+    """Entries of the time pattern tracker ordered by their next time.
+
+    Times are naive, so local time patterns are scheduled on the wall clock.
+    """
+
+    def __init__(self):
+        """Initialize the schedule."""
+        # Heap of [next time, sequence, entry], removed entries are dropped
+        # when they are due.
+        self._heap = []
+        self._removed = 0
+        # Entries that are scheduled on the next time changed event
+        self._pending = []
+        # Entries that only match again if the time moves back
+        self._idle = []
+        self._last = None
+        self.entries = 0
+
+    def add(self, entry):
+        """Add an entry that is checked on the next time changed event."""
+        self._pending.append(entry)
+        self.entries += 1
+
+    def remove(self, entry):
+        """Remove an entry."""
+        entry.active = False
+        self.entries -= 1
+        self._removed += 1
+
+        if self._removed > (len(self._heap) + len(self._pending)) // 2:
+            self._heap = [item for item in self._heap if item[2].active]
+            heapq.heapify(self._heap)
+            self._pending = [item for item in self._pending if item.active]
+            self._idle = [item for item in self._idle if item.active]
+            self._removed = 0
+
+    def due(self, now):
+        """Return the entries whose pattern matches now."""
+        now = now.replace(microsecond=0)
+
+        if self._last is not None and now <= self._last:
+            # The time did not move forward, check every pattern
+            entries = self._pending + self._idle + \
+                [item[2] for item in self._heap]
+            self._heap = []
+            self._idle = []
+        else:
+            entries = self._pending
+            while self._heap and self._heap[0][0] <= now:
+                entries.append(heapq.heappop(self._heap)[2])
+
+        self._pending = []
+        self._last = now
+        due = []
+
+        for entry in entries:
+            if not entry.active:
+                self._removed -= 1
+                continue
+
+            if entry.pattern.matches(now):
+                due.append(entry)
+
+            next_time = entry.pattern.next_after(now)
+
+            if next_time is not None:
+                heapq.heappush(self._heap, [next_time, entry.sequence, entry])
+            else:
+                self._idle.append(entry)
+
+        return due
+
+
 @callback
 def async_track_utc_time_change(hass, action, year=None, month=None, day=None,
                                 hour=None, minute=None, second=None,
@@ -265,31 +673,14 @@ def async_track_utc_time_change(hass, action, year=None, month=None, day=None,
 
         return hass.bus.async_listen(EVENT_TIME_CHANGED, time_change_listener)
 
-    pmp = _process_time_match
-    year, month, day = pmp(year), pmp(month), pmp(day)
-    hour, minute, second = pmp(hour), pmp(minute), pmp(second)
+    tracker = hass.data.get(DATA_TIME_PATTERN_TRACKER)
 
-    @callback
-    def pattern_time_change_listener(event):
-        """Listen for matching time_changed events."""
-        now = event.data[ATTR_NOW]
-
-        if local:
-            now = dt_util.as_local(now)
-        mat = _matcher
-
-        # pylint: disable=too-many-boolean-expressions
-        if mat(now.year, year) and \
-           mat(now.month, month) and \
-           mat(now.day, day) and \
-           mat(now.hour, hour) and \
-           mat(now.minute, minute) and \
-           mat(now.second, second):
-
-            hass.async_run_job(action, now)
+    if tracker is None:
+        tracker = hass.data[DATA_TIME_PATTERN_TRACKER] = \
+            TimePatternTracker(hass)
 
-    return hass.bus.async_listen(EVENT_TIME_CHANGED,
-                                 pattern_time_change_listener)
+    return tracker.async_add(
+        TimePattern(year, month, day, hour, minute, second), action, local)
 
 
 track_utc_time_change = threaded_listener_factory(async_track_utc_time_change)
@@ -338,3 +729,30 @@ def _matcher(subject, pattern):
             return False
 
     return MATCH_ALL == pattern or subject in pattern
+
+
+def _compile_time_field(pattern, values):
+    """Return the sorted values of a time field that match the pattern."""
+    if pattern == MATCH_ALL:
+        return tuple(values)
+
+    if isinstance(pattern, str) and pattern.startswith('/'):
+        try:
+            divisor = float(pattern.lstrip('/'))
+        except ValueError:
+            return ()
+
+        if divisor == 0:
+            return ()
+
+        return tuple(value for value in values if value % divisor == 0)
+
+    return tuple(value for value in values if value in pattern)
+
+
+def _values_from(values, lowest, bounded):
+    """Return the sorted values from lowest on if bounded, else all."""
+    if not bounded:
+        return values
+
+    return values[bisect_left(values, lowest):]
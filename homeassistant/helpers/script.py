@@ -141,7 +141,7 @@ class Script():
                 return
 
             elif CONF_CONDITION in action:
-                if not self._async_check_condition(action, variables):
+                if not self._async_check_condition(cur, action, variables):
                     break
 
             elif CONF_EVENT in action:
@@ -187,13 +187,12 @@ class Script():
         self.hass.bus.async_fire(action[CONF_EVENT],
                                  action.get(CONF_EVENT_DATA))
 
-    def _async_check_condition(self, action, variables):
+    def _async_check_condition(self, cur, action, variables):
         """Test if condition is matching."""
-        config_cache_key = frozenset((k, str(v)) for k, v in action.items())
-        config = self._config_cache.get(config_cache_key)
+        config = self._config_cache.get(cur)
         if not config:
             config = condition.async_from_config(action, False)
-            self._config_cache[config_cache_key] = config
+            self._config_cache[cur] = config
 
         self.last_action = action.get(CONF_ALIAS, action[CONF_CONDITION])
         check = config(self.hass, variables)
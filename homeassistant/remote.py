@@ -141,6 +141,51 @@ class JSONEncoder(json.JSONEncoder):
                 return json.JSONEncoder.default(self, o)
 
 
+def json_encode(obj, sort_keys=False):
+    """Encode obj as JSON, reusing the cached encoding of states.
+
+    States, and lists and dicts containing them, are joined from the JSON
+    that each state caches, instead of encoding the states again.
+    """
+    if isinstance(obj, ha.State):
+        return obj.as_json()
+
+    if not _contains_states(obj):
+        return json.dumps(obj, cls=JSONEncoder, sort_keys=sort_keys)
+
+    if isinstance(obj, dict):
+        items = sorted(obj.items()) if sort_keys else obj.items()
+        return '{{{}}}'.format(', '.join(
+            '{}: {}'.format(_json_key(key), json_encode(value, sort_keys))
+            for key, value in items))
+
+    return '[{}]'.format(', '.join(
+        json_encode(item, sort_keys) for item in obj))
+
+
+def _json_key(key):
+    """Encode a dict key the way json.dumps does."""
+    if isinstance(key, str):
+        return json.dumps(key)
+    elif key is None or isinstance(key, (int, float)):
+        # Matches the coercion of json.dumps: true, null, 1.5 etc.
+        return json.dumps(json.dumps(key))
+
+    raise TypeError('keys must be a string')
+
+
+def _contains_states(obj):
+    """Return True if obj is or contains states."""
+    if isinstance(obj, ha.State):
+        return True
+    elif isinstance(obj, (list, tuple)):
+        return any(_contains_states(item) for item in obj)
+    elif isinstance(obj, dict):
+        return any(_contains_states(value) for value in obj.values())
+
+    return False
+
+
 def validate_api(api):
     """Make a call to validate API."""
     try:
@@ -2,10 +2,14 @@
 import asyncio
 import argparse
 from contextlib import suppress
+from datetime import timedelta
 import logging
+import os
 from timeit import default_timer as timer
+from types import SimpleNamespace
 
 from homeassistant import core
+import homeassistant.util.dt as dt_util
 
 BENCHMARKS = {}
 
@@ -72,3 +76,245 @@ def async_million_events(hass):
     yield from event.wait()
 
     return timer() - start
+
+
+@benchmark
+@asyncio.coroutine
+def async_million_events_many_listeners(hass):
+    """Run a million events with listeners on many event types."""
+    count = 0
+    event_name = 'benchmark_event'
+    event = asyncio.Event(loop=hass.loop)
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == 10**6:
+            event.set()
+
+    @core.callback
+    def other_listener(_):
+        """Handle an event that is not fired."""
+        pass
+
+    for idx in range(100):
+        hass.bus.async_listen('other_event_{}'.format(idx), other_listener)
+
+    hass.bus.async_listen(event_name, listener)
+
+    start = timer()
+
+    for _ in range(10**6):
+        hass.bus.async_fire(event_name)
+        hass.bus.async_fire('benchmark_unheard_event')
+
+    yield from event.wait()
+
+    runtime = timer() - start
+    print('{:.0f} events/sec'.format(2 * 10**6 / runtime))
+
+    return runtime
+
+
+@benchmark
+@asyncio.coroutine
+def async_thousand_blocking_service_calls(hass):
+    """Run 10 rounds of 1000 concurrent blocking service calls."""
+    @core.callback
+    def service(call):
+        """Handle service call."""
+        pass
+
+    # Register the service with another registry, like the one of a remote
+    # instance, so the calls go over the event bus instead of directly.
+    services = core.ServiceRegistry(hass)
+    services.async_register('benchmark', 'service', service)
+
+    start = timer()
+
+    for _ in range(10):
+        yield from asyncio.wait([
+            hass.services.async_call('benchmark', 'service', blocking=True)
+            for _ in range(1000)], loop=hass.loop)
+
+    return timer() - start
+
+
+@benchmark
+@asyncio.coroutine
+def async_thousand_automations(hass):
+    """Replay state changes against a thousand automations."""
+    from homeassistant import loader
+    from homeassistant.setup import async_setup_component
+
+    entities = 100
+    automations = 1000
+    changes = 10**4
+    value_template = '{{ state.state | float * 2 }}'
+    count = 0
+    event = asyncio.Event(loop=hass.loop)
+
+    # Each automation is triggered by one entity and passes if the doubled
+    # state is between 20 and 180, so the values 11 to 89 fire an event.
+    expected = sum(automations // entities for idx in range(changes)
+                   if 11 <= idx % 97 <= 89)
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+        if count == expected:
+            event.set()
+
+    hass.bus.async_listen('benchmark_automation', listener)
+
+    hass.state = core.CoreState.running
+    hass.config.config_dir = os.path.dirname(__file__)
+    yield from hass.async_add_job(loader.prepare, hass)
+    yield from async_setup_component(hass, 'automation', {
+        'automation': [{
+            'trigger': {
+                'platform': 'state',
+                'entity_id': 'sensor.benchmark_{}'.format(idx % entities),
+            },
+            'condition': [{
+                'condition': 'numeric_state',
+                'entity_id': 'sensor.benchmark_{}'.format(idx % entities),
+                'value_template': value_template,
+                'above': 20,
+            }, {
+                'condition': 'numeric_state',
+                'entity_id': 'sensor.benchmark_{}'.format(idx % entities),
+                'value_template': value_template,
+                'below': 180,
+            }],
+            'action': {'event': 'benchmark_automation'},
+        } for idx in range(automations)]
+    })
+
+    start = timer()
+
+    for idx in range(changes):
+        hass.states.async_set(
+            'sensor.benchmark_{}'.format(idx % entities), idx % 97)
+        # Let the triggered automations run between state changes
+        yield from asyncio.sleep(0, loop=hass.loop)
+
+    yield from event.wait()
+
+    return timer() - start
+
+
+@benchmark
+@asyncio.coroutine
+def async_mqtt_messages_many_subscribers(hass):
+    """Dispatch MQTT messages with a thousand subscribed topics."""
+    from homeassistant.components import mqtt
+    from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+    subscribers = 1000
+    messages = 10**5
+    count = 0
+    event = asyncio.Event(loop=hass.loop)
+
+    @asyncio.coroutine
+    def async_subscribe(topic, qos):
+        """Skip subscribing with the broker."""
+        pass
+
+    hass.data[mqtt.DATA_MQTT] = SimpleNamespace(
+        async_subscribe=async_subscribe)
+
+    @core.callback
+    def message_received(topic, payload, qos):
+        """Handle message."""
+        nonlocal count
+        count += 1
+
+        if count == messages:
+            event.set()
+
+    for idx in range(subscribers):
+        yield from mqtt.async_subscribe(
+            hass, 'benchmark/device_{}/state'.format(idx), message_received)
+    yield from mqtt.async_subscribe(
+        hass, 'benchmark/+/availability', message_received)
+
+    start = timer()
+
+    for idx in range(messages):
+        async_dispatcher_send(
+            hass, mqtt.SIGNAL_MQTT_MESSAGE_RECEIVED,
+            'benchmark/device_{}/state'.format(idx % subscribers), b'on', 0)
+
+    yield from event.wait()
+
+    runtime = timer() - start
+    print('{:.0f} messages/sec with {} subscribers'.format(
+        messages / runtime, subscribers))
+
+    return runtime
+
+
+@benchmark
+@asyncio.coroutine
+def async_get_states_million_rows(hass):
+    """Look up the states at a point in time in two million states."""
+    from homeassistant.components import history
+    from homeassistant.components.recorder.const import DATA_INSTANCE
+
+    recorder, run = yield from hass.async_add_job(_create_states_db)
+    hass.data[DATA_INSTANCE] = recorder
+    point_in_time = run.end - timedelta(hours=1)
+
+    start = timer()
+
+    states = yield from hass.async_add_job(
+        history.get_states, hass, point_in_time, None, run)
+    assert len(states) == 1000
+
+    return timer() - start
+
+
+def _create_states_db(entities=1000, rows=2 * 10**6):
+    """Create an in memory recorder database with synthetic states."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import scoped_session, sessionmaker
+    from sqlalchemy.pool import StaticPool
+    from homeassistant.components.recorder import migration, models
+
+    engine = create_engine(
+        'sqlite://', connect_args={'check_same_thread': False},
+        poolclass=StaticPool)
+    models.Base.metadata.create_all(engine)
+
+    end = dt_util.utcnow()
+    start = end - timedelta(seconds=rows)
+    run = models.RecorderRuns(start=start, end=end, created=start)
+
+    batch = []
+    for idx in range(rows):
+        created = start + timedelta(seconds=idx)
+        batch.append({
+            'entity_id': 'sensor.benchmark_{}'.format(idx % entities),
+            'domain': 'sensor',
+            'state': str(idx),
+            'attributes': '{}',
+            'last_changed': created,
+            'last_updated': created,
+            'created': created,
+        })
+        if len(batch) == 10**5 or idx == rows - 1:
+            engine.execute(models.States.__table__.insert(), batch)
+            batch = []
+
+    migration._fill_latest_states(engine)  # pylint: disable=protected-access
+
+    return SimpleNamespace(
+        engine=engine,
+        get_session=scoped_session(sessionmaker(bind=engine))), run
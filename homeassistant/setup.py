@@ -6,7 +6,7 @@ import os
 from timeit import default_timer as timer
 
 from types import ModuleType
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 
 import homeassistant.config as conf_util
 from homeassistant.config import async_notify_setup_error
@@ -23,6 +23,7 @@ ATTR_COMPONENT = 'component'
 
 DATA_SETUP = 'setup_tasks'
 DATA_PIP_LOCK = 'pip_lock'
+DATA_SETUP_TIMELINE = 'setup_timeline'
 
 SLOW_SETUP_WARNING = 10
 
@@ -62,9 +63,9 @@ def async_setup_component(hass: core.HomeAssistant, domain: str,
 
 
 @asyncio.coroutine
-def _async_process_requirements(hass: core.HomeAssistant, name: str,
-                                requirements) -> bool:
-    """Install the requirements for a component.
+def async_install_requirements(hass: core.HomeAssistant,
+                               requirements, log_failure: bool=True) -> bool:
+    """Install the missing requirements with a single pip run.
 
     This method is a coroutine.
     """
@@ -75,21 +76,31 @@ def _async_process_requirements(hass: core.HomeAssistant, name: str,
     if pip_lock is None:
         pip_lock = hass.data[DATA_PIP_LOCK] = asyncio.Lock(loop=hass.loop)
 
-    def pip_install(mod):
+    def pip_install():
         """Install packages."""
-        return pkg_util.install_package(
-            mod, target=hass.config.path('deps'),
+        return pkg_util.install_packages(
+            requirements, target=hass.config.path('deps'),
             constraints=os.path.join(
-                os.path.dirname(__file__), CONSTRAINT_FILE))
+                os.path.dirname(__file__), CONSTRAINT_FILE),
+            log_failure=log_failure)
 
     with (yield from pip_lock):
-        for req in requirements:
-            ret = yield from hass.async_add_job(pip_install, req)
-            if not ret:
-                _LOGGER.error("Not initializing %s because could not install "
-                              "dependency %s", name, req)
-                async_notify_setup_error(hass, name)
-                return False
+        return (yield from hass.async_add_job(pip_install))
+
+
+@asyncio.coroutine
+def _async_process_requirements(hass: core.HomeAssistant, name: str,
+                                requirements) -> bool:
+    """Install the requirements for a component.
+
+    This method is a coroutine.
+    """
+    ret = yield from async_install_requirements(hass, requirements)
+    if not ret:
+        _LOGGER.error("Not initializing %s because could not install "
+                      "dependency %s", name, ', '.join(requirements))
+        async_notify_setup_error(hass, name)
+        return False
 
     return True
 
@@ -195,6 +206,7 @@ def _async_setup_component(hass: core.HomeAssistant,
     finally:
         end = timer()
         warn_task.cancel()
+        hass.data.setdefault(DATA_SETUP_TIMELINE, {})[domain] = (start, end)
     _LOGGER.info("Setup of domain %s took %.1f seconds.", domain, end - start)
 
     if result is False:
@@ -219,6 +231,39 @@ def _async_setup_component(hass: core.HomeAssistant,
     return True
 
 
+def async_setup_critical_path(hass: core.HomeAssistant) \
+                              -> List[Tuple[str, float]]:
+    """Return the chain of component setups that took the longest.
+
+    Starts at the component that finished its setup last and follows the
+    dependency that finished last, returning the domains with the duration
+    of their setup in the order they were set up.
+
+    This method must be run in the event loop.
+    """
+    timeline = hass.data.get(DATA_SETUP_TIMELINE)
+
+    if not timeline:
+        return []
+
+    path = []
+    domain = max(timeline, key=lambda dom: timeline[dom][1])
+
+    while domain is not None:
+        start, end = timeline[domain]
+        path.append((domain, end - start))
+
+        dependencies = [
+            dep for dep in getattr(
+                loader.get_component(domain), 'DEPENDENCIES', [])
+            if dep in timeline]
+        domain = max(dependencies, key=lambda dom: timeline[dom][1],
+                     default=None)
+
+    path.reverse()
+    return path
+
+
 @asyncio.coroutine
 def async_prepare_setup_platform(hass: core.HomeAssistant, config, domain: str,
                                  platform_name: str) \
@@ -6,7 +6,7 @@ import threading
 from subprocess import Popen, PIPE
 from urllib.parse import urlparse
 
-from typing import Optional
+from typing import List, Optional
 
 import pkg_resources
 
@@ -20,15 +20,31 @@ def install_package(package: str, upgrade: bool=True,
                     constraints: Optional[str]=None) -> bool:
     """Install a package on PyPi. Accepts pip compatible package strings.
 
+    Return boolean if install successful.
+    """
+    return install_packages([package], upgrade, target, constraints)
+
+
+def install_packages(packages: List[str], upgrade: bool=True,
+                     target: Optional[str]=None,
+                     constraints: Optional[str]=None,
+                     log_failure: bool=True) -> bool:
+    """Install packages on PyPi with a single pip run.
+
+    Packages that are already installed are skipped. A failed install is
+    only logged at debug level if log_failure is False.
     Return boolean if install successful.
     """
     # Not using 'import pip; pip.main([])' because it breaks the logger
     with INSTALL_LOCK:
-        if check_package_exists(package, target):
+        missing = [package for package in packages
+                   if not check_package_exists(package, target)]
+
+        if not missing:
             return True
 
-        _LOGGER.info("Attempting install of %s", package)
-        args = [sys.executable, '-m', 'pip', 'install', '--quiet', package]
+        _LOGGER.info("Attempting install of %s", ', '.join(missing))
+        args = [sys.executable, '-m', 'pip', 'install', '--quiet'] + missing
         if upgrade:
             args.append('--upgrade')
         if target:
@@ -40,8 +56,9 @@ def install_package(package: str, upgrade: bool=True,
         process = Popen(args, stdin=PIPE, stdout=PIPE, stderr=PIPE)
         _, stderr = process.communicate()
         if process.returncode != 0:
-            _LOGGER.error("Unable to install package %s: %s",
-                          package, stderr.decode('utf-8').lstrip().strip())
+            log = _LOGGER.error if log_failure else _LOGGER.debug
+            log("Unable to install package %s: %s", ', '.join(missing),
+                stderr.decode('utf-8').lstrip().strip())
             return False
 
         return True
@@ -16,6 +16,8 @@ from homeassistant.setup import setup_component, async_setup_component
 from homeassistant.config import async_process_component_config
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import ToggleEntity
+from homeassistant.helpers.event import (
+    DATA_POINT_IN_TIME_TRACKER, PointInTimeTracker)
 from homeassistant.helpers.restore_state import DATA_RESTORE_CACHE
 from homeassistant.util.unit_system import METRIC_SYSTEM
 import homeassistant.util.dt as date_util
@@ -135,6 +137,11 @@ def async_test_home_assistant(loop):
     hass.config.units = METRIC_SYSTEM
     hass.config.skip_pip = True
 
+    # We only mock time during tests, points in time are only reached
+    # by firing time changed events.
+    tracker = hass.data[DATA_POINT_IN_TIME_TRACKER] = PointInTimeTracker(hass)
+    tracker.use_timer = False
+
     if 'custom_components.test' not in loader.AVAILABLE_COMPONENTS:
         yield from loop.run_in_executor(None, loader.prepare, hass)
 
@@ -211,6 +218,11 @@ def async_fire_time_changed(hass, time):
     """Fire a time changes event."""
     hass.bus.async_fire(EVENT_TIME_CHANGED, {'now': time})
 
+    tracker = hass.data.get(DATA_POINT_IN_TIME_TRACKER)
+
+    if tracker is not None:
+        tracker.async_run_due(time)
+
 
 fire_time_changed = threadsafe_callback_factory(async_fire_time_changed)
 
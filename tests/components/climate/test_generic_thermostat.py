@@ -5,7 +5,6 @@ import pytz
 import unittest
 from unittest import mock
 
-import homeassistant.core as ha
 from homeassistant.core import callback
 from homeassistant.setup import setup_component, async_setup_component
 from homeassistant.const import (
@@ -19,7 +18,8 @@ from homeassistant.const import (
 from homeassistant.util.unit_system import METRIC_SYSTEM
 from homeassistant.components import climate
 
-from tests.common import assert_setup_component, get_test_home_assistant
+from tests.common import (
+    assert_setup_component, get_test_home_assistant, fire_time_changed)
 
 
 ENTITY = 'climate.test'
@@ -649,7 +649,7 @@ class TestClimateGenericThermostatACKeepAlive(unittest.TestCase):
 
     def _send_time_changed(self, now):
         """Send a time changed event."""
-        self.hass.bus.fire(ha.EVENT_TIME_CHANGED, {ha.ATTR_NOW: now})
+        fire_time_changed(self.hass, now)
 
     def _setup_sensor(self, temp, unit=TEMP_CELSIUS):
         """Setup the test sensor."""
@@ -739,7 +739,7 @@ class TestClimateGenericThermostatKeepAlive(unittest.TestCase):
 
     def _send_time_changed(self, now):
         """Send a time changed event."""
-        self.hass.bus.fire(ha.EVENT_TIME_CHANGED, {ha.ATTR_NOW: now})
+        fire_time_changed(self.hass, now)
 
     def _setup_sensor(self, temp, unit=TEMP_CELSIUS):
         """Setup the test sensor."""
@@ -13,7 +13,9 @@ from homeassistant.setup import setup_component, async_setup_component
 import homeassistant.components.mqtt as mqtt
 from homeassistant.const import (
     EVENT_CALL_SERVICE, ATTR_DOMAIN, ATTR_SERVICE, EVENT_HOMEASSISTANT_STOP)
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.util.async import run_callback_threadsafe
 
 from tests.common import (
     get_test_home_assistant, mock_mqtt_component, fire_mqtt_message, mock_coro)
@@ -149,6 +151,36 @@ class TestMQTT(unittest.TestCase):
         self.hass.block_till_done()
         self.assertEqual(1, len(self.calls))
 
+    def test_subscribe_topic_retained_message(self):
+        """Test messages received while subscribing with the broker."""
+        @asyncio.coroutine
+        def async_subscribe(topic, qos):
+            """Receive a retained message while subscribing."""
+            mqtt.async_dispatcher_send(
+                self.hass, mqtt.SIGNAL_MQTT_MESSAGE_RECEIVED, topic,
+                b'retained-payload', qos)
+
+        self.hass.data['mqtt'].async_subscribe = async_subscribe
+
+        mqtt.subscribe(self.hass, 'test-topic', self.record_calls)
+
+        self.hass.block_till_done()
+        self.assertEqual(1, len(self.calls))
+        self.assertEqual('retained-payload', self.calls[0][1])
+
+    def test_subscribe_topic_broker_error(self):
+        """Test the subscriber is removed if the broker subscribe fails."""
+        self.hass.data['mqtt'].async_subscribe.side_effect = \
+            HomeAssistantError
+
+        with self.assertRaises(HomeAssistantError):
+            mqtt.subscribe(self.hass, 'test-topic', self.record_calls)
+
+        fire_mqtt_message(self.hass, 'test-topic', 'test-payload')
+
+        self.hass.block_till_done()
+        self.assertEqual(0, len(self.calls))
+
     def test_subscribe_topic_not_match(self):
         """Test if subscribed topic is not a match."""
         mqtt.subscribe(self.hass, 'test-topic', self.record_calls)
@@ -372,6 +404,34 @@ class TestMQTTCallbacks(unittest.TestCase):
         self.assertEqual(message.topic, last_event['topic'])
         self.assertEqual(message.qos, last_event['qos'])
 
+    def test_receiving_mqtt_messages_in_batches(self):
+        """Test messages received together are dispatched in one batch."""
+        calls = []
+
+        @callback
+        def record(topic, payload, qos):
+            """Helper to record calls."""
+            calls.append(topic)
+
+        async_dispatcher_connect(
+            self.hass, mqtt.SIGNAL_MQTT_MESSAGE_RECEIVED, record)
+
+        MQTTMessage = namedtuple('MQTTMessage', ['topic', 'qos', 'payload'])
+        client = self.hass.data['mqtt']
+
+        def receive_messages():
+            """Receive messages before the loop can drain them."""
+            for idx in range(3):
+                client._mqtt_on_message(
+                    None, None, MQTTMessage('topic/{}'.format(idx), 0, b''))
+
+        run_callback_threadsafe(self.hass.loop, receive_messages).result()
+        self.hass.block_till_done()
+
+        self.assertEqual(['topic/0', 'topic/1', 'topic/2'], calls)
+        self.assertEqual(3, client.buffered_messages)
+        self.assertEqual(1, client.drain_cycles)
+
     def test_mqtt_failed_connection_results_in_disconnect(self):
         """Test if connection failure leads to disconnect."""
         for result_code in range(1, 6):
@@ -578,3 +638,28 @@ def test_mqtt_subscribes_topics_on_connect(hass):
                 if qos is not None]
 
     assert [call[1][1:] for call in hass.add_job.mock_calls] == expected
+
+
+def test_topic_matcher():
+    """Test the topic matcher handles the wildcards."""
+    matcher = mqtt.TopicMatcher()
+    matcher.add('home/+/temperature', 'level')
+    matcher.add('home/#', 'subtree')
+    matcher.add('home/kitchen/temperature', 'exact')
+    matcher.add('#', 'all')
+
+    assert matcher.match('home/kitchen/temperature') == \
+        ['level', 'subtree', 'exact', 'all']
+    assert matcher.match('home') == ['subtree', 'all']
+    assert matcher.match('homes/kitchen') == ['all']
+    assert matcher.match('home/kitchen') == ['subtree', 'all']
+
+    matcher.remove('home/#', 'subtree')
+    matcher.remove('#', 'all')
+    assert matcher.match('home/kitchen') == []
+
+    matcher.remove('home/+/temperature', 'level')
+    matcher.remove('home/kitchen/temperature', 'exact')
+    assert matcher.match('home/kitchen/temperature') == []
+    # pylint: disable=protected-access
+    assert matcher._root.children == {}
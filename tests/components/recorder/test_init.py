@@ -1,16 +1,20 @@
 """The tests for the Recorder component."""
 # pylint: disable=protected-access
+import threading
 import unittest
 from unittest.mock import patch
 
 import pytest
 
 from homeassistant.core import callback
-from homeassistant.const import MATCH_ALL
-from homeassistant.components.recorder import Recorder
+from homeassistant.const import (
+    EVENT_CALL_SERVICE, EVENT_SERVICE_EXECUTED, EVENT_TIME_CHANGED, MATCH_ALL)
+from homeassistant.components.recorder import (
+    Recorder, FILTER_EVENT_TYPES, FILTER_EXCLUDE_DOMAINS)
 from homeassistant.components.recorder.const import DATA_INSTANCE
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.components.recorder.models import States, Events
+from homeassistant.components.recorder.models import (
+    States, Events, StateAttributes, LatestStates)
 
 from tests.common import get_test_home_assistant, init_recorder_component
 
@@ -151,6 +155,38 @@ def test_saving_event_exclude_event_type(hass_recorder):
     assert events[0].event_type == 'test2'
 
 
+def _call_service(hass):
+    """Call a service and return the types of the recorded events."""
+    hass.services.register('test', 'service', lambda call: None)
+    hass.services.call('test', 'service', blocking=True)
+    hass.bus.fire('test2')
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        return [event.event_type for event in session.query(Events)]
+
+
+def test_saving_event_service_calls(hass_recorder):
+    """Test recording service calls."""
+    hass = hass_recorder()
+    event_types = _call_service(hass)
+
+    assert 'test2' in event_types
+    assert EVENT_CALL_SERVICE in event_types
+    assert EVENT_SERVICE_EXECUTED in event_types
+
+
+def test_saving_event_no_service_calls(hass_recorder):
+    """Test not recording service calls."""
+    hass = hass_recorder({'record_service_calls': False})
+    event_types = _call_service(hass)
+
+    assert 'test2' in event_types
+    assert EVENT_CALL_SERVICE not in event_types
+    assert EVENT_SERVICE_EXECUTED not in event_types
+
+
 def test_saving_state_exclude_domains(hass_recorder):
     """Test saving and restoring a state."""
     hass = hass_recorder({'exclude': {'domains': 'test'}})
@@ -201,3 +237,91 @@ def test_recorder_setup_failure():
         rec.join()
 
     hass.stop()
+
+
+def test_saving_state_batched(hass_recorder):
+    """Test that queued up events are written in bounded batches."""
+    hass = hass_recorder({'max_batch_size': 3})
+    instance = hass.data[DATA_INSTANCE]
+    save_events = instance._save_events
+    release = threading.Event()
+    batches = []
+
+    def mock_save_events(events):
+        """Block the first write so that events pile up in the queue."""
+        batches.append(len(events))
+        release.wait(5)
+        save_events(events)
+
+    with patch.object(instance, '_save_events', side_effect=mock_save_events):
+        hass.states.set('test.first', 'on')
+        for idx in range(7):
+            hass.states.set('test.recorder{}'.format(idx), 'on')
+        hass.block_till_done()
+        release.set()
+        instance.block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 8
+
+    assert max(batches) == 3
+    assert sum(batches) == 8
+
+
+def test_filtered_events_not_queued(hass_recorder):
+    """Test that filtered events are counted and never queued."""
+    hass = hass_recorder({
+        'exclude': {'domains': 'test', 'event_types': 'test_event'}})
+    instance = hass.data[DATA_INSTANCE]
+
+    with patch.object(instance.queue, 'put') as mock_put:
+        hass.bus.fire(EVENT_TIME_CHANGED)
+        hass.bus.fire('test_event')
+        hass.states.set('test.recorder', 'on')
+        hass.block_till_done()
+
+    assert not mock_put.called
+    assert instance.dropped_events[FILTER_EVENT_TYPES] == 2
+    assert instance.dropped_events[FILTER_EXCLUDE_DOMAINS] == 1
+
+
+def test_saving_state_shared_attributes(hass_recorder):
+    """Test that equal attributes are stored only once."""
+    hass = hass_recorder()
+    attributes = {'test_attr': 5, 'test_attr_10': 'nice'}
+
+    for state in ('on', 'off', 'on'):
+        hass.states.set('test.recorder', state, attributes)
+        hass.block_till_done()
+    hass.states.set('test.recorder', 'on', {'test_attr': 6})
+    hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(StateAttributes).count() == 2
+        db_states = list(session.query(States).order_by(States.state_id))
+        assert len(db_states) == 4
+        assert len({db_state.attributes_id for db_state in db_states}) == 2
+        assert all(db_state.attributes is None for db_state in db_states)
+        assert db_states[0].to_native().attributes == attributes
+        assert db_states[3].to_native() == hass.states.get('test.recorder')
+
+
+def test_saving_state_latest_states(hass_recorder):
+    """Test that the latest state per entity is maintained."""
+    hass = hass_recorder()
+
+    for entity_id, state in (('test.one', 'on'), ('test.two', 'on'),
+                             ('test.one', 'off')):
+        hass.states.set(entity_id, state)
+        hass.block_till_done()
+    hass.data[DATA_INSTANCE].block_till_done()
+
+    with session_scope(hass=hass) as session:
+        latest = {row.entity_id: row.state_id
+                  for row in session.query(LatestStates)}
+        assert len(latest) == 2
+        assert session.query(States).get(
+            latest['test.one']).state == 'off'
+        assert session.query(States).get(
+            latest['test.two']).state == 'on'
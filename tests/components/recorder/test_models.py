@@ -2,14 +2,14 @@
 import unittest
 from datetime import datetime
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 import homeassistant.core as ha
 from homeassistant.const import EVENT_STATE_CHANGED
 from homeassistant.util import dt
 from homeassistant.components.recorder.models import (
-    Base, Events, States, RecorderRuns)
+    Base, Events, States, StateAttributes, RecorderRuns)
 
 ENGINE = None
 SESSION = None
@@ -78,6 +78,72 @@ class TestStates(unittest.TestCase):
         assert db_state.last_changed == event.time_fired
         assert db_state.last_updated == event.time_fired
 
+    def test_to_native_shared_attributes_one_query(self):
+        """Test states load their distinct shared attributes in one query."""
+        session = SESSION()
+        attributes_ids = []
+
+        for idx in range(2):
+            shared_attrs = '{{"idx": {}}}'.format(idx)
+            db_attr = StateAttributes(
+                hash=StateAttributes.hash_shared_attrs(shared_attrs),
+                shared_attrs=shared_attrs)
+            session.add(db_attr)
+            session.flush()
+            attributes_ids.append(db_attr.attributes_id)
+
+        for idx in range(5):
+            session.add(States(
+                entity_id='sensor.shared_{}'.format(idx), domain='sensor',
+                state='on', attributes_id=attributes_ids[idx % 2]))
+
+        session.commit()
+        session.close()
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, *args):
+            """Count executed statements."""
+            statements.append(statement)
+
+        event.listen(ENGINE, 'before_cursor_execute', count_statement)
+        try:
+            session = SESSION()
+            states = [db_state.to_native() for db_state in session.query(
+                States).filter(States.entity_id.like('sensor.shared_%'))]
+            session.close()
+        finally:
+            event.remove(ENGINE, 'before_cursor_execute', count_statement)
+
+        assert [state.attributes['idx'] for state in states] == \
+            [0, 1, 0, 1, 0]
+        # The states query does not repeat the blob for every state
+        assert len(statements) == 2
+        assert 'shared_attrs' not in statements[0]
+        assert 'shared_attrs' in statements[1]
+
+
+class TestStateAttributes(unittest.TestCase):
+    """Test StateAttributes model."""
+
+    # pylint: disable=no-self-use
+    def test_to_native(self):
+        """Test that attributes are decoded once and shared."""
+        shared_attrs = '{"unit_of_measurement": "C"}'
+        db_attr = StateAttributes(
+            hash=StateAttributes.hash_shared_attrs(shared_attrs),
+            shared_attrs=shared_attrs)
+
+        assert db_attr.to_native() == {'unit_of_measurement': 'C'}
+        assert db_attr.to_native() is db_attr.to_native()
+
+    def test_hash_shared_attrs(self):
+        """Test that equal attributes have equal hashes."""
+        assert StateAttributes.hash_shared_attrs('{"a": 1}') == \
+            StateAttributes.hash_shared_attrs('{"a": 1}')
+        assert StateAttributes.hash_shared_attrs('{"a": 1}') != \
+            StateAttributes.hash_shared_attrs('{"a": 2}')
+
 
 class TestRecorderRuns(unittest.TestCase):
     """Test recorder run model."""
@@ -5,7 +5,7 @@ import unittest
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder.const import DATA_INSTANCE
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import PurgeTask, purge_old_data
 from homeassistant.components.recorder.models import States, Events
 from homeassistant.components.recorder.util import session_scope
 from tests.common import get_test_home_assistant, init_recorder_component
@@ -107,3 +107,56 @@ class TestRecorderPurge(unittest.TestCase):
 
             # now we should only have 3 events left
             self.assertEqual(events.count(), 3)
+
+    def test_purge_in_batches(self):
+        """Test deleting old data in small batches."""
+        self._add_test_states()
+        self._add_test_events()
+
+        purge = purge_old_data(self.hass.data[DATA_INSTANCE], 4, 2)
+
+        self.assertTrue(purge.done)
+        self.assertEqual(purge.states_deleted, 3)
+        self.assertEqual(purge.events_deleted, 2)
+
+        with session_scope(hass=self.hass) as session:
+            self.assertEqual(session.query(States).count(), 2)
+            self.assertEqual(session.query(Events).filter(
+                Events.event_type.like("EVENT_TEST%")).count(), 3)
+
+    def test_purge_frees_pages(self):
+        """Test the incremental vacuum frees all pages after a purge."""
+        five_days_ago = datetime.now() - timedelta(days=5)
+        instance = self.hass.data[DATA_INSTANCE]
+
+        self.hass.block_till_done()
+        instance.block_till_done()
+
+        with recorder.session_scope(hass=self.hass) as session:
+            for event_id in range(200):
+                session.add(Events(
+                    event_type='EVENT_TEST_PURGE',
+                    event_data=json.dumps({'data': 'x' * 1000}),
+                    origin='LOCAL',
+                    created=five_days_ago,
+                    time_fired=five_days_ago,
+                ))
+
+        self.assertEqual(
+            instance.engine.execute("PRAGMA auto_vacuum").scalar(), 2)
+
+        purge_old_data(instance, 4)
+
+        self.assertEqual(
+            instance.engine.execute("PRAGMA freelist_count").scalar(), 0)
+
+    def test_purge_batch_yields(self):
+        """Test that a purge task stops after each batch."""
+        self._add_test_states()
+
+        purge = PurgeTask(self.hass.data[DATA_INSTANCE], 4, 2)
+
+        self.assertFalse(purge.run_batch())
+        self.assertEqual(purge.states_deleted, 2)
+        self.assertTrue(purge.run_batch())
+        self.assertEqual(purge.states_deleted, 3)
@@ -11,7 +11,8 @@ from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.util.dt as dt_util
 
 from tests.common import mock_mqtt_component, fire_mqtt_message
-from tests.common import get_test_home_assistant, mock_component
+from tests.common import (
+    get_test_home_assistant, mock_component, fire_time_changed)
 
 
 class TestSensorMQTT(unittest.TestCase):
@@ -187,4 +188,4 @@ class TestSensorMQTT(unittest.TestCase):
 
     def _send_time_changed(self, now):
         """Send a time changed event."""
-        self.hass.bus.fire(ha.EVENT_TIME_CHANGED, {ha.ATTR_NOW: now})
+        fire_time_changed(self.hass, now)
@@ -10,6 +10,7 @@ from homeassistant.const import (
     STATE_ON, STATE_OFF, STATE_HOME, STATE_UNKNOWN, ATTR_ICON, ATTR_HIDDEN,
     ATTR_ASSUMED_STATE, STATE_NOT_HOME)
 import homeassistant.components.group as group
+from homeassistant.helpers.event import DATA_STATE_CHANGE_TRACKERS
 
 from tests.common import get_test_home_assistant, assert_setup_component
 
@@ -107,6 +108,40 @@ class TestComponentsGroup(unittest.TestCase):
         group_state = self.hass.states.get(test_group.entity_id)
         self.assertEqual(STATE_ON, group_state.state)
 
+    def test_group_counts_member_changes(self):
+        """Test the group state follows members without recounting."""
+        self.hass.states.set('light.Bowl', STATE_ON)
+        self.hass.states.set('light.Ceiling', STATE_ON)
+        self.hass.states.set('light.Kitchen', STATE_OFF)
+        test_group = group.Group.create_group(
+            self.hass, 'init_group',
+            ['light.Bowl', 'light.Ceiling', 'light.Kitchen'], False)
+
+        with patch.object(self.hass.states, 'get',
+                          wraps=self.hass.states.get) as mock_get:
+            self.hass.states.set('light.Bowl', STATE_OFF)
+            self.hass.block_till_done()
+            self.assertEqual(STATE_ON, test_group.state)
+
+            self.hass.states.set(
+                'light.Kitchen', STATE_UNKNOWN, {ATTR_ASSUMED_STATE: True})
+            self.hass.block_till_done()
+            self.assertEqual(STATE_ON, test_group.state)
+            self.assertTrue(test_group.assumed_state)
+
+            self.hass.states.remove('light.Ceiling')
+            self.hass.block_till_done()
+            self.assertEqual(STATE_OFF, test_group.state)
+
+            self.hass.states.set('light.Kitchen', STATE_ON)
+            self.hass.block_till_done()
+            self.assertEqual(STATE_ON, test_group.state)
+            self.assertFalse(test_group.assumed_state)
+
+        member_lookups = [call for call in mock_get.mock_calls
+                          if call[1][0].startswith('light.')]
+        self.assertEqual([], member_lookups)
+
     def test_is_on(self):
         """Test is_on method."""
         self.hass.states.set('light.Bowl', STATE_ON)
@@ -297,6 +332,41 @@ class TestComponentsGroup(unittest.TestCase):
             sorted(group.expand_entity_ids(self.hass,
                                            ['group.group_of_groups'])))
 
+    def test_expand_entity_ids_cached(self):
+        """Test expanded members are cached until the members change."""
+        assert setup_component(self.hass, 'group', {'group': {
+            'light': 'light.test_1,light.test_2',
+            'all': 'group.light,switch.test_1,light.test_1',
+        }})
+
+        self.assertEqual(
+            ['light.test_1', 'light.test_2', 'switch.test_1'],
+            group.expand_entity_ids(self.hass, ['group.all']))
+        self.assertEqual(
+            ('light.test_1', 'light.test_2', 'switch.test_1'),
+            self.hass.data[group.DATA_EXPANDED_MEMBERS]['group.all'])
+
+        self.hass.states.set('group.light', STATE_OFF, {
+            'entity_id': ['light.test_3']})
+        self.hass.block_till_done()
+
+        self.assertNotIn('group.all', self.hass.data[
+            group.DATA_EXPANDED_MEMBERS])
+        self.assertEqual(
+            ['light.test_3', 'switch.test_1', 'light.test_1'],
+            group.expand_entity_ids(self.hass, ['group.all']))
+
+    def test_expand_entity_ids_group_loop(self):
+        """Test expanding groups that contain each other."""
+        self.hass.states.set('group.first', STATE_ON, {
+            'entity_id': ['group.second', 'light.test_1']})
+        self.hass.states.set('group.second', STATE_ON, {
+            'entity_id': ['group.first', 'light.test_2']})
+
+        self.assertEqual(
+            ['light.test_2', 'light.test_1'],
+            group.expand_entity_ids(self.hass, ['group.first']))
+
     def test_set_assumed_state_based_on_tracked(self):
         """Test assumed state."""
         self.hass.states.set('light.Bowl', STATE_ON)
@@ -350,7 +420,10 @@ class TestComponentsGroup(unittest.TestCase):
 
         assert sorted(self.hass.states.entity_ids()) == \
             ['group.empty_group', 'group.second_group', 'group.test_group']
-        assert self.hass.bus.listeners['state_changed'] == 3
+        # Member state changes and expanded members cache invalidation
+        assert self.hass.bus.listeners['state_changed'] == 2
+        assert sorted(self.hass.data[DATA_STATE_CHANGE_TRACKERS]) == \
+            ['hello.world', 'light.bowl', 'sensor.happy']
 
         with patch('homeassistant.config.load_yaml_config_file', return_value={
             'group': {
@@ -363,7 +436,9 @@ class TestComponentsGroup(unittest.TestCase):
             self.hass.block_till_done()
 
         assert self.hass.states.entity_ids() == ['group.hello']
-        assert self.hass.bus.listeners['state_changed'] == 1
+        assert self.hass.bus.listeners['state_changed'] == 2
+        assert list(self.hass.data[DATA_STATE_CHANGE_TRACKERS]) == \
+            ['light.bowl']
 
     def test_stopping_a_group(self):
         """Test that a group correctly removes itself."""
@@ -360,6 +360,75 @@ class TestComponentHistory(unittest.TestCase):
             self.hass, zero, four, filters=filters)
         assert states == hist
 
+    def test_get_aggregated_states(self):
+        """Test aggregating numeric states into buckets."""
+        self.init_recorder()
+        entity_id = 'sensor.temperature'
+        start = dt_util.utcnow()
+
+        for offset, state in ((1, 20), (2, 22), (65, 'unknown'), (70, 18)):
+            with patch('homeassistant.components.recorder.dt_util.utcnow',
+                       return_value=start + timedelta(seconds=offset)):
+                self.hass.states.set(entity_id, state)
+                self.wait_recording_done()
+
+        hist = history.get_aggregated_states(
+            self.hass, start, start + timedelta(minutes=5),
+            timedelta(minutes=1), entity_id)
+
+        self.assertEqual([{
+            'start': start,
+            'min': 20.0,
+            'max': 22.0,
+            'mean': 21.0,
+            'last': 22.0,
+        }, {
+            'start': start + timedelta(minutes=1),
+            'min': 18.0,
+            'max': 18.0,
+            'mean': 18.0,
+            'last': 18.0,
+        }], hist[entity_id])
+
+    def test_aggregate_states_non_numeric(self):
+        """Test that non numeric states only report the last state."""
+        start = dt_util.utcnow()
+        rows = [
+            ('switch.test', 'on', start),
+            ('switch.test', 'off', start + timedelta(seconds=1)),
+        ]
+
+        hist = history.aggregate_states(rows, start, timedelta(minutes=1))
+
+        self.assertEqual([{
+            'start': start,
+            'min': None,
+            'max': None,
+            'mean': None,
+            'last': 'off',
+        }], hist['switch.test'])
+
+    def test_aggregate_states_non_finite(self):
+        """Test that nan and inf states are not aggregated."""
+        start = dt_util.utcnow()
+        rows = [
+            ('sensor.test', '10', start),
+            ('sensor.test', 'nan', start + timedelta(seconds=1)),
+            ('sensor.test', 'inf', start + timedelta(seconds=2)),
+            ('sensor.test', '-inf', start + timedelta(seconds=3)),
+            ('sensor.test', '20', start + timedelta(seconds=4)),
+        ]
+
+        hist = history.aggregate_states(rows, start, timedelta(minutes=1))
+
+        self.assertEqual([{
+            'start': start,
+            'min': 10.0,
+            'max': 20.0,
+            'mean': 15.0,
+            'last': 20.0,
+        }], hist['sensor.test'])
+
     def record_states(self):
         """Record some test states.
 
@@ -11,7 +11,7 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED, EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP,
     ATTR_HIDDEN, STATE_NOT_HOME, STATE_ON, STATE_OFF)
 import homeassistant.util.dt as dt_util
-from homeassistant.components import logbook
+from homeassistant.components import logbook, recorder
 from homeassistant.setup import setup_component
 
 from tests.common import (
@@ -243,6 +243,60 @@ class TestComponentLogbook(unittest.TestCase):
         self.assert_entry(entries[1], pointB, 'blu', domain='sensor',
                           entity_id=entity_id2)
 
+    def test_get_events_filtered_in_sql(self):
+        """Test that event types and excluded domains are filtered in SQL."""
+        start = dt_util.utcnow() - timedelta(minutes=1)
+        self.hass.bus.fire('some_other_event')
+        self.hass.states.set('switch.bla', 'on')
+        self.hass.states.set('light.bla', 'on')
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        config = logbook.CONFIG_SCHEMA({
+            ha.DOMAIN: {},
+            logbook.DOMAIN: {logbook.CONF_EXCLUDE: {
+                logbook.CONF_DOMAINS: ['switch', ]}}})
+        events = list(logbook._get_events(
+            self.hass, start, dt_util.utcnow() + timedelta(minutes=1),
+            config[logbook.DOMAIN]))
+
+        self.assertTrue(all(event.event_type in logbook.ALL_EVENT_TYPES
+                            for event in events))
+        self.assertEqual(['light.bla'], [
+            event.data['entity_id'] for event in events
+            if event.event_type == EVENT_STATE_CHANGED])
+
+    def test_get_events_joins_states_only_when_filtered(self):
+        """Test that states are only joined in when a filter is set."""
+        from sqlalchemy import event
+
+        start = dt_util.utcnow() - timedelta(minutes=1)
+        end = dt_util.utcnow() + timedelta(minutes=1)
+        engine = self.hass.data[recorder.DATA_INSTANCE].engine
+        statements = []
+
+        def log_statement(conn, cursor, statement, *args):
+            """Log executed statements."""
+            statements.append(statement)
+
+        config = logbook.CONFIG_SCHEMA({
+            ha.DOMAIN: {},
+            logbook.DOMAIN: {logbook.CONF_EXCLUDE: {
+                logbook.CONF_DOMAINS: ['switch', ]}}})
+
+        event.listen(engine, 'before_cursor_execute', log_statement)
+        try:
+            list(logbook._get_events(self.hass, start, end, {}))
+            unfiltered = list(statements)
+            del statements[:]
+            list(logbook._get_events(
+                self.hass, start, end, config[logbook.DOMAIN]))
+        finally:
+            event.remove(engine, 'before_cursor_execute', log_statement)
+
+        self.assertFalse(any('JOIN states' in stmt for stmt in unfiltered))
+        self.assertTrue(any('JOIN states' in stmt for stmt in statements))
+
     def test_exclude_automation_events(self):
         """Test if automation entries can be excluded by entity_id."""
         name = 'My Automation Rule'
@@ -5,12 +5,12 @@ from unittest.mock import patch
 import socket
 from datetime import timedelta
 
-from homeassistant import core as ha
 from homeassistant.setup import setup_component
 from homeassistant.components import pilight
 from homeassistant.util import dt as dt_util
 
-from tests.common import get_test_home_assistant, assert_setup_component
+from tests.common import (
+    get_test_home_assistant, assert_setup_component, fire_time_changed)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -182,15 +182,13 @@ class TestPilight(unittest.TestCase):
             service_data1['protocol'] = [service_data1['protocol']]
             service_data2['protocol'] = [service_data2['protocol']]
 
-            self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                               {ha.ATTR_NOW: dt_util.utcnow()})
+            fire_time_changed(self.hass, dt_util.utcnow())
             self.hass.block_till_done()
             error_log_call = mock_pilight_error.call_args_list[-1]
             self.assertTrue(str(service_data1) in str(error_log_call))
 
             new_time = dt_util.utcnow() + timedelta(seconds=5)
-            self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                               {ha.ATTR_NOW: new_time})
+            fire_time_changed(self.hass, new_time)
             self.hass.block_till_done()
             error_log_call = mock_pilight_error.call_args_list[-1]
             self.assertTrue(str(service_data2) in str(error_log_call))
@@ -385,7 +383,6 @@ class TestPilightCallrateThrottler(unittest.TestCase):
         for i in range(3):
             exp.append(i)
             shifted_time = now + (timedelta(seconds=delay + 0.1) * i)
-            self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                               {ha.ATTR_NOW: shifted_time})
+            fire_time_changed(self.hass, shifted_time)
             self.hass.block_till_done()
             self.assertEqual(runs, exp)
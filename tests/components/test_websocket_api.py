@@ -222,6 +222,75 @@ def test_subscribe_unsubscribe_events(hass, websocket_client):
     assert sum(hass.bus.async_listeners().values()) == init_count
 
 
+@asyncio.coroutine
+def test_subscribe_events_entity_filter(hass, websocket_client):
+    """Test subscribe events filtered by entity id and domain."""
+    websocket_client.send_json({
+        'id': 5,
+        'type': wapi.TYPE_SUBSCRIBE_EVENTS,
+        'event_type': 'state_changed',
+        'entity_id': 'light.kitchen',
+        'domain': 'switch',
+    })
+
+    msg = yield from websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['success']
+
+    hass.states.async_set('light.living_room', 'on')
+    hass.states.async_set('light.kitchen', 'on')
+    hass.states.async_set('sensor.temperature', '20')
+    hass.states.async_set('switch.fan', 'off')
+
+    received = []
+    for _ in range(2):
+        with timeout(3, loop=hass.loop):
+            msg = yield from websocket_client.receive_json()
+        received.append(msg['event']['data']['entity_id'])
+
+    assert received == ['light.kitchen', 'switch.fan']
+
+
+@asyncio.coroutine
+def test_subscribe_events_diff(hass, websocket_client):
+    """Test subscribe events with only the changes of states."""
+    hass.states.async_set('light.kitchen', 'on', {
+        'brightness': 100, 'color_name': 'red', 'friendly_name': 'Kitchen'})
+
+    websocket_client.send_json({
+        'id': 5,
+        'type': wapi.TYPE_SUBSCRIBE_EVENTS,
+        'event_type': 'state_changed',
+        'diff': True,
+    })
+
+    msg = yield from websocket_client.receive_json()
+    assert msg['id'] == 5
+    assert msg['success']
+
+    hass.states.async_set('light.kitchen', 'on', {
+        'brightness': 150, 'friendly_name': 'Kitchen'})
+
+    with timeout(3, loop=hass.loop):
+        msg = yield from websocket_client.receive_json()
+
+    data = msg['event']['data']
+    assert data['entity_id'] == 'light.kitchen'
+    assert 'state' not in data['diff']
+    assert 'last_changed' not in data['diff']
+    assert data['diff']['attributes'] == {'brightness': 150}
+    assert data['diff']['removed_attributes'] == ['color_name']
+
+    hass.states.async_set('light.hallway', 'off')
+
+    with timeout(3, loop=hass.loop):
+        msg = yield from websocket_client.receive_json()
+
+    diff = msg['event']['data']['diff']
+    assert diff['new_state']['entity_id'] == 'light.hallway'
+    assert diff['new_state']['state'] == 'off'
+
+
 @asyncio.coroutine
 def test_get_states(hass, websocket_client):
     """Test get_states command."""
@@ -2,7 +2,9 @@
 from unittest.mock import patch
 
 from homeassistant.helpers import condition
+from homeassistant.helpers.template import Template
 from homeassistant.util import dt
+from homeassistant.util.async import run_callback_threadsafe
 
 from tests.common import get_test_home_assistant
 
@@ -122,6 +124,45 @@ class TestConditionHelper:
         self.hass.states.set('sensor.temperature', 100)
         assert test(self.hass)
 
+    def test_shared_template_rendered_once(self):
+        """Test conditions sharing a template render it once."""
+        test = run_callback_threadsafe(
+            self.hass.loop, condition.async_from_configs, [
+                {
+                    'condition': 'numeric_state',
+                    'entity_id': 'sensor.temperature',
+                    'value_template': '{{ state.state | float * 2 }}',
+                    'above': 100,
+                }, {
+                    'condition': 'and',
+                    'conditions': [{
+                        'condition': 'numeric_state',
+                        'entity_id': 'sensor.temperature',
+                        'value_template': '{{ state.state | float * 2 }}',
+                        'below': 200,
+                    }, {
+                        'condition': 'numeric_state',
+                        'entity_id': 'sensor.humidity',
+                        'value_template': '{{ state.state | float * 2 }}',
+                        'below': 100,
+                    }],
+                }
+            ]).result()
+
+        self.hass.states.set('sensor.temperature', 75)
+        self.hass.states.set('sensor.humidity', 40)
+
+        with patch.object(Template, 'async_render', autospec=True,
+                          side_effect=Template.async_render) as mock_render:
+            assert run_callback_threadsafe(
+                self.hass.loop, test, self.hass, {}).result()
+            assert mock_render.call_count == 2
+
+            self.hass.states.set('sensor.temperature', 25)
+            assert not run_callback_threadsafe(
+                self.hass.loop, test, self.hass, {}).result()
+            assert mock_render.call_count == 3
+
     def test_time_window(self):
         """Test time condition windows."""
         sixam = dt.parse_time("06:00:00")
@@ -6,7 +6,9 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 import homeassistant.helpers.entity as entity
-from homeassistant.const import ATTR_HIDDEN, ATTR_DEVICE_CLASS
+from homeassistant.const import (
+    ATTR_HIDDEN, ATTR_DEVICE_CLASS, ATTR_FRIENDLY_NAME, ATTR_ICON,
+    ATTR_UNIT_OF_MEASUREMENT, TEMP_CELSIUS, TEMP_FAHRENHEIT)
 from homeassistant.config import DATA_CUSTOMIZE
 from homeassistant.helpers.entity_values import EntityValues
 
@@ -128,6 +130,160 @@ class TestHelpersEntity(object):
         assert state.attributes.get(ATTR_DEVICE_CLASS) == 'test_class'
 
 
+@asyncio.coroutine
+def test_cache_static_attributes(hass):
+    """Test static attributes are cached until invalidated."""
+    class CachedEntity(entity.Entity):
+        entity_id = 'sensor.test'
+        name = 'Before'
+        icon = 'mdi:before'
+        cache_static_attributes = True
+
+    ent = CachedEntity()
+    ent.hass = hass
+
+    yield from ent.async_update_ha_state()
+    ent.name = 'After'
+    ent.icon = 'mdi:after'
+    yield from ent.async_update_ha_state()
+
+    state = hass.states.get('sensor.test')
+    assert state.attributes[ATTR_FRIENDLY_NAME] == 'Before'
+    assert state.attributes[ATTR_ICON] == 'mdi:before'
+
+    ent.async_invalidate_static_attributes()
+    yield from ent.async_update_ha_state()
+
+    state = hass.states.get('sensor.test')
+    assert state.attributes[ATTR_FRIENDLY_NAME] == 'After'
+    assert state.attributes[ATTR_ICON] == 'mdi:after'
+
+
+@asyncio.coroutine
+def test_cache_static_attributes_customize_reload(hass):
+    """Test cached customize overrides are refreshed on reload."""
+    class CachedEntity(entity.Entity):
+        entity_id = 'sensor.test'
+        name = 'Sensor'
+        cache_static_attributes = True
+
+    ent = CachedEntity()
+    ent.hass = hass
+
+    hass.data[DATA_CUSTOMIZE] = EntityValues({
+        'sensor.test': {ATTR_FRIENDLY_NAME: 'First'}})
+    yield from ent.async_update_ha_state()
+    assert hass.states.get('sensor.test').name == 'First'
+
+    hass.data[DATA_CUSTOMIZE] = EntityValues({
+        'sensor.test': {ATTR_FRIENDLY_NAME: 'Second'}})
+    yield from ent.async_update_ha_state()
+    assert hass.states.get('sensor.test').name == 'Second'
+
+
+@asyncio.coroutine
+def test_state_attributes_override_static_attributes(hass):
+    """Test state attributes take precedence over static attributes."""
+    class CachedEntity(entity.Entity):
+        entity_id = 'sensor.test'
+        name = 'Sensor'
+        cache_static_attributes = True
+
+        @property
+        def state_attributes(self):
+            return {ATTR_FRIENDLY_NAME: 'From state'}
+
+    ent = CachedEntity()
+    ent.hass = hass
+
+    yield from ent.async_update_ha_state()
+    yield from ent.async_update_ha_state()
+
+    assert hass.states.get('sensor.test').name == 'From state'
+
+
+@asyncio.coroutine
+def test_cache_static_attributes_skips_unchanged_update(hass):
+    """Test an unchanged update does not set the state again."""
+    class CachedEntity(entity.Entity):
+        entity_id = 'sensor.test'
+        name = 'Sensor'
+        cache_static_attributes = True
+
+        def __init__(self):
+            """Initialize the entity."""
+            self._state = 'on'
+            self._attributes = {'value': 1}
+
+        @property
+        def state(self):
+            """Return the state."""
+            return self._state
+
+        @property
+        def state_attributes(self):
+            """Return the state attributes."""
+            return self._attributes
+
+    ent = CachedEntity()
+    ent.hass = hass
+
+    yield from ent.async_update_ha_state()
+
+    with patch.object(hass.states, 'async_set',
+                      wraps=hass.states.async_set) as mock_set:
+        yield from ent.async_update_ha_state()
+        assert not mock_set.called
+
+        ent._attributes['value'] = 2
+        yield from ent.async_update_ha_state()
+        assert len(mock_set.mock_calls) == 1
+        assert hass.states.get('sensor.test').attributes['value'] == 2
+
+        ent._state = 'off'
+        yield from ent.async_update_ha_state()
+        assert len(mock_set.mock_calls) == 2
+
+        yield from ent.async_update_ha_state()
+        assert len(mock_set.mock_calls) == 2
+
+        hass.states.async_set('sensor.test', 'on')
+        yield from ent.async_update_ha_state()
+        assert len(mock_set.mock_calls) == 4
+
+        ent.async_invalidate_static_attributes()
+        yield from ent.async_update_ha_state()
+        assert len(mock_set.mock_calls) == 5
+
+    state = hass.states.get('sensor.test')
+    assert state.state == 'off'
+    assert state.attributes == {ATTR_FRIENDLY_NAME: 'Sensor', 'value': 2}
+
+
+@asyncio.coroutine
+def test_cache_static_attributes_skips_unchanged_converted_update(hass):
+    """Test an unchanged update with a converted temperature is skipped."""
+    class CachedEntity(entity.Entity):
+        entity_id = 'sensor.test'
+        state = '68'
+        unit_of_measurement = TEMP_FAHRENHEIT
+        cache_static_attributes = True
+
+    ent = CachedEntity()
+    ent.hass = hass
+
+    yield from ent.async_update_ha_state()
+
+    state = hass.states.get('sensor.test')
+    assert state.state == '20'
+    assert state.attributes[ATTR_UNIT_OF_MEASUREMENT] == TEMP_CELSIUS
+
+    with patch.object(hass.states, 'async_set') as mock_set:
+        yield from ent.async_update_ha_state()
+
+    assert not mock_set.called
+
+
 @asyncio.coroutine
 def test_warn_slow_update(hass):
     """Warn we log when entity update takes a long time."""
@@ -578,3 +578,106 @@ def test_platform_not_ready(hass):
         yield from hass.async_block_till_done()
         assert len(platform1_setup.mock_calls) == 3
         assert 'test_domain.mod1' in hass.config.components
+
+
+@asyncio.coroutine
+def test_parallel_updates_sync_platform(hass):
+    """Test sync entities are updated at most parallel_updates at a time."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    platform = entity_component.EntityPlatform(
+        component, 'test_platform', timedelta(seconds=20), None, 2)
+
+    updating = []
+    peak = []
+
+    @asyncio.coroutine
+    def async_update_ha_state(force_refresh=False):
+        """Track how many entities are updating at the same time."""
+        updating.append(1)
+        peak.append(len(updating))
+        yield from asyncio.sleep(0, loop=hass.loop)
+        updating.pop()
+
+    entities = []
+    for _ in range(5):
+        ent = EntityTest(should_poll=True)
+        ent.async_update_ha_state = async_update_ha_state
+        entities.append(ent)
+    platform.platform_entities.extend(entities)
+
+    yield from platform._update_entity_states(dt_util.utcnow())
+
+    assert len(peak) == 5
+    assert max(peak) == 2
+    assert platform.update_cycles == 1
+    assert platform.last_cycle_duration is not None
+
+
+@asyncio.coroutine
+def test_parallel_updates_via_platform(hass):
+    """Test setting parallel updates via the platform."""
+    platform = MockPlatform()
+    platform.PARALLEL_UPDATES = 5
+    loader.set_component('test_domain.platform', platform)
+
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+
+    yield from component.async_setup({
+        DOMAIN: {
+            'platform': 'platform',
+        }
+    })
+
+    entity_platform = component._platforms[
+        ('platform', DEFAULT_SCAN_INTERVAL, None)]
+    assert entity_platform.parallel_updates == 5
+
+
+@asyncio.coroutine
+def test_skipped_update_cycle(hass):
+    """Test a cycle is skipped while the previous one is running."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    platform = entity_component.EntityPlatform(
+        component, 'test_platform', timedelta(seconds=20), None)
+
+    with (yield from platform._process_updates):
+        yield from platform._update_entity_states(dt_util.utcnow())
+
+    assert platform.skipped_cycles == 1
+    assert platform.update_cycles == 0
+
+
+@asyncio.coroutine
+def test_polling_schedule(hass):
+    """Test platforms sharing a scan interval are spread over it."""
+    component = EntityComponent(_LOGGER, DOMAIN, hass)
+    platforms = [
+        entity_component.EntityPlatform(
+            component, name, DEFAULT_SCAN_INTERVAL, None)
+        for name in ('first', 'second', 'third')]
+
+    with patch('homeassistant.helpers.entity_component.'
+               'async_track_time_interval') as mock_track:
+        for platform in platforms:
+            yield from platform.async_add_entities(
+                [EntityTest(should_poll=True)])
+
+    assert [call[2]['offset'] for call in mock_track.mock_calls] == \
+        [platform.poll_offset for platform in platforms]
+
+    schedule = entity_component.async_polling_schedule(hass)
+    assert sorted(item[0] for item in schedule) == [
+        'test_domain.first', 'test_domain.second', 'test_domain.third']
+    offsets = [item[2] for item in schedule]
+    assert offsets == sorted(offsets)
+    assert len(set(offsets)) == 3
+    assert all(timedelta(0) <= offset < DEFAULT_SCAN_INTERVAL
+               for offset in offsets)
+
+    # Offsets are stable for the same platform
+    assert entity_component.EntityPlatform(
+        component, 'first', DEFAULT_SCAN_INTERVAL, None).poll_offset == \
+        platforms[0].poll_offset
+
+    yield from platforms[0].async_reset()
+    assert len(entity_component.async_polling_schedule(hass)) == 2
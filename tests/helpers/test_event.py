@@ -8,13 +8,19 @@ from astral import Astral
 
 from homeassistant.setup import setup_component
 import homeassistant.core as ha
-from homeassistant.const import MATCH_ALL
+from homeassistant.const import (
+    MATCH_ALL, EVENT_STATE_CHANGED, EVENT_TIME_CHANGED)
 from homeassistant.helpers.event import (
+    PointInTimeTracker,
+    TimePattern,
     track_point_in_utc_time,
     track_point_in_time,
     track_utc_time_change,
+    async_track_utc_time_change,
     track_time_change,
+    async_track_time_change,
     track_state_change,
+    async_track_state_change,
     track_time_interval,
     track_template,
     track_sunrise,
@@ -23,8 +29,10 @@ from homeassistant.helpers.event import (
 from homeassistant.helpers.template import Template
 from homeassistant.components import sun
 import homeassistant.util.dt as dt_util
+from homeassistant.util.async import run_callback_threadsafe
 
-from tests.common import get_test_home_assistant
+from tests.common import (
+    get_test_home_assistant, fire_time_changed, async_fire_time_changed)
 from unittest.mock import patch
 
 
@@ -191,6 +199,67 @@ class TestEventHelpers(unittest.TestCase):
         self.assertEqual(5, len(wildcard_runs))
         self.assertEqual(6, len(wildercard_runs))
 
+    def test_track_state_change_dispatched_by_entity(self):
+        """Test state changes are dispatched to the trackers of an entity."""
+        kitchen_runs = []
+        all_runs = []
+
+        @ha.callback
+        def kitchen_callback(entity_id, old_state, new_state):
+            kitchen_runs.append(entity_id)
+
+        @ha.callback
+        def all_callback(entity_id, old_state, new_state):
+            all_runs.append(entity_id)
+
+        unsub_kitchen = track_state_change(
+            self.hass, ['light.Kitchen', 'light.kitchen'], kitchen_callback)
+        unsub_all = track_state_change(
+            self.hass, ['light.kitchen', 'light.bowl'], all_callback)
+        self.assertEqual(1, self.hass.bus.listeners[EVENT_STATE_CHANGED])
+
+        self.hass.states.set('light.kitchen', 'on')
+        self.hass.states.set('light.bowl', 'on')
+        self.hass.states.set('light.living_room', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['light.kitchen'], kitchen_runs)
+        self.assertEqual(['light.kitchen', 'light.bowl'], all_runs)
+
+        unsub_kitchen()
+        self.hass.states.set('light.kitchen', 'off')
+        self.hass.block_till_done()
+        self.assertEqual(['light.kitchen'], kitchen_runs)
+        self.assertEqual(3, len(all_runs))
+
+        unsub_all()
+        self.assertNotIn(EVENT_STATE_CHANGED, self.hass.bus.listeners)
+
+    def test_track_state_change_remove_while_dispatching(self):
+        """Test a tracker removing another tracker of the same entity."""
+        runs = []
+
+        @ha.callback
+        def remove_callback(entity_id, old_state, new_state):
+            runs.append('remove')
+            unsub()
+
+        @ha.callback
+        def removed_callback(entity_id, old_state, new_state):
+            runs.append('removed')
+
+        track_state_change(self.hass, 'light.bowl', remove_callback)
+        unsub = run_callback_threadsafe(
+            self.hass.loop, async_track_state_change, self.hass, 'light.bowl',
+            removed_callback).result()
+
+        self.hass.states.set('light.bowl', 'on')
+        self.hass.block_till_done()
+        self.assertEqual(['remove', 'removed'], runs)
+
+        self.hass.states.set('light.bowl', 'off')
+        self.hass.block_till_done()
+        self.assertEqual(['remove', 'removed', 'remove'], runs)
+
     def test_track_template(self):
         """Test tracking template."""
         specific_runs = []
@@ -290,6 +359,27 @@ class TestEventHelpers(unittest.TestCase):
         self.hass.block_till_done()
         self.assertEqual(2, len(specific_runs))
 
+    def test_track_time_interval_offset(self):
+        """Test tracking time interval with an offset."""
+        specific_runs = []
+
+        utc_now = datetime(2017, 7, 1, 12, 0, 2, tzinfo=dt_util.UTC)
+        with patch('homeassistant.util.dt.utcnow', return_value=utc_now):
+            unsub = track_time_interval(
+                self.hass, lambda x: specific_runs.append(1),
+                timedelta(seconds=10), offset=timedelta(seconds=7)
+            )
+
+        self._send_time_changed(utc_now + timedelta(seconds=4))
+        self.hass.block_till_done()
+        self.assertEqual(0, len(specific_runs))
+
+        self._send_time_changed(utc_now + timedelta(seconds=5))
+        self.hass.block_till_done()
+        self.assertEqual(1, len(specific_runs))
+
+        unsub()
+
     def test_track_sunrise(self):
         """Test track the sunrise."""
         latitude = 32.87336
@@ -410,7 +500,7 @@ class TestEventHelpers(unittest.TestCase):
 
     def _send_time_changed(self, now):
         """Send a time changed event."""
-        self.hass.bus.fire(ha.EVENT_TIME_CHANGED, {ha.ATTR_NOW: now})
+        fire_time_changed(self.hass, now)
 
     def test_periodic_task_minute(self):
         """Test periodic tasks per minute."""
@@ -530,3 +620,119 @@ class TestEventHelpers(unittest.TestCase):
         self._send_time_changed(datetime(2014, 5, 2, 0, 0, 0))
         self.hass.block_till_done()
         self.assertEqual(0, len(specific_runs))
+
+
+@asyncio.coroutine
+def test_point_in_time_tracker_timer(hass):
+    """Test the point in time tracker runs actions from its timer."""
+    tracker = PointInTimeTracker(hass)
+    runs = []
+
+    @ha.callback
+    def action(now):
+        """Record the run."""
+        runs.append(now)
+
+    tracker.async_add(dt_util.utcnow() + timedelta(milliseconds=50), action)
+    unsub = tracker.async_add(
+        dt_util.utcnow() + timedelta(milliseconds=50), action)
+    unsub()
+
+    yield from asyncio.sleep(0.2, loop=hass.loop)
+    assert len(runs) == 1
+
+
+@asyncio.coroutine
+def test_point_in_time_tracker_clock_jump(hass):
+    """Test the point in time tracker rechecks the wall clock."""
+    tracker = PointInTimeTracker(hass)
+    runs = []
+    now = dt_util.utcnow()
+
+    @ha.callback
+    def action(now):
+        """Record the run."""
+        runs.append(now)
+
+    with patch('homeassistant.helpers.event.MAX_TIMER_DELAY', 0.05), \
+            patch('homeassistant.util.dt.utcnow',
+                  return_value=now - timedelta(hours=1)):
+        tracker.async_add(now + timedelta(milliseconds=50), action)
+
+        yield from asyncio.sleep(0.2, loop=hass.loop)
+        assert len(runs) == 0
+
+    # The wall clock jumped an hour forward
+    yield from asyncio.sleep(0.2, loop=hass.loop)
+    assert len(runs) == 1
+
+
+def test_time_pattern_next_after():
+    """Test calculating the next time matching a time pattern."""
+    now = datetime(2017, 7, 1, 12, 30, 15, 500)
+
+    assert TimePattern(second=15).next_after(now) == \
+        datetime(2017, 7, 1, 12, 31, 15)
+    assert TimePattern(minute='/20', second=0).next_after(now) == \
+        datetime(2017, 7, 1, 12, 40, 0)
+    assert TimePattern(hour=[1, 12], minute=0, second=0).next_after(now) == \
+        datetime(2017, 7, 2, 1, 0, 0)
+    assert TimePattern(month=2, day=29, hour=0, minute=0,
+                       second=0).next_after(now) == datetime(2020, 2, 29)
+    assert TimePattern(year=2016).next_after(now) is None
+    assert TimePattern(month=2, day=30).next_after(now) is None
+    assert TimePattern(second='/two').next_after(now) is None
+
+
+@asyncio.coroutine
+def test_time_pattern_only_checked_when_due(hass):
+    """Test patterns are not checked on every time changed event."""
+    runs = []
+    now = datetime(2017, 7, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+
+    async_track_utc_time_change(
+        hass, lambda now: runs.append(now), minute=5, second=0)
+
+    with patch('homeassistant.helpers.event.TimePattern.matches',
+               side_effect=TimePattern.matches, autospec=True) as mock_match:
+        for second in range(0, 600, 10):
+            async_fire_time_changed(hass, now + timedelta(seconds=second))
+            yield from hass.async_block_till_done()
+
+    assert runs == [now + timedelta(minutes=5)]
+    # Checked when added and when the pattern matched
+    assert mock_match.call_count == 2
+
+
+@asyncio.coroutine
+def test_time_pattern_time_moves_back(hass):
+    """Test a pattern still matches when the time moves back."""
+    runs = []
+    now = datetime(2017, 7, 1, 12, 0, 0, tzinfo=dt_util.UTC)
+
+    async_track_utc_time_change(
+        hass, lambda now: runs.append(now), minute=0, second=0)
+
+    async_fire_time_changed(hass, now)
+    async_fire_time_changed(hass, now)
+    async_fire_time_changed(hass, now + timedelta(minutes=30))
+    async_fire_time_changed(hass, now - timedelta(hours=1))
+    yield from hass.async_block_till_done()
+
+    assert runs == [now, now, now - timedelta(hours=1)]
+
+
+@asyncio.coroutine
+def test_time_pattern_listener_removed(hass):
+    """Test the time changed listener is removed with the last pattern."""
+    unsub = async_track_utc_time_change(
+        hass, lambda now: None, minute=0, second=0)
+    unsub_2 = async_track_time_change(
+        hass, lambda now: None, hour=3, minute=0, second=0)
+
+    assert hass.bus.async_listeners()[EVENT_TIME_CHANGED] == 1
+
+    unsub()
+    unsub_2()
+
+    assert EVENT_TIME_CHANGED not in hass.bus.async_listeners()
@@ -10,7 +10,8 @@ import homeassistant.util.dt as dt_util
 from homeassistant.components import input_boolean, recorder
 from homeassistant.helpers.restore_state import (
     async_get_last_state, DATA_RESTORE_CACHE)
-from homeassistant.components.recorder.models import RecorderRuns, States
+from homeassistant.components.recorder.models import (
+    RecorderRuns, States, LatestStates)
 
 from tests.common import (
     get_test_home_assistant, mock_coro, init_recorder_component,
@@ -66,13 +67,19 @@ def _add_data_in_last_run(hass, entities):
         ))
 
         for entity_id, state in entities.items():
-            session.add(States(
+            dbstate = States(
                 entity_id=entity_id,
                 domain=split_entity_id(entity_id)[0],
                 state=state,
                 attributes='{}',
                 last_changed=t_min_1,
                 last_updated=t_min_1,
+                created=t_min_1)
+            session.add(dbstate)
+            session.flush()
+            session.add(LatestStates(
+                entity_id=entity_id,
+                state_id=dbstate.state_id,
                 created=t_min_1))
 
 
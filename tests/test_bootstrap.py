@@ -2,14 +2,15 @@
 # pylint: disable=protected-access
 import asyncio
 import os
+import threading
 from unittest.mock import Mock, patch
 import logging
 
 import homeassistant.config as config_util
-from homeassistant import bootstrap
+from homeassistant import bootstrap, loader
 import homeassistant.util.dt as dt_util
 
-from tests.common import patch_yaml_files, get_test_config_dir
+from tests.common import patch_yaml_files, get_test_config_dir, MockModule
 
 ORIG_TIMEZONE = dt_util.DEFAULT_TIME_ZONE
 VERSION_PATH = os.path.join(get_test_config_dir(), config_util.VERSION_FILE)
@@ -52,3 +53,81 @@ def test_home_assistant_core_config_validation(hass):
         }
     }, hass)
     assert result is None
+
+
+@asyncio.coroutine
+@patch('homeassistant.bootstrap.async_enable_logging', Mock())
+@patch('homeassistant.bootstrap.async_register_signal_handling', Mock())
+def test_requirements_installed_in_one_batch(hass):
+    """Test requirements of components and platforms are batched."""
+    loader.set_component(
+        'comp_a', MockModule('comp_a', requirements=['package_a==1']))
+    loader.set_component(
+        'comp_b', MockModule('comp_b', dependencies=['comp_a'],
+                             requirements=['package_b==1']))
+    loader.set_component(
+        'comp_b.platform', MockModule(requirements=['package_c==1']))
+    collect_threads = []
+    collect_requirements = bootstrap._collect_requirements
+
+    def mock_collect_requirements(*args):
+        """Record the thread the requirements are collected in."""
+        collect_threads.append(threading.current_thread())
+        return collect_requirements(*args)
+
+    with patch('homeassistant.bootstrap.conf_util.'
+               'process_ha_config_upgrade'), \
+            patch('homeassistant.bootstrap._collect_requirements',
+                  new=mock_collect_requirements), \
+            patch('homeassistant.util.package.install_packages',
+                  return_value=True) as mock_install:
+        yield from bootstrap.async_from_config_dict({
+            'comp_b': {'platform': 'platform'},
+        }, hass, skip_pip=False)
+
+    assert 'comp_b' in hass.config.components
+    assert collect_threads
+    assert threading.main_thread() not in collect_threads
+    assert mock_install.mock_calls[0][1][0] == [
+        'package_a==1', 'package_b==1', 'package_c==1']
+
+
+@asyncio.coroutine
+@patch('homeassistant.bootstrap.async_enable_logging', Mock())
+@patch('homeassistant.bootstrap.async_register_signal_handling', Mock())
+def test_requirements_batch_failure_falls_back(hass):
+    """Test a failed batch install is retried per component quietly."""
+    loader.set_component(
+        'comp_a', MockModule('comp_a', requirements=['package_a==1']))
+    loader.set_component(
+        'comp_b', MockModule('comp_b', dependencies=['comp_a'],
+                             requirements=['package_b==1']))
+    pip_runs = []
+
+    def mock_popen(args, **kwargs):
+        """Fail the pip run installing both packages."""
+        pip_runs.append(args)
+        process = Mock(returncode=0)
+        process.communicate.return_value = (b'', b'error')
+
+        if 'package_a==1' in args and 'package_b==1' in args:
+            process.returncode = 1
+
+        return process
+
+    with patch('homeassistant.bootstrap.conf_util.'
+               'process_ha_config_upgrade'), \
+            patch('homeassistant.util.package.check_package_exists',
+                  return_value=False), \
+            patch('homeassistant.util.package.Popen',
+                  side_effect=mock_popen), \
+            patch('homeassistant.util.package._LOGGER') as mock_logger:
+        yield from bootstrap.async_from_config_dict({
+            'comp_b': {},
+        }, hass, skip_pip=False)
+
+    assert 'comp_a' in hass.config.components
+    assert 'comp_b' in hass.config.components
+    assert len(pip_runs) == 3
+    assert not mock_logger.error.called
+    assert mock_logger.debug.call_count == 1
@@ -1,6 +1,8 @@
 """Test to verify that Home Assistant core works."""
 # pylint: disable=protected-access
 import asyncio
+import functools as ft
+import json
 import logging
 import os
 import unittest
@@ -10,16 +12,20 @@ from tempfile import TemporaryDirectory
 
 import pytz
 import pytest
+import voluptuous as vol
 
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError
-from homeassistant.util.async import run_coroutine_threadsafe
+from homeassistant.util.async import (
+    run_callback_threadsafe, run_coroutine_threadsafe)
 import homeassistant.util.dt as dt_util
 from homeassistant.util.unit_system import (METRIC_SYSTEM)
 from homeassistant.const import (
     __version__, EVENT_STATE_CHANGED, ATTR_FRIENDLY_NAME, CONF_UNIT_SYSTEM,
     ATTR_NOW, EVENT_TIME_CHANGED, EVENT_HOMEASSISTANT_STOP,
-    EVENT_HOMEASSISTANT_CLOSE, EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED)
+    EVENT_HOMEASSISTANT_CLOSE, EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED,
+    EVENT_SERVICE_EXECUTED, EVENT_CALL_SERVICE, ATTR_DOMAIN, ATTR_SERVICE,
+    ATTR_SERVICE_DATA, ATTR_SERVICE_CALL_ID, ATTR_SERVICE_HANDLED, MATCH_ALL)
 
 from tests.common import get_test_home_assistant
 
@@ -267,6 +273,24 @@ class TestEvent(unittest.TestCase):
         }
         self.assertEqual(expected, event.as_dict())
 
+    def test_as_json(self):
+        """Test the JSON representation is encoded once."""
+        now = dt_util.utcnow()
+        event = ha.Event('some_type', {'some': 'attr'}, time_fired=now)
+
+        with patch('homeassistant.core.json.dumps',
+                   wraps=json.dumps) as mock_dumps:
+            encoded = event.as_json()
+            self.assertIs(encoded, event.as_json())
+
+        self.assertEqual(1, mock_dumps.call_count)
+        self.assertEqual(json.loads(encoded), {
+            'event_type': 'some_type',
+            'data': {'some': 'attr'},
+            'origin': 'LOCAL',
+            'time_fired': now.isoformat(),
+        })
+
 
 class TestEventBus(unittest.TestCase):
     """Test EventBus methods."""
@@ -411,6 +435,92 @@ class TestEventBus(unittest.TestCase):
         self.hass.block_till_done()
         assert len(coroutine_calls) == 1
 
+    def test_listeners_changed_after_fire(self):
+        """Test listeners added or removed after a fire are dispatched."""
+        calls = []
+        all_calls = []
+
+        @ha.callback
+        def listener(event):
+            calls.append(event)
+
+        @ha.callback
+        def match_all_listener(event):
+            all_calls.append(event)
+
+        self.bus.fire('test_dispatch')
+        unsub = self.bus.listen('test_dispatch', listener)
+        self.bus.fire('test_dispatch')
+        unsub_all = self.bus.listen(MATCH_ALL, match_all_listener)
+        self.bus.fire('test_dispatch')
+        unsub()
+        self.bus.fire('test_dispatch')
+        unsub_all()
+        self.bus.fire('test_dispatch')
+        self.hass.block_till_done()
+
+        assert len(calls) == 2
+        assert len(all_calls) == 2
+
+    def test_listener_count(self):
+        """Test counting the listeners an event goes to."""
+        count = ft.partial(
+            run_callback_threadsafe, self.hass.loop,
+            self.bus.async_listener_count)
+
+        assert count('test_count').result() == 0
+        close_count = count(EVENT_HOMEASSISTANT_CLOSE).result()
+
+        unsub = self.bus.listen('test_count', lambda event: None)
+        assert count('test_count').result() == 1
+
+        unsub_all = self.bus.listen(MATCH_ALL, lambda event: None)
+        assert count('test_count').result() == 2
+        assert count(EVENT_HOMEASSISTANT_CLOSE).result() == close_count
+
+        unsub()
+        unsub_all()
+        assert count('test_count').result() == 0
+
+    def test_match_all_not_called_on_close(self):
+        """Test MATCH_ALL listeners do not get EVENT_HOMEASSISTANT_CLOSE."""
+        calls = []
+        all_calls = []
+
+        @ha.callback
+        def listener(event):
+            calls.append(event)
+
+        @ha.callback
+        def match_all_listener(event):
+            all_calls.append(event)
+
+        self.bus.listen(MATCH_ALL, match_all_listener)
+        self.bus.listen(EVENT_HOMEASSISTANT_CLOSE, listener)
+        self.bus.fire(EVENT_HOMEASSISTANT_CLOSE)
+        self.hass.block_till_done()
+
+        assert len(calls) == 1
+        assert len(all_calls) == 0
+
+
+def test_get_job_type():
+    """Test the job type of callables."""
+    @ha.callback
+    def callback_func():
+        pass
+
+    @asyncio.coroutine
+    def coroutine_func():
+        pass
+
+    def executor_func():
+        pass
+
+    assert ha.get_job_type(callback_func) is ha.JobType.callback
+    assert ha.get_job_type(coroutine_func) is ha.JobType.coroutinefunction
+    assert ha.get_job_type(executor_func) is ha.JobType.executor
+
 
 class TestState(unittest.TestCase):
     """Test State methods."""
@@ -448,6 +558,19 @@ class TestState(unittest.TestCase):
         state = ha.State('domain.hello', 'world', {'some': 'attr'})
         self.assertEqual(state, ha.State.from_dict(state.as_dict()))
 
+    def test_as_json(self):
+        """Test the JSON representation is encoded once."""
+        state = ha.State('domain.hello', 'world', {'some': 'attr'})
+
+        with patch('homeassistant.core.json.dumps',
+                   wraps=json.dumps) as mock_dumps:
+            encoded = state.as_json()
+            self.assertIs(encoded, state.as_json())
+
+        self.assertEqual(1, mock_dumps.call_count)
+        self.assertEqual(
+            state, ha.State.from_dict(json.loads(encoded)))
+
     def test_dict_conversion_with_wrong_data(self):
         """Test conversion with wrong data."""
         self.assertIsNone(ha.State.from_dict(None))
@@ -683,6 +806,163 @@ class TestServiceRegistry(unittest.TestCase):
         finally:
             ha.SERVICE_CALL_LIMIT = prior
 
+        assert self.services._pending_calls == {}
+
+    def test_concurrent_blocking_calls(self):
+        """Test concurrent blocking calls share one executed listener."""
+        calls = []
+
+        @ha.callback
+        def service_handler(call):
+            """Service handler."""
+            calls.append(call)
+
+        # Service of another registry, like one of a remote instance
+        other_services = ha.ServiceRegistry(self.hass)
+        run_callback_threadsafe(
+            self.hass.loop, other_services.async_register,
+            'test_domain', 'register_calls', service_handler).result()
+
+        @asyncio.coroutine
+        def call_services():
+            """Call the service blocking many times at once."""
+            return (yield from asyncio.gather(*[
+                self.services.async_call(
+                    'test_domain', 'register_calls', blocking=True)
+                for _ in range(10)], loop=self.hass.loop))
+
+        results = run_coroutine_threadsafe(
+            call_services(), self.hass.loop).result()
+
+        assert results == [True] * 10
+        assert len(calls) == 10
+        assert self.services._pending_calls == {}
+        assert self.hass.bus.listeners[EVENT_SERVICE_EXECUTED] == 1
+
+    def test_direct_call(self):
+        """Test calling a registered service without the event bus."""
+        calls = []
+
+        @ha.callback
+        def service_handler(call):
+            """Service handler."""
+            calls.append(call)
+
+        self.services.register(
+            'test_domain', 'register_calls', service_handler,
+            schema=vol.Schema({'value': vol.Coerce(int)}))
+
+        with patch.object(self.hass.bus, 'async_fire',
+                          wraps=self.hass.bus.async_fire) as mock_fire:
+            self.assertTrue(self.services.call(
+                'test_domain', 'register_calls', {'value': '3'},
+                blocking=True))
+            self.hass.block_till_done()
+
+        assert len(calls) == 1
+        assert calls[0].data == {'value': 3}
+
+        event_types = [mock_call[1][0] for mock_call in mock_fire.mock_calls]
+        assert EVENT_CALL_SERVICE not in event_types
+        assert event_types == [EVENT_SERVICE_EXECUTED]
+
+    def test_direct_call_with_call_listener(self):
+        """Test observers get the call event after the service ran."""
+        calls = []
+        events = []
+
+        @ha.callback
+        def service_handler(call):
+            """Service handler."""
+            calls.append(call)
+
+        @ha.callback
+        def event_listener(event):
+            """Record the event and the calls made before it."""
+            events.append((event, len(calls)))
+
+        self.services.register(
+            'test_domain', 'register_calls', service_handler)
+        self.hass.bus.listen(EVENT_CALL_SERVICE, event_listener)
+
+        for service in ('register_calls', 'REGISTER_CALLS'):
+            self.assertTrue(self.services.call(
+                'test_domain', service, {'value': 3}, blocking=True))
+            self.hass.block_till_done()
+
+        assert len(calls) == 2
+        assert len(events) == 2
+
+        event, calls_before = events[0]
+        assert calls_before == 1
+        assert event.data[ATTR_DOMAIN] == 'test_domain'
+        assert event.data[ATTR_SERVICE] == 'register_calls'
+        assert event.data[ATTR_SERVICE_DATA] == {'value': 3}
+        assert event.data[ATTR_SERVICE_CALL_ID] == calls[0].call_id
+        assert event.data[ATTR_SERVICE_HANDLED]
+
+    def test_direct_call_with_all_events_listener(self):
+        """Test listeners of all events get the call event."""
+        events = []
+
+        @asyncio.coroutine
+        def service_handler(call):
+            """Service handler coroutine."""
+            pass
+
+        self.services.register(
+            'test_domain', 'register_calls', service_handler)
+        self.hass.bus.listen(MATCH_ALL, lambda event: events.append(event))
+
+        self.assertTrue(self.services.call(
+            'test_domain', 'register_calls', blocking=True))
+        self.hass.block_till_done()
+
+        assert [event.event_type for event in events] == [
+            EVENT_CALL_SERVICE, EVENT_SERVICE_EXECUTED]
+
+    def test_handled_call_event_not_executed(self):
+        """Test the event of a handled call does not call the service."""
+        calls = []
+
+        @ha.callback
+        def service_handler(call):
+            """Service handler."""
+            calls.append(call)
+
+        self.services.register(
+            'test_domain', 'register_calls', service_handler)
+
+        self.hass.bus.fire(EVENT_CALL_SERVICE, {
+            ATTR_DOMAIN: 'test_domain',
+            ATTR_SERVICE: 'register_calls',
+            ATTR_SERVICE_HANDLED: True,
+        })
+        self.hass.block_till_done()
+
+        assert len(calls) == 0
+
+    def test_direct_call_error(self):
+        """Test a failing call is logged and a blocking call returns False."""
+        @asyncio.coroutine
+        def service_handler(call):
+            """Service handler coroutine."""
+            raise ValueError
+
+        self.services.register(
+            'test_domain', 'register_calls', service_handler)
+
+        with self.assertLogs('homeassistant.core', level='ERROR') as logs:
+            self.assertFalse(self.services.call(
+                'test_domain', 'register_calls', blocking=True))
+        assert len(logs.output) == 1
+
+        with self.assertLogs('homeassistant.core', level='ERROR') as logs:
+            self.services.call('test_domain', 'register_calls')
+            self.hass.block_till_done()
+        assert len(logs.output) == 1
+        assert 'Error executing service' in logs.output[0]
+
     def test_async_service(self):
         """Test registering and calling an async service."""
         calls = []
@@ -1,5 +1,6 @@
 """Test Home Assistant remote methods and classes."""
 # pylint: disable=protected-access
+import json
 import unittest
 
 from homeassistant import remote, setup, core as ha
@@ -203,3 +204,32 @@ class TestRemoteMethods(unittest.TestCase):
 
         now = dt_util.utcnow()
         self.assertEqual(now.isoformat(), ha_json_enc.default(now))
+
+    def test_json_encode(self):
+        """Test encoding JSON with the cached encoding of states."""
+        state = hass.states.get('test.test')
+        data = {'states': [state, state], 'other': {'b': 1, 'a': [2]}}
+
+        self.assertEqual(
+            json.dumps(data, sort_keys=True, cls=remote.JSONEncoder),
+            remote.json_encode(data, sort_keys=True))
+        self.assertEqual(state.as_json(), remote.json_encode(state))
+
+    def test_json_encode_mixed(self):
+        """Test encoding non-string keys and lists mixing states."""
+        state = hass.states.get('test.test')
+        data = {
+            True: [1, state],
+            None: state,
+            2: 'two',
+            1.5: {False: [state, 'state']},
+        }
+
+        self.assertEqual(
+            json.loads(json.dumps(data, cls=remote.JSONEncoder)),
+            json.loads(remote.json_encode(data)))
+        self.assertEqual(
+            '[1, {}]'.format(state.as_json()), remote.json_encode([1, state]))
+
+        with self.assertRaises(TypeError):
+            remote.json_encode({(1, 2): state})
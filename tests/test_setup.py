@@ -192,7 +192,7 @@ class TestSetup:
         assert setup.setup_component(self.hass, 'comp')
         assert not mock_setup.called
 
-    @mock.patch('homeassistant.util.package.install_package',
+    @mock.patch('homeassistant.util.package.install_packages',
                 return_value=False)
     def test_component_not_installed_if_requirement_fails(self, mock_install):
         """Component setup should fail if requirement can't install."""
@@ -203,6 +203,20 @@ class TestSetup:
         assert not setup.setup_component(self.hass, 'comp')
         assert 'comp' not in self.hass.config.components
 
+    @mock.patch('homeassistant.util.package.install_packages',
+                return_value=True)
+    def test_component_requirements_installed_together(self, mock_install):
+        """Test all requirements of a component are installed in one run."""
+        self.hass.config.skip_pip = False
+        loader.set_component(
+            'comp', MockModule('comp', requirements=[
+                'package==0.0.1', 'other_package==0.0.2']))
+
+        assert setup.setup_component(self.hass, 'comp')
+        assert mock_install.call_count == 1
+        assert mock_install.mock_calls[0][1][0] == [
+            'package==0.0.1', 'other_package==0.0.2']
+
     def test_component_not_setup_twice_if_loaded_during_other_setup(self):
         """Test component setup while waiting for lock is not setup twice."""
         result = []
@@ -401,6 +415,26 @@ class TestSetup:
         assert call_order == [1, 1, 2]
 
 
+@asyncio.coroutine
+def test_setup_critical_path(hass):
+    """Test the critical path follows the slowest dependencies."""
+    loader.set_component('comp_a', MockModule('comp_a'))
+    loader.set_component('comp_b', MockModule('comp_b'))
+    loader.set_component(
+        'comp_c', MockModule('comp_c', dependencies=['comp_a', 'comp_b']))
+    loader.set_component('comp_d', MockModule('comp_d'))
+
+    assert setup.async_setup_critical_path(hass) == []
+
+    with mock.patch('homeassistant.setup.timer',
+                    side_effect=[0, 1, 0, 3, 3, 4, 1, 2]):
+        for domain in ('comp_a', 'comp_b', 'comp_c', 'comp_d'):
+            assert (yield from setup.async_setup_component(hass, domain, {}))
+
+    assert setup.async_setup_critical_path(hass) == [
+        ('comp_b', 3), ('comp_c', 1)]
+
+
 @asyncio.coroutine
 def test_component_cannot_depend_config(hass):
     """Test config is not allowed to be a dependency."""
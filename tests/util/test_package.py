@@ -104,6 +104,28 @@ class TestPackageUtilInstallPackage(unittest.TestCase):
             ], stdin=PIPE, stdout=PIPE, stderr=PIPE)
         )
 
+    @patch('homeassistant.util.package.sys')
+    def test_install_packages(self, mock_sys, mock_exists, mock_popen):
+        """Test the missing packages are installed in one pip run."""
+        mock_exists.side_effect = lambda package, target: \
+            package == TEST_EXIST_REQ
+        mock_popen.return_value = self.mock_process
+
+        self.assertTrue(package.install_packages(
+            [TEST_EXIST_REQ, TEST_NEW_REQ, TEST_ZIP_REQ], False))
+
+        self.assertEqual(mock_exists.call_count, 3)
+
+        self.assertEqual(self.mock_process.communicate.call_count, 1)
+        self.assertEqual(mock_popen.call_count, 1)
+        self.assertEqual(
+            mock_popen.call_args,
+            call([
+                mock_sys.executable, '-m', 'pip', 'install', '--quiet',
+                TEST_NEW_REQ, TEST_ZIP_REQ
+            ], stdin=PIPE, stdout=PIPE, stderr=PIPE)
+        )
+
     @patch('homeassistant.util.package._LOGGER')
     @patch('homeassistant.util.package.sys')
     def test_install_error(self, mock_sys, mock_logger, mock_exists,
@@ -117,6 +139,21 @@ class TestPackageUtilInstallPackage(unittest.TestCase):
 
         self.assertEqual(mock_logger.error.call_count, 1)
 
+    @patch('homeassistant.util.package._LOGGER')
+    @patch('homeassistant.util.package.sys')
+    def test_install_error_not_logged(self, mock_sys, mock_logger,
+                                      mock_exists, mock_popen):
+        """Test a failed install is logged at debug level if asked."""
+        mock_exists.return_value = False
+        mock_popen.return_value = self.mock_process
+        self.mock_process.returncode = 1
+
+        self.assertFalse(package.install_packages(
+            [TEST_NEW_REQ], log_failure=False))
+
+        self.assertEqual(mock_logger.error.call_count, 0)
+        self.assertEqual(mock_logger.debug.call_count, 1)
+
 
 class TestPackageUtilCheckPackageExists(unittest.TestCase):
     """Test for homeassistant.util.package module."""